@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.image_io import OutputOptions
+from backend.steganography import DCTSteganography
+
+# The process umask, read once at import so temporary outputs can be given the mode a newly
+# created file would get (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class AsyncDCTSteganography:
+    """
+    asyncio front end for DCTSteganography.
+
+    Every blocking step (image decoding, payload compression/encryption, the block transforms
+    and the image write) runs in an executor, so the event loop stays free while many requests
+    are in flight. The work is split into stages that are awaited one after another; cancelling
+    the calling task stops the job at the next stage boundary and cleans up any partial output.
+
+    With a ProcessPoolExecutor the stages can't share the in-memory image, so each call runs
+    as a single job in a worker process and cancellation only takes effect once it finishes.
+    """
+
+    def __init__(self, stego: DCTSteganography = None, executor=None):
+        """
+        Args:
+            stego (DCTSteganography, optional): Backend instance whose settings are used.
+            executor (concurrent.futures.Executor, optional): Where the blocking work runs.
+                                                              Defaults to the loop's default executor.
+        """
+        self.stego = stego or DCTSteganography()
+        self.executor = executor
+
+    async def _run(self, fn, *args, **kwargs):
+        """Runs a blocking callable in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def capacity(self, image_path: str) -> int:
+        """Async counterpart of DCTSteganography.capacity."""
+        return await self._run(self.stego.capacity, image_path)
+
+    async def probe(self, image_path: str):
+        """Async counterpart of DCTSteganography.probe."""
+        return await self._run(self.stego.probe, image_path)
+
+    async def embed_data(self, image_path: str, secret_data, password: str, is_text: bool,
+                         original_filename: str = None, output_path: str = None,
+                         output_options: OutputOptions = None, verify: bool = False,
+                         segment_size: int = None) -> str:
+        """
+        Async counterpart of DCTSteganography.embed_data (same arguments and errors).
+
+        The output file only appears once the stego image has been completely written; a
+        cancelled call leaves no output behind.
+        """
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return await self._run(self.stego.embed_data, image_path, secret_data, password, is_text,
+                                   original_filename, output_path, output_options, verify, segment_size)
+
+        stego = self.stego
+        stego._check_embed_paths(image_path, output_path)
+        # Seal the payload while the cover loads, as embed_data does
+        (encrypted, segments), (img, cover) = await asyncio.gather(
+            self._run(stego._seal_payload, secret_data, password, is_text, original_filename, segment_size),
+            self._run(stego._load_cover, image_path, output_path))
+        header = stego._fitted_header(img.shape, encrypted, password, segments)
+
+        # In-place embedding works on a copy of the cover at output_path; drop it if we get cancelled
+        copied_output = os.path.abspath(output_path) != os.path.abspath(image_path)
+
+        def discard_canvas(canvas):
+            if canvas[1] and copied_output:
+                _remove_quietly(output_path)
+
+        stego_img, in_place = await self._run_stage(discard_canvas, stego._create_stego_canvas,
+                                                    img, image_path, output_path)
+        if in_place:
+            return await self._run_stage(lambda _: discard_canvas((stego_img, in_place)), stego._embed_and_save,
+                                         stego_img, True, encrypted, header, output_path, output_options, verify,
+                                         cover)
+
+        # Encode to a unique temporary name next to the output (keeping the extension, which
+        # selects the format) and rename it into place once it is complete
+        fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)),
+                                            suffix=os.path.splitext(output_path)[1])
+        os.close(fd)
+        os.chmod(partial_path, 0o666 & ~_UMASK)  # mkstemp creates it private; give it a regular file's mode
+        try:
+            await self._run_stage(lambda _: _remove_quietly(partial_path), stego._embed_and_save,
+                                  stego_img, False, encrypted, header, partial_path, output_options, verify, cover)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _remove_quietly(partial_path)
+            raise
+        os.replace(partial_path, output_path)
+        return output_path
+
+    async def _run_stage(self, cleanup, fn, *args):
+        """
+        Runs a stage that can't be interrupted once started. If the caller is cancelled while it
+        runs, cleanup(result) is called as soon as the stage finishes, then the cancellation propagates.
+        """
+        future = asyncio.ensure_future(self._run(fn, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(
+                lambda done: done.cancelled() or done.exception() is not None or cleanup(done.result()))
+            raise
+
+    async def extract_data(self, image_path: str, password: str, spill_dir: str = None) -> dict:
+        """
+        Async counterpart of DCTSteganography.extract_data (same arguments, result and errors).
+
+        A call cancelled while the payload is being decoded removes the file it spilled, if any.
+        """
+        stego = self.stego
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return await self._run(stego.extract_data, image_path, password, spill_dir)
+
+        if stego.ciphertext_cache is not None:
+            gathered = await self._run(stego.gather_ciphertext, image_path)
+            return await self._run_stage(self._discard_spilled, stego.decrypt_ciphertext, gathered, password,
+                                         spill_dir)
+        opened = await self._run(stego._open_embedded, image_path)
+        return await self._run_stage(self._discard_spilled, stego._extract_opened, opened, password, spill_dir)
+
+    def _discard_spilled(self, result: dict) -> None:
+        """Removes the file a cancelled extraction spilled its payload to."""
+        if self.stego.METADATA_KEY_CONTENT_PATH in result:
+            _remove_quietly(result[self.stego.METADATA_KEY_CONTENT_PATH])
+
+    async def embed_file(self, image_path: str, secret_path: str, password: str, output_path: str,
+                         output_options: OutputOptions = None) -> str:
+        """Embeds a file from disk, reading it off the event loop."""
+        secret_data = await self._run(_read_file, secret_path)
+        return await self.embed_data(image_path, secret_data, password, False,
+                                     original_filename=os.path.basename(secret_path),
+                                     output_path=output_path, output_options=output_options)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
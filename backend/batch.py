@@ -0,0 +1,181 @@
+"""
+Batch jobs: one embed or extract per image, run many at a time.
+
+A BatchJob names an image and what to do with it. run_job carries one out and may be called
+from several threads at once with one shared engine, so a worker pool can work through
+hundreds of images while compressed payloads stay cached across them.
+
+    stego = create_engine()
+    stego.enable_payload_cache()
+    jobs = [BatchJob(path, EMBED, password, payload_path="notes.pdf") for path in covers]
+    for job in jobs:
+        result = run_job(job, stego, "out/")
+"""
+import copy
+import os
+import time
+
+from backend.image_io import LOSSLESS_EXTENSIONS, image_extension, is_lossless_path
+
+EMBED = "embed"
+EXTRACT = "extract"
+
+
+class BatchJob:
+    """
+    One image of a batch and what to do with it.
+
+    Embed jobs hide a payload (a file, or text) in the image; extract jobs recover the payload
+    of a stego image. Set cancelled to make a job that hasn't started yet skip its work.
+    """
+
+    def __init__(self, image_path: str, mode: str = None, password: str = "", payload_path: str = None,
+                 payload_text: str = None):
+        """
+        Args:
+            image_path (str): The cover (embed) or stego image (extract).
+            mode (str, optional): EMBED or EXTRACT; None until it is known (see detect_mode).
+            password (str): Password to encrypt or decrypt with.
+            payload_path (str, optional): File to embed.
+            payload_text (str, optional): Text to embed, used when there is no payload_path.
+        """
+        self.image_path = image_path
+        self.mode = mode
+        self.password = password
+        self.payload_path = payload_path
+        self.payload_text = payload_text
+        self.cancelled = False
+
+    def is_ready(self) -> bool:
+        """True once the job has everything it needs to run."""
+        if not self.password or self.mode not in (EMBED, EXTRACT):
+            return False
+        return self.mode == EXTRACT or self.payload_path is not None or bool(self.payload_text)
+
+
+def detect_mode(stego, image_path: str) -> str:
+    """
+    Picks EXTRACT for images that carry a payload and EMBED for the rest. Reads only the header
+    rows of the image (see DCTSteganography.probe).
+
+    Raises:
+        ValueError: If the image can't be read or isn't in a lossless format.
+    """
+    if not is_lossless_path(image_path):
+        raise ValueError(f"Only lossless images ({', '.join(LOSSLESS_EXTENSIONS)}) are supported.")
+    return EXTRACT if stego.probe(image_path) is not None else EMBED
+
+
+def run_job(job: BatchJob, stego, output_dir: str, progress=None):
+    """
+    Runs one batch job, writing its output into output_dir under a name no other job takes.
+
+    Embedding writes `<image name>_stego<ext>` in the cover's format and verifies it; a job
+    whose embedded bits could not all be repaired fails and leaves no output. Extraction
+    writes the embedded file under its original name, or text to `<image name>.txt`.
+
+    Args:
+        job (BatchJob): The job. It must be ready (see BatchJob.is_ready).
+        stego (DCTSteganography): Engine to embed with (any engine extracts). It isn't modified.
+        output_dir (str): Existing directory for the output.
+        progress (callable, optional): Called with (stage, fraction done) as the job advances.
+
+    Returns:
+        dict: 'output_path', 'bytes' (image plus payload bytes handled) and 'seconds', or None
+              if the job was cancelled before it started.
+
+    Raises:
+        ValueError: If the job isn't ready, or embedding or extraction fails.
+    """
+    if job.cancelled:
+        return None
+    if not job.is_ready():
+        raise ValueError("The job needs a password and, to embed, a payload.")
+    report = progress or (lambda stage, fraction: None)
+    engine = copy.copy(stego)  # Own last_verification; caches stay shared
+    started = time.perf_counter()
+
+    if job.mode == EMBED:
+        report("Reading payload", 0.05)
+        if job.payload_path is not None:
+            with open(job.payload_path, 'rb') as f:
+                secret_data = f.read()
+            is_text, original_filename = False, os.path.basename(job.payload_path)
+        else:
+            secret_data, is_text, original_filename = job.payload_text, True, None
+        stem = os.path.splitext(os.path.basename(job.image_path))[0]
+        output_path = _reserve_path(output_dir, f"{stem}_stego{image_extension(job.image_path)}", 0o666)
+        report("Embedding", 0.2)
+        try:
+            engine.embed_data(job.image_path, secret_data, job.password, is_text,
+                              original_filename=original_filename, output_path=output_path, verify=True)
+            verification = engine.last_verification
+            if verification and verification["bit_errors_final"]:
+                raise ValueError(f"{verification['bit_errors_final']} embedded bits could not be repaired; "
+                                 f"try a different cover image.")
+        except BaseException:
+            _remove_quietly(output_path)
+            raise
+        payload_size = len(secret_data.encode('utf-8')) if is_text else len(secret_data)
+    else:
+        report("Extracting", 0.2)
+        result = engine.extract_data(job.image_path, job.password, spill_dir=output_dir)
+        report("Writing", 0.9)
+        output_path = _store_extracted(engine, result, job.image_path, output_dir)
+        payload_size = os.path.getsize(output_path)
+
+    report("Done", 1.0)
+    return {
+        "output_path": output_path,
+        "bytes": os.path.getsize(job.image_path) + payload_size,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _store_extracted(stego, result: dict, image_path: str, output_dir: str) -> str:
+    """Moves (or writes) an extracted payload to its final name in output_dir and returns the path."""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    if result[stego.METADATA_KEY_TYPE] == stego.TEXT_TYPE:
+        name = f"{stem}.txt"
+    else:
+        # The embedded name comes from whoever made the image: keep only its last component
+        name = os.path.basename(result.get(stego.METADATA_KEY_FILENAME, "").replace("\\", "/"))
+        if name in ("", ".", ".."):
+            name = f"{stem}{result.get(stego.METADATA_KEY_FILEEXT, '')}"
+
+    spilled = result.get(stego.METADATA_KEY_CONTENT_PATH)
+    try:
+        output_path = _reserve_path(output_dir, name, 0o600)
+        if spilled is not None:
+            os.replace(spilled, output_path)
+        else:
+            with open(output_path, 'wb') as f:
+                f.write(result[stego.METADATA_KEY_CONTENT].encode('utf-8'))
+    finally:
+        if spilled is not None:
+            _remove_quietly(spilled)  # Already moved, unless something failed
+    return output_path
+
+
+def _reserve_path(directory: str, name: str, mode: int) -> str:
+    """
+    Creates an empty file named `name`, or `name (2)`, `name (3)`, ... if taken, and returns its
+    path. Creating it exclusively keeps concurrent jobs from picking the same name.
+    """
+    stem, extension = os.path.splitext(name)
+    attempt = 1
+    while True:
+        candidate = os.path.join(directory, name if attempt == 1 else f"{stem} ({attempt}){extension}")
+        try:
+            os.close(os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, mode))
+            return candidate
+        except FileExistsError:
+            attempt += 1
+
+
+def _remove_quietly(path: str) -> None:
+    """Deletes a file if it exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
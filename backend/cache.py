@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small thread-safe least-recently-used cache with an entry limit and a memory budget.
+
+    Entries are evicted oldest-first once either limit is exceeded; a single value larger
+    than the whole budget is simply not stored. Hit and miss counts are kept for tuning.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 64 * 1024 * 1024, sizeof=None, on_evict=None):
+        """
+        Args:
+            max_entries (int): Maximum number of entries kept.
+            max_bytes (int): Memory budget for all values together.
+            sizeof (callable, optional): Returns a value's size in bytes. Defaults to len() for
+                                         bytes and .nbytes for NumPy arrays.
+            on_evict (callable, optional): Called with every value that leaves the cache
+                                           (evicted, replaced, popped or cleared), e.g. to wipe it.
+                                           Values that were never stored are left alone.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or _default_sizeof
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Returns the cached value for key (marking it most recently used), or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> None:
+        """Stores a value, evicting least recently used entries to stay within the limits."""
+        size = self.sizeof(value)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes or self.max_entries < 1:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def pop(self, key) -> None:
+        """Drops one entry if present."""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        """Drops every entry (the hit/miss counters are kept)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+    def stats(self) -> dict:
+        """Returns the entry count, bytes used and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def _discard(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            if self.on_evict is not None:
+                self.on_evict(entry[0])
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _default_sizeof(value) -> int:
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_default_sizeof(item) for item in value)
+    return len(value)
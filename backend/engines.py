@@ -0,0 +1,69 @@
+"""
+Registry of embedding engines.
+
+An engine is a class with a numeric ENGINE_ID (recorded in the stego header), an
+ENGINE_NAME, and the methods embed, extract, capacity and probe, taking the same
+arguments as DCTSteganography's. Every engine reads every other engine's images:
+extraction looks the engine up from the header, so callers never need to know which
+engine made an image.
+
+    stego = create_engine("lsb", bits_per_channel=2)
+    stego.embed(cover_path, data, password, is_text=False, output_path=out_path)
+    create_engine().extract(out_path, password)  # Picks the LSB engine from the header
+"""
+from backend.lsb import LSBSteganography
+from backend.steganography import DCTSteganography
+
+DEFAULT_ENGINE = DCTSteganography.ENGINE_NAME
+
+_ENGINES_BY_NAME = {}
+_ENGINES_BY_ID = {}
+
+
+def register_engine(engine_cls) -> None:
+    """
+    Adds an engine class to the registry.
+
+    Raises:
+        ValueError: If its id or name is already taken, or the id doesn't fit the header field.
+    """
+    engine_id, name = engine_cls.ENGINE_ID, engine_cls.ENGINE_NAME
+    if not 0 <= engine_id <= 0xFF:
+        raise ValueError(f"Engine id must fit in one byte, got {engine_id}.")
+    if engine_id in _ENGINES_BY_ID or name in _ENGINES_BY_NAME:
+        raise ValueError(f"An engine with id {engine_id} or name '{name}' is already registered.")
+    _ENGINES_BY_ID[engine_id] = engine_cls
+    _ENGINES_BY_NAME[name] = engine_cls
+
+
+def available_engines() -> list:
+    """Names of the registered engines, in registration order."""
+    return list(_ENGINES_BY_NAME)
+
+
+def create_engine(name: str = DEFAULT_ENGINE, **options):
+    """
+    Instantiates an engine by name, passing any options to its constructor.
+
+    Raises:
+        ValueError: If no engine has that name.
+    """
+    if name not in _ENGINES_BY_NAME:
+        raise ValueError(f"Unknown engine '{name}'. Expected one of: {', '.join(_ENGINES_BY_NAME)}.")
+    return _ENGINES_BY_NAME[name](**options)
+
+
+def engine_class(engine_id: int):
+    """
+    Looks an engine class up by the id recorded in a stego header.
+
+    Raises:
+        ValueError: If no engine has that id (e.g. an image from a newer version).
+    """
+    if engine_id not in _ENGINES_BY_ID:
+        raise ValueError(f"Image was made by an unknown embedding engine (id {engine_id}).")
+    return _ENGINES_BY_ID[engine_id]
+
+
+register_engine(DCTSteganography)
+register_engine(LSBSteganography)
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import threading
+import zlib
+
+
+class PayloadSizeEstimator:
+    """
+    Estimates how many bytes a secret takes once serialized, compressed and encrypted, cheaply
+    enough to re-run on every pause in typing.
+
+    The secret is cut into fixed-size chunks whose compressed sizes are remembered by content
+    hash, so after an edit only the chunks that actually changed are compressed again (typing
+    at the end of a long text recompresses one chunk). Chunks are compressed independently,
+    which loses a little context at their boundaries, so the estimate tends to sit slightly
+    above the real size rather than below it.
+
+        estimator = PayloadSizeEstimator(stego)
+        fits = estimator.estimate(text, is_text=True) <= stego.capacity(cover_path)
+    """
+
+    def __init__(self, stego, chunk_size: int = 192 * 1024):
+        """
+        Args:
+            stego (DCTSteganography): Engine whose payload format (metadata keys, compression
+                                      level) is mirrored.
+            chunk_size (int): Bytes of the secret per chunk. Rounded down to a multiple of 3, so
+                              chunks base64-encode independently of their neighbours.
+
+        Raises:
+            ValueError: If the chunk size is smaller than 3 bytes.
+        """
+        if chunk_size < 3:
+            raise ValueError(f"Chunk size must be at least 3 bytes, got {chunk_size}.")
+        self.stego = stego
+        self.chunk_size = chunk_size - chunk_size % 3
+        self._chunk_sizes = {}  # chunk digest -> compressed size of its base64 text
+        self._lock = threading.Lock()
+
+    def estimate(self, secret_data, is_text: bool, original_filename: str = None) -> int:
+        """
+        Estimates the size of the encrypted payload embed_data would produce.
+
+        Args:
+            secret_data (Union[str, bytes]): The secret text or file content.
+            is_text (bool): True if secret_data is text.
+            original_filename (str, optional): Filename recorded for file payloads.
+
+        Returns:
+            int: Estimated encrypted payload size in bytes, comparable to capacity().
+        """
+        data_bytes = secret_data.encode('utf-8') if is_text else secret_data
+        # The JSON wrapper around the base64 content is tiny and left uncompressed here
+        wrapper = self.stego._serialize_payload("" if is_text else b"", is_text, original_filename)
+
+        with self._lock:
+            known, self._chunk_sizes = self._chunk_sizes, {}
+            compressed = len(wrapper) + 6  # zlib header and checksum
+            for start in range(0, len(data_bytes), self.chunk_size):
+                chunk = data_bytes[start:start + self.chunk_size]
+                digest = hashlib.blake2b(chunk, digest_size=16).digest()
+                size = known.get(digest)
+                if size is None:
+                    deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+                    encoded = base64.b64encode(chunk)
+                    size = len(deflate.compress(encoded)) + len(deflate.flush())
+                self._chunk_sizes[digest] = size  # Only the current text's chunks are kept
+                compressed += size
+
+        # AES-CBC: a 16-byte IV, then PKCS7 padding to the next whole block
+        return 16 + (compressed // 16 + 1) * 16
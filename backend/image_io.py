@@ -0,0 +1,611 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import cv2
+import numpy as np
+
+# Formats that store pixel values exactly. Anything lossy (JPEG, lossy WebP) would
+# destroy the embedded bits, so both embedding output and extraction input are
+# restricted to these extensions.
+LOSSLESS_EXTENSIONS = ('.png', '.tif', '.tiff', '.bmp', '.webp', '.ppm', '.npy')
+
+# Uncompressed formats whose pixel data can be mapped straight from disk with np.memmap.
+# Mapped .npy files are raw BGR (h, w, 3) uint8 arrays as produced by np.save; other layouts are loaded whole.
+MEMMAP_EXTENSIONS = ('.bmp', '.ppm', '.npy')
+
+
+class OutputOptions:
+    """
+    Controls how the stego image is encoded when it is written to disk.
+
+    The output format itself is picked from the extension of the output path;
+    these options only tune the encoder for that format. Leaving an option as
+    None keeps OpenCV's default for it.
+    """
+
+    PNG_STRATEGIES = {
+        "default": cv2.IMWRITE_PNG_STRATEGY_DEFAULT,
+        "filtered": cv2.IMWRITE_PNG_STRATEGY_FILTERED,
+        "huffman_only": cv2.IMWRITE_PNG_STRATEGY_HUFFMAN_ONLY,
+        "rle": cv2.IMWRITE_PNG_STRATEGY_RLE,
+        "fixed": cv2.IMWRITE_PNG_STRATEGY_FIXED,
+    }
+
+    # libtiff compression scheme ids (see tiff.h)
+    TIFF_COMPRESSIONS = {
+        "none": 1,
+        "lzw": 5,
+        "deflate": 8,
+        "packbits": 32773,
+    }
+
+    def __init__(self, png_compression: int = None, png_strategy: str = None, tiff_compression: str = None):
+        """
+        Args:
+            png_compression (int, optional): zlib level 0-9 for PNG output. Low values write
+                                             fast, high values write small files.
+            png_strategy (str, optional): zlib strategy for PNG output, one of PNG_STRATEGIES.
+            tiff_compression (str, optional): Lossless TIFF compression, one of TIFF_COMPRESSIONS.
+
+        Raises:
+            ValueError: If an option is out of range or unknown.
+        """
+        if png_compression is not None and not 0 <= png_compression <= 9:
+            raise ValueError(f"PNG compression level must be between 0 and 9, got {png_compression}.")
+        if png_strategy is not None and png_strategy not in self.PNG_STRATEGIES:
+            raise ValueError(f"Unknown PNG strategy '{png_strategy}'. "
+                             f"Expected one of: {', '.join(self.PNG_STRATEGIES)}.")
+        if tiff_compression is not None and tiff_compression not in self.TIFF_COMPRESSIONS:
+            raise ValueError(f"Unknown TIFF compression '{tiff_compression}'. "
+                             f"Expected one of: {', '.join(self.TIFF_COMPRESSIONS)}.")
+        self.png_compression = png_compression
+        self.png_strategy = png_strategy
+        self.tiff_compression = tiff_compression
+
+    @classmethod
+    def fast(cls):
+        """Favours encode speed over file size."""
+        return cls(png_compression=1, png_strategy="huffman_only", tiff_compression="none")
+
+    @classmethod
+    def small(cls):
+        """Favours file size over encode speed."""
+        return cls(png_compression=9, png_strategy="default", tiff_compression="deflate")
+
+    def imwrite_params(self, extension: str) -> list:
+        """Builds the cv2.imwrite parameter list for the given file extension."""
+        params = []
+        if extension == '.png':
+            if self.png_compression is not None:
+                params += [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression]
+            # OpenCV resets the strategy whenever a compression level is given,
+            # so the strategy has to come after it to take effect.
+            if self.png_strategy is not None:
+                params += [cv2.IMWRITE_PNG_STRATEGY, self.PNG_STRATEGIES[self.png_strategy]]
+        elif extension in ('.tif', '.tiff'):
+            if self.tiff_compression is not None:
+                params += [cv2.IMWRITE_TIFF_COMPRESSION, self.TIFF_COMPRESSIONS[self.tiff_compression]]
+        elif extension == '.webp':
+            # Any quality above 100 selects libwebp's lossless mode.
+            params += [cv2.IMWRITE_WEBP_QUALITY, 101]
+        return params
+
+
+def image_extension(path: str) -> str:
+    """Returns the lower-cased extension of an image path, including the dot."""
+    return os.path.splitext(path)[1].lower()
+
+
+def is_lossless_path(path: str) -> bool:
+    """True if the path has the extension of one of the supported lossless formats."""
+    return image_extension(path) in LOSSLESS_EXTENSIONS
+
+
+def read_image(path: str):
+    """
+    Decodes an image in its own channel layout, or returns None if it can't be read.
+
+    8-bit grayscale images come back as (h, w) arrays and images with an alpha channel as
+    (h, w, 4) BGRA; everything else (including 16-bit images) is converted to (h, w, 3) BGR.
+    Raw .npy arrays are loaded with NumPy since OpenCV has no codec for them.
+    """
+    if image_extension(path) == '.npy':
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            return None
+    img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if img is None or (img.dtype == np.uint8 and (img.ndim == 2 or img.shape[2] in (3, 4))):
+        return img
+    return cv2.imread(path)
+
+
+def storable_layout(img: np.ndarray, path: str) -> np.ndarray:
+    """
+    Converts an image to a channel layout the format of `path` can store exactly, or returns it
+    unchanged. PPM only holds BGR, and lossless WebP has no grayscale mode (it decodes as BGR).
+    """
+    extension = image_extension(path)
+    if img.ndim == 2 and extension in ('.ppm', '.webp'):
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    if img.ndim == 3 and img.shape[2] == 4 and extension == '.ppm':
+        return np.ascontiguousarray(img[..., :3])
+    return img
+
+
+def open_memmap(path: str, mode: str = 'r'):
+    """
+    Maps the pixels of an uncompressed image file into memory without decoding it.
+
+    Only the pages that are actually indexed get read from (or written back to) disk,
+    so touching a few blocks of a multi-gigabyte image stays cheap.
+
+    Args:
+        path (str): Path to a .bmp (24-bit, uncompressed), .ppm (binary P6, 8-bit) or .npy file.
+        mode (str): 'r' for read-only access, 'r+' to modify the file in place.
+
+    Returns:
+        np.ndarray: A (h, w, 3) BGR view backed by the file, or None if the file's
+                    layout isn't one that can be mapped (callers then fall back to read_image).
+    """
+    extension = image_extension(path)
+    try:
+        if extension == '.bmp':
+            return _memmap_bmp(path, mode)
+        if extension == '.ppm':
+            return _memmap_ppm(path, mode)
+        if extension == '.npy':
+            img = np.load(path, mmap_mode=mode)
+            if img.dtype == np.uint8 and img.ndim == 3 and img.shape[2] == 3:
+                return img
+    except (OSError, ValueError, struct.error):
+        pass
+    return None
+
+
+def _memmap_base(img):
+    """The np.memmap an array view ultimately refers to, or None for ordinary arrays."""
+    base = img
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    return base
+
+
+def is_memmapped(img) -> bool:
+    """True if the array is (a view of) a memory-mapped file."""
+    return _memmap_base(img) is not None
+
+
+def flush_memmap(img) -> None:
+    """Writes pending changes of a view returned by open_memmap back to its file."""
+    base = _memmap_base(img)
+    if base is not None:
+        base.flush()
+
+
+def _memmap_bmp(path: str, mode: str):
+    """Maps a 24-bit BI_RGB bitmap. Rows are padded to 4 bytes and stored bottom-up unless the height is negative."""
+    with open(path, 'rb') as f:
+        header = f.read(54)
+    if len(header) < 54 or header[:2] != b'BM':
+        return None
+    pixel_offset = struct.unpack_from('<I', header, 10)[0]
+    dib_size, width, height, _, bits_per_pixel, compression = struct.unpack_from('<IiiHHI', header, 14)
+    if dib_size < 40 or bits_per_pixel != 24 or compression != 0 or width <= 0 or height == 0:
+        return None
+
+    row_stride = (width * 3 + 3) & ~3
+    rows = np.memmap(path, dtype=np.uint8, mode=mode, offset=pixel_offset, shape=(abs(height), row_stride))
+    img = rows[:, :width * 3].reshape(abs(height), width, 3)
+    return img[::-1] if height > 0 else img
+
+
+def _memmap_ppm(path: str, mode: str):
+    """Maps a binary (P6) pixmap with 8-bit samples. PPM stores RGB, so the view reverses the channel axis."""
+    with open(path, 'rb') as f:
+        head = f.read(1024)
+    if head[:2] != b'P6':
+        return None
+
+    # Header: magic, width, height, maxval separated by whitespace, with '#' comments to end of line,
+    # followed by exactly one whitespace byte before the raster.
+    tokens = []
+    pos = 2
+    while len(tokens) < 3 and pos < len(head):
+        char = head[pos:pos + 1]
+        if char.isspace():
+            pos += 1
+        elif char == b'#':
+            pos = head.index(b'\n', pos) + 1
+        else:
+            end = pos
+            while end < len(head) and not head[end:end + 1].isspace() and head[end:end + 1] != b'#':
+                end += 1
+            tokens.append(int(head[pos:end]))
+            pos = end
+    if len(tokens) < 3 or tokens[2] > 255:
+        return None
+
+    width, height, _ = tokens
+    data = np.memmap(path, dtype=np.uint8, mode=mode, offset=pos + 1, shape=(height, width, 3))
+    return data[..., ::-1]
+
+
+def read_leading_rows(path: str, count: int) -> tuple:
+    """
+    Decodes only the first `count` pixel rows of an image, for callers that just need a header.
+
+    Memory-mappable formats are sliced from the mapping and 8-bit non-interlaced PNGs are inflated
+    only as far as those rows; anything else falls back to decoding the whole image.
+
+    Args:
+        path (str): Image path.
+        count (int): Number of rows wanted.
+
+    Returns:
+        tuple: (rows, shape) where rows holds the first `count` rows (fewer if the image is
+               shorter) in the layout read_image gives, and shape is the shape of the full
+               image, or (None, None) if the image can't be read.
+    """
+    img = open_memmap(path) if image_extension(path) in MEMMAP_EXTENSIONS else None
+    if img is not None:
+        return np.array(img[:count]), img.shape
+    if image_extension(path) == '.png':
+        try:
+            decoded = _read_png_rows(path, count)
+        except (OSError, ValueError, struct.error, zlib.error):
+            decoded = None
+        if decoded is not None:
+            return decoded
+    img = read_image(path)
+    if img is None:
+        return None, None
+    return img[:count], img.shape
+
+
+def read_image_shape(path: str):
+    """
+    Reads the shape read_image would give an image, from the file header alone where possible.
+
+    Memory-mappable formats are mapped (which reads no pixel data) and PNGs are parsed up to
+    their first image data chunk; anything else falls back to decoding the whole image.
+
+    Args:
+        path (str): Image path.
+
+    Returns:
+        tuple or None: The (h, w) or (h, w, channels) shape, or None if the image can't be read.
+    """
+    extension = image_extension(path)
+    img = open_memmap(path) if extension in MEMMAP_EXTENSIONS else None
+    if img is not None:
+        return img.shape
+    if extension == '.npy':
+        try:
+            return np.load(path, mmap_mode='r').shape
+        except (OSError, ValueError):
+            return None
+    if extension == '.png':
+        try:
+            shape = _read_png_shape(path)
+        except (OSError, struct.error):
+            shape = None
+        if shape is not None:
+            return shape
+    img = read_image(path)
+    return None if img is None else img.shape
+
+
+# PNG colour types this decoder handles (8-bit samples only), with their bytes per pixel
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Image data is read this many bytes at a time, so reading the first rows never takes in
+# more than a little past them, however large the file's IDAT chunks are
+_PNG_READ_BYTES = 8 * 1024
+
+
+def _read_png_rows(path: str, count: int):
+    """Inflates and unfilters the first rows of an 8-bit, non-interlaced PNG. Returns None for other PNGs."""
+    with open(path, 'rb') as f:
+        if f.read(8) != b'\x89PNG\r\n\x1a\n':
+            return None
+        width = height = bpp = None
+        palette = None
+        inflater = zlib.decompressobj()
+        wanted = raw = None
+        while True:
+            length, chunk_type = struct.unpack('>I4s', f.read(8))
+            if chunk_type == b'IHDR':
+                width, height, depth, colour_type, _, _, interlace = struct.unpack('>IIBBBBB', f.read(13))
+                if depth != 8 or interlace != 0 or colour_type not in _PNG_CHANNELS:
+                    return None
+                bpp = _PNG_CHANNELS[colour_type]
+                wanted = min(count, height) * (1 + width * bpp)
+                raw = bytearray()
+                f.seek(4, os.SEEK_CUR)
+            elif chunk_type == b'PLTE':
+                palette = np.frombuffer(f.read(length), dtype=np.uint8).reshape(-1, 3)
+                f.seek(4, os.SEEK_CUR)
+            elif chunk_type == b'tRNS':
+                return None  # Transparency turns the image into BGRA; left to the full decoder
+            elif chunk_type == b'IDAT' and raw is not None:
+                while length and len(raw) < wanted:
+                    piece = f.read(min(length, _PNG_READ_BYTES))
+                    if not piece:
+                        return None
+                    length -= len(piece)
+                    raw += inflater.decompress(piece, wanted - len(raw))
+                if len(raw) >= wanted:
+                    break
+                f.seek(length + 4, os.SEEK_CUR)
+            elif chunk_type == b'IEND' or not chunk_type:
+                return None
+            else:
+                f.seek(length + 4, os.SEEK_CUR)
+
+    stride = width * bpp
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 1 + stride)
+    pixels = np.zeros((len(rows), stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.uint8)
+    for y, (filter_type, line) in enumerate(zip(rows[:, 0], rows[:, 1:])):
+        pixels[y] = _png_unfilter(filter_type, line, previous, bpp)
+        previous = pixels[y]
+
+    pixels = pixels.reshape(len(rows), width, bpp)
+    # Same layouts as read_image: gray as (h, w), anything with alpha as BGRA, the rest as BGR
+    if colour_type == 3:
+        if palette is None:
+            return None
+        out = palette[pixels[..., 0]][..., ::-1]
+    elif colour_type == 0:
+        out = pixels[..., 0]
+    elif colour_type == 4:
+        out = pixels[..., [0, 0, 0, 1]]
+    else:
+        out = pixels[..., [2, 1, 0, 3][:bpp]]  # RGB(A) to BGR(A)
+    return np.ascontiguousarray(out), (height, width) + out.shape[2:]
+
+
+def _read_png_shape(path: str):
+    """Shape of an 8-bit PNG in read_image's layout, from the chunks before its image data. None for other PNGs."""
+    with open(path, 'rb') as f:
+        if f.read(8) != b'\x89PNG\r\n\x1a\n':
+            return None
+        length, chunk_type = struct.unpack('>I4s', f.read(8))
+        if chunk_type != b'IHDR':
+            return None
+        width, height, depth, colour_type = struct.unpack('>IIBB', f.read(10))
+        f.seek(length - 10 + 4, os.SEEK_CUR)
+        while True:
+            length, chunk_type = struct.unpack('>I4s', f.read(8))
+            if chunk_type == b'tRNS':
+                return None  # Transparency turns the image into BGRA; left to the full decoder
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            f.seek(length + 4, os.SEEK_CUR)
+    if depth != 8 or colour_type not in _PNG_CHANNELS:
+        return None
+    if colour_type == 0:
+        return height, width
+    return height, width, 4 if colour_type in (4, 6) else 3
+
+
+def _png_unfilter(filter_type: int, line: np.ndarray, previous: np.ndarray, bpp: int) -> np.ndarray:
+    """Reverses one PNG scanline filter (None, Sub, Up, Average or Paeth)."""
+    if filter_type == 0:
+        return line
+    if filter_type == 2:
+        return line + previous  # uint8 arithmetic wraps mod 256 as the spec requires
+    if filter_type == 1 or (filter_type == 4 and not previous.any()):
+        # Sub, and Paeth over a zero row (which always predicts the left neighbour):
+        # a running sum per channel
+        sums = np.cumsum(line.reshape(-1, bpp).astype(np.uint32), axis=0)
+        return (sums % 256).astype(np.uint8).reshape(-1)
+    if filter_type not in (3, 4):
+        raise ValueError(f"Invalid PNG filter type {filter_type}")
+
+    out = bytearray(line.tobytes())
+    up = previous.tobytes()
+    for i in range(len(out)):
+        left = out[i - bpp] if i >= bpp else 0
+        if filter_type == 3:
+            out[i] = (out[i] + ((left + up[i]) >> 1)) & 0xFF
+        else:
+            upper_left = up[i - bpp] if i >= bpp else 0
+            estimate = left + up[i] - upper_left
+            pa, pb, pc = abs(estimate - left), abs(estimate - up[i]), abs(estimate - upper_left)
+            predictor = left if pa <= pb and pa <= pc else up[i] if pb <= pc else upper_left
+            out[i] = (out[i] + predictor) & 0xFF
+    return np.frombuffer(bytes(out), dtype=np.uint8)
+
+
+def write_image(path: str, img, options: OutputOptions = None) -> str:
+    """
+    Writes an image losslessly, choosing the format from the path extension.
+
+    Args:
+        path (str): Destination path. Its extension selects the format.
+        img (np.ndarray): The image to write.
+        options (OutputOptions, optional): Encoder tuning. Defaults to OpenCV's settings,
+                                           except that WebP is always written losslessly.
+
+    Returns:
+        str: The path that was written.
+
+    Raises:
+        ValueError: If the format is not lossless or the encoder fails.
+    """
+    extension = image_extension(path)
+    if extension not in LOSSLESS_EXTENSIONS:
+        raise ValueError(f"Unsupported output format '{extension}'. "
+                         f"Use one of the lossless formats: {', '.join(LOSSLESS_EXTENSIONS)}.")
+    if options is None:
+        options = OutputOptions()
+
+    if extension == '.npy':
+        np.save(path, np.ascontiguousarray(img))
+        return path
+    if not cv2.imwrite(path, img, options.imwrite_params(extension)):
+        raise ValueError(f"Failed to write image: {path}")
+    return path
+
+
+class PngStripeWriter:
+    """
+    Encodes a PNG incrementally, a stripe of finished rows at a time.
+
+    Rows are filtered and deflated on a background thread (zlib releases the GIL), so the
+    encode overlaps whatever produces the next stripe. Rows must be passed top to bottom and
+    must not change after they are written.
+
+    Image data goes out in IDAT chunks of IDAT_CHUNK_BYTES (the last one shorter), so readers
+    that only need the first rows (see read_leading_rows) never have to take in a huge chunk.
+    """
+
+    IDAT_CHUNK_BYTES = 256 * 1024
+    STRIPE_BYTES = 4 * 1024 * 1024  # Most raw pixel data handed to the encoder at a time
+
+    _ZLIB_STRATEGIES = {
+        "default": zlib.Z_DEFAULT_STRATEGY,
+        "filtered": zlib.Z_FILTERED,
+        "huffman_only": zlib.Z_HUFFMAN_ONLY,
+        "rle": zlib.Z_RLE,
+        "fixed": zlib.Z_FIXED,
+    }
+    _COLOUR_TYPES = {1: 0, 3: 2, 4: 6}  # channels -> PNG colour type
+
+    def __init__(self, path: str, shape, options: OutputOptions = None):
+        """
+        Args:
+            path (str): Destination .png path.
+            shape (tuple): (h, w) or (h, w, channels) of the image; BGR and BGRA are written as RGB(A).
+            options (OutputOptions, optional): PNG compression level and strategy. Defaults to
+                                               level 1 with run-length matching, close to OpenCV's
+                                               speed and size.
+
+        Raises:
+            ValueError: If the channel count is not 1, 3 or 4.
+        """
+        height, width = shape[:2]
+        self.channels = shape[2] if len(shape) > 2 else 1
+        if self.channels not in self._COLOUR_TYPES:
+            raise ValueError(f"Can't write {self.channels}-channel images as PNG.")
+        options = options or OutputOptions()
+        level = 1 if options.png_compression is None else options.png_compression
+        strategy = options.png_strategy or ("rle" if options.png_compression is None else "default")
+        self.paeth = level >= 6  # Better prediction when size matters more than speed
+
+        self.path = path
+        self.height = height
+        self.rows_written = 0
+        self._stripe_rows = max(1, self.STRIPE_BYTES // (width * self.channels))
+        self._idat = bytearray()  # Compressed data not yet written out as a full IDAT chunk
+        self._previous = np.zeros((1, width * self.channels), dtype=np.uint8)
+        self._deflater = zlib.compressobj(level, zlib.DEFLATED, 15, 8, self._ZLIB_STRATEGIES[strategy])
+        self._file = open(path, 'wb')
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8,
+                                               self._COLOUR_TYPES[self.channels], 0, 0, 0))
+        self._queue = queue.Queue(maxsize=4)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """
+        Queues the next rows (an (n, w[, channels]) uint8 array) for encoding, in stripes of at
+        most STRIPE_BYTES, so any number of rows can be passed at once.
+        """
+        for start in range(0, len(rows), self._stripe_rows):
+            if self._error is not None:
+                raise ValueError(f"Failed to write image: {self.path}: {self._error}")
+            stripe = rows[start:start + self._stripe_rows]
+            self._queue.put(stripe)
+            self.rows_written += len(stripe)
+
+    def close(self) -> str:
+        """Finishes the file once every row has been written. Returns its path."""
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self._error is not None:
+                raise ValueError(f"Failed to write image: {self.path}: {self._error}")
+            if self.rows_written != self.height:
+                raise ValueError(f"PNG stream got {self.rows_written} of {self.height} rows: {self.path}")
+            self._write_idat(self._deflater.flush(), final=True)
+            self._write_chunk(b'IEND', b'')
+        except BaseException:
+            self._file.close()
+            _remove_quietly(self.path)
+            raise
+        self._file.close()
+        return self.path
+
+    def abort(self) -> None:
+        """Stops encoding and removes the partial file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        _remove_quietly(self.path)
+
+    def _run(self):
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._write_idat(self._deflater.compress(self._filter(rows)))
+            except Exception as e:  # Reported by the next write_rows or close
+                self._error = e
+
+    def _filter(self, rows: np.ndarray) -> bytes:
+        """Applies the Up (or Paeth) filter to a stripe and prefixes each row's filter byte."""
+        if self.channels == 1:
+            raw = rows.reshape(len(rows), -1)
+        else:
+            order = [2, 1, 0, 3][:self.channels]  # BGR(A) to RGB(A)
+            raw = rows[..., order].reshape(len(rows), -1)
+        above = np.concatenate([self._previous, raw[:-1]])
+        self._previous = raw[-1:].copy()
+
+        if self.paeth:
+            bpp = self.channels
+            left = np.zeros(raw.shape, dtype=np.int16)
+            left[:, bpp:] = raw[:, :-bpp]
+            up = above.astype(np.int16)
+            upper_left = np.zeros(raw.shape, dtype=np.int16)
+            upper_left[:, bpp:] = above[:, :-bpp]
+            estimate = left + up - upper_left
+            pa, pb, pc = np.abs(estimate - left), np.abs(estimate - up), np.abs(estimate - upper_left)
+            predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upper_left))
+            filtered, filter_type = (raw - predictor).astype(np.uint8), 4
+        else:
+            filtered, filter_type = raw - above, 2  # uint8 arithmetic wraps mod 256
+        lines = np.empty((len(raw), raw.shape[1] + 1), dtype=np.uint8)
+        lines[:, 0] = filter_type
+        lines[:, 1:] = filtered
+        return lines.tobytes()
+
+    def _write_idat(self, compressed: bytes, final: bool = False) -> None:
+        """Writes compressed data out as full IDAT chunks, and with final, whatever is left."""
+        self._idat += compressed
+        full = len(self._idat) if final else len(self._idat) - len(self._idat) % self.IDAT_CHUNK_BYTES
+        for start in range(0, full, self.IDAT_CHUNK_BYTES):
+            self._write_chunk(b'IDAT', bytes(self._idat[start:start + self.IDAT_CHUNK_BYTES]))
+        del self._idat[:full]
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._file.write(struct.pack('>I', len(data)) + chunk_type + data)
+        self._file.write(struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,138 @@
+"""
+Block kernels for the DCT engine's quantize-and-parity hot loop.
+
+When numba is installed, embedding and extraction run through compiled per-block kernels
+that fuse the DCT projection with the quantization: only the embedding coefficients are
+projected, and the pixels are updated with the change in those coefficients instead of a
+full forward and inverse transform. Without numba (or with STEGO_DISABLE_JIT set) the
+same functions fall back to the NumPy matrix formulation.
+
+The kernels are compiled on a background thread at import time, so the first embed
+doesn't pay for compilation unless it starts before the warm-up has finished.
+"""
+import os
+import threading
+
+import numpy as np
+
+try:
+    if os.environ.get("STEGO_DISABLE_JIT"):
+        raise ImportError("JIT kernels disabled by STEGO_DISABLE_JIT")
+    from numba import njit
+except ImportError:
+    njit = None
+
+# "numba" when the compiled kernels are in use, otherwise "numpy"
+BACKEND = "numba" if njit is not None else "numpy"
+
+
+def quantize_to_bits(coeff_values: np.ndarray, targets: np.ndarray, step: float) -> np.ndarray:
+    """
+    Moves each coefficient to the nearest multiple of step whose parity is the target bit.
+    Targets of -1 leave the value as is.
+    """
+    quantized = np.round(coeff_values / step)
+    parity = np.mod(quantized, 2)
+    modified = np.where(targets == 0, quantized - parity, quantized + 1 - parity) * step
+    return np.where(targets < 0, coeff_values, modified)
+
+
+def embed_blocks(planes: np.ndarray, basis: np.ndarray, coeff_rows: np.ndarray, coeff_cols: np.ndarray,
+                 targets: np.ndarray, step: float) -> np.ndarray:
+    """
+    Embeds target bits into a stack of pixel blocks.
+
+    Args:
+        planes (np.ndarray): (n, 8, 8) float32 blocks of one colour plane.
+        basis (np.ndarray): Orthonormal DCT basis, so a block's transform is basis @ block @ basis.T.
+        coeff_rows, coeff_cols (np.ndarray): Positions of the embedding coefficients.
+        targets (np.ndarray): (n, len(coeff_rows)) bits per block, -1 to keep a coefficient.
+        step (float): Quantization step.
+
+    Returns:
+        np.ndarray: (n, 8, 8) float32 blocks with the bits embedded (not yet rounded or clipped).
+    """
+    if _embed_blocks_jit is not None and len(planes):
+        return _embed_blocks_jit(np.ascontiguousarray(planes, dtype=np.float32), basis,
+                                 coeff_rows.astype(np.int64), coeff_cols.astype(np.int64),
+                                 np.ascontiguousarray(targets, dtype=np.int8), float(step))
+    dct_blocks = basis @ planes.astype(np.float32) @ basis.T
+    dct_blocks[:, coeff_rows, coeff_cols] = quantize_to_bits(dct_blocks[:, coeff_rows, coeff_cols], targets, step)
+    return basis.T @ dct_blocks @ basis
+
+
+def read_bits(planes: np.ndarray, basis: np.ndarray, coeff_rows: np.ndarray, coeff_cols: np.ndarray,
+              step: float) -> np.ndarray:
+    """
+    Reads the parity of the quantized embedding coefficients of a stack of pixel blocks.
+
+    Returns:
+        np.ndarray: (n, len(coeff_rows)) uint8 bits.
+    """
+    if _read_bits_jit is not None and len(planes):
+        return _read_bits_jit(np.ascontiguousarray(planes, dtype=np.float32), basis,
+                              coeff_rows.astype(np.int64), coeff_cols.astype(np.int64), float(step))
+    dct_blocks = basis @ planes.astype(np.float32) @ basis.T
+    return np.mod(np.round(dct_blocks[:, coeff_rows, coeff_cols] / step), 2).astype(np.uint8)
+
+
+_embed_blocks_jit = None
+_read_bits_jit = None
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _project(block, basis, row, col):
+        """One DCT coefficient of a block: basis[row] @ block @ basis[col]."""
+        size = block.shape[0]
+        total = 0.0
+        for i in range(size):
+            inner = 0.0
+            for j in range(size):
+                inner += block[i, j] * basis[col, j]
+            total += basis[row, i] * inner
+        return total
+
+    @njit(cache=True, nogil=True)
+    def _embed_blocks_jit(planes, basis, coeff_rows, coeff_cols, targets, step):
+        out = planes.copy()
+        size = planes.shape[1]
+        for b in range(planes.shape[0]):
+            for s in range(coeff_rows.shape[0]):
+                target = targets[b, s]
+                if target < 0:
+                    continue
+                row, col = coeff_rows[s], coeff_cols[s]
+                value = _project(planes[b], basis, row, col)
+                quantized = float(round(value / step))
+                parity = quantized % 2
+                if target == 0:
+                    quantized -= parity
+                else:
+                    quantized += 1 - parity
+                delta = quantized * step - value
+                if delta != 0.0:
+                    # Inverse transform of the change alone: a rank-one update of the block
+                    for i in range(size):
+                        for j in range(size):
+                            out[b, i, j] += delta * basis[row, i] * basis[col, j]
+        return out
+
+    @njit(cache=True, nogil=True)
+    def _read_bits_jit(planes, basis, coeff_rows, coeff_cols, step):
+        bits = np.empty((planes.shape[0], coeff_rows.shape[0]), dtype=np.uint8)
+        for b in range(planes.shape[0]):
+            for s in range(coeff_rows.shape[0]):
+                quantized = float(round(_project(planes[b], basis, coeff_rows[s], coeff_cols[s]) / step))
+                bits[b, s] = int(quantized % 2)
+        return bits
+
+    def _warm_up():
+        """Compiles the kernels (or loads them from numba's cache) off the main thread."""
+        planes = np.zeros((1, 8, 8), dtype=np.float32)
+        basis = np.eye(8, dtype=np.float32)
+        index = np.zeros(1, dtype=np.int64)
+        _embed_blocks_jit(planes, basis, index, index, np.zeros((1, 1), dtype=np.int8), 16.0)
+        _read_bits_jit(planes, basis, index, index, 16.0)
+
+    warm_up_thread = threading.Thread(target=_warm_up, name="stego-kernel-warm-up", daemon=True)
+    warm_up_thread.start()
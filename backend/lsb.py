@@ -0,0 +1,151 @@
+import numpy as np
+
+from backend.steganography import DCTSteganography
+
+
+class LSBSteganography(DCTSteganography):
+    """
+    Spatial-domain engine: the encrypted payload goes straight into the low bits of the pixel
+    values, with no transforms at all.
+
+    It is several times faster than the DCT engine and, at 2 or more bits per value, holds
+    several times as much, but any change to the pixels (re-encoding, resizing, even lossless
+    re-quantization by an editor) destroys the payload. Meant for transfers where the file
+    arrives byte for byte. Payload preparation, the header, the key check and sharding,
+    segments, archives and partitions all work exactly as with the DCT engine.
+
+    The payload fills the colour values after the header area in row-major order, then (with
+    use_alpha, on BGRA covers) every alpha value.
+    """
+
+    ENGINE_ID = 1
+    ENGINE_NAME = "lsb"
+
+    def __init__(self, bits_per_channel: int = 2):
+        """
+        Args:
+            bits_per_channel (int): Payload bits stored in each pixel value (1-4). Each extra bit
+                                    doubles the visible noise.
+
+        Raises:
+            ValueError: If bits_per_channel is out of range.
+        """
+        super().__init__()
+        if not 1 <= bits_per_channel <= 4:
+            raise ValueError(f"Bits per channel must be between 1 and 4, got {bits_per_channel}.")
+        self.bits_per_channel = bits_per_channel
+        # The payload starts after every pixel value an LSB header could occupy
+        self.payload_offset = self.MAX_HEADER_SIZE * 8
+
+    def _engine_fields(self) -> dict:
+        """Records the engine and its bits per channel."""
+        return {self.FIELD_ENGINE: bytes([self.ENGINE_ID, self.bits_per_channel])}
+
+    def _decode_engine_params(self, value: bytes) -> dict:
+        if len(value) != 1 or not 1 <= value[0] <= 4:
+            raise ValueError("Stego header holds invalid LSB engine parameters.")
+        return {"bits_per_channel": value[0]}
+
+    def _capacity_bits(self, shape) -> int:
+        """Total number of payload bits an image of the given shape can hold."""
+        values = max(int(np.prod(self._colour_shape(shape))) - self.payload_offset, 0)
+        if len(self._stream_planes(shape)) == 4:
+            values += shape[0] * shape[1]
+        return values * self.bits_per_channel
+
+    def _value_spans(self, img: np.ndarray, first: int, end: int) -> list:
+        """
+        Locates payload values [first, end) as (array, lo, hi) ranges of flat positions within the
+        image's colour values (after the header area) and, with use_alpha, its alpha values.
+        """
+        if len(self._stream_planes(img.shape)) == 4:
+            planes = [(img[..., :3], self.payload_offset), (img[..., 3], 0)]
+        elif img.ndim == 3 and img.shape[2] == 4:
+            planes = [(img[..., :3], self.payload_offset)]
+        else:
+            planes = [(img, self.payload_offset)]
+
+        spans = []
+        position = 0
+        for values, skip in planes:
+            count = max(values.size - skip, 0)
+            lo, hi = max(first - position, 0), min(end - position, count)
+            if lo < hi:
+                spans.append((values, skip + lo, skip + hi))
+            position += count
+        return spans
+
+    def _value_range(self, start_bit: int, num_bits: int) -> tuple:
+        """First and end (exclusive) payload value holding a bit range, and the bit offset into the first."""
+        k = self.bits_per_channel
+        first = start_bit // k
+        return first, -(-(start_bit + num_bits) // k), start_bit - first * k
+
+    def _get_values(self, img: np.ndarray, first: int, end: int) -> np.ndarray:
+        """Payload values [first, end) in stream order (copied)."""
+        parts = []
+        for values, lo, hi in self._value_spans(img, first, end):
+            if values.flags.c_contiguous:
+                parts.append(np.array(values.reshape(-1)[lo:hi]))
+            else:  # e.g. bottom-up BMP memory maps, or the colour values of a BGRA image
+                parts.append(values[np.unravel_index(np.arange(lo, hi), values.shape)])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+
+    def _set_values(self, img: np.ndarray, first: int, new_values: np.ndarray) -> None:
+        done = 0
+        for values, lo, hi in self._value_spans(img, first, first + len(new_values)):
+            if values.flags.c_contiguous:
+                values.reshape(-1)[lo:hi] = new_values[done:done + hi - lo]
+            else:
+                values[np.unravel_index(np.arange(lo, hi), values.shape)] = new_values[done:done + hi - lo]
+            done += hi - lo
+
+    def _unpack_values(self, values: np.ndarray) -> np.ndarray:
+        """The low bits of each value, most significant first, as one bit array."""
+        shifts = np.arange(self.bits_per_channel - 1, -1, -1, dtype=np.uint8)
+        return ((values[:, None] >> shifts) & 1).astype(np.uint8).reshape(-1)
+
+    def _extract_bits(self, img: np.ndarray, num_bits: int, start_bit: int = 0) -> np.ndarray:
+        """Reads payload bits [start_bit, start_bit + num_bits) from the pixel values' low bits."""
+        first, end, skip = self._value_range(start_bit, num_bits)
+        return self._unpack_values(self._get_values(img, first, end))[skip:skip + num_bits]
+
+    def _embed_bits(self, img: np.ndarray, bits: np.ndarray, start_bit: int = 0) -> None:
+        """Writes bits into payload positions [start_bit, start_bit + len(bits)), in place."""
+        k = self.bits_per_channel
+        first, end, skip = self._value_range(start_bit, len(bits))
+        values = self._get_values(img, first, end)
+        stream = np.asarray(bits, dtype=np.uint8)
+        if skip or len(stream) != (end - first) * k:  # Keep the bits of partly covered values
+            stream = self._unpack_values(values)
+            stream[skip:skip + len(bits)] = bits
+        shifts = np.arange(k - 1, -1, -1, dtype=np.uint8)
+        low_bits = (stream.reshape(-1, k) << shifts).sum(axis=1, dtype=np.uint8)
+        self._set_values(img, first, (values & np.uint8(0xFF ^ ((1 << k) - 1))) | low_bits)
+
+    def _embed_payload(self, stego_img: np.ndarray, encrypted_data: bytes, header: bytes,
+                       verify: bool = False, cover: dict = None) -> dict:
+        """Embeds the payload and the LSB header, in place. Returns the verification report, if any."""
+        return self._append_stream(stego_img, encrypted_data, 0, header, verify)
+
+    def _append_stream(self, stego_img: np.ndarray, data: bytes, start: int, header: bytes,
+                       verify: bool = False) -> dict:
+        """Writes bytes at offset `start` of the embedded stream and rewrites the header, in place."""
+        bits = self._to_bits(data)
+        self._embed_bits(stego_img, bits, start * 8)
+        self._write_lsb_bits(stego_img, self._to_bits(header))
+        if not verify:
+            return None
+        # Plain bit writes can't fail; the read-back only guards against mistakes upstream
+        errors = int((self._extract_bits(stego_img, len(bits), start * 8) != bits).sum())
+        return self._record_verification({"bit_errors_initial": errors, "blocks_repaired": 0,
+                                          "repair_passes": 0, "bit_errors_final": errors})
+
+    def _can_stream(self, shape, header: bytes) -> bool:
+        """Embedding is a single vectorized write, so there is nothing to overlap the encode with."""
+        return False
+
+    def _transform_cover(self, img: np.ndarray) -> dict:
+        """Caches only the decoded cover; this engine does no colour conversion or DCT."""
+        img.setflags(write=False)
+        return {"bgr": img, "ycrcb": None, "dct": None}
@@ -0,0 +1,282 @@
+"""
+Local HTTP service exposing the steganography backend.
+
+All endpoints take POST requests whose body is streamed to a temporary file, and
+the CPU work runs on a bounded process pool. When every worker is busy and the
+request queue is full, new requests are turned away with 429 instead of piling up.
+
+Endpoints:
+    POST /embed?type=text|file&filename=<name>&format=<cover ext>&output=<stego ext>
+        Headers: X-Stego-Password, X-Cover-Length (size of the cover image in bytes)
+        Body:    the cover image bytes immediately followed by the secret (UTF-8 text or file bytes)
+        Returns: the stego image
+
+    POST /extract?format=<stego ext>
+        Headers: X-Stego-Password
+        Body:    the stego image
+        Returns: the hidden text (text/plain) or file (application/octet-stream with a
+                 Content-Disposition filename). X-Stego-Type tells which.
+
+    POST /capacity?format=<image ext>
+        Body:    the image
+        Returns: JSON {"capacity_bytes"}
+
+Run with:
+    python -m backend.server --port 8765 --workers 4 --queue 8
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from backend.image_io import LOSSLESS_EXTENSIONS
+from backend.steganography import DCTSteganography
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _embed_job(cover_path: str, secret_path: str, password: str, is_text: bool,
+               original_filename: str, output_path: str) -> str:
+    """Worker-side embedding. Runs in a pool process, so it only takes and returns plain values."""
+    with open(secret_path, 'rb') as f:
+        secret_data = f.read()
+    if is_text:
+        secret_data = secret_data.decode('utf-8')
+    return DCTSteganography().embed_data(cover_path, secret_data, password, is_text,
+                                         original_filename=original_filename, output_path=output_path)
+
+
+def _extract_job(image_path: str, password: str, content_path: str) -> dict:
+    """Worker-side extraction. The content is written to content_path; the metadata is returned."""
+    stego = DCTSteganography()
+    result = stego.extract_data(image_path, password)
+    content = result.pop(stego.METADATA_KEY_CONTENT)
+    with open(content_path, 'wb') as f:
+        f.write(content.encode('utf-8') if result[stego.METADATA_KEY_TYPE] == stego.TEXT_TYPE else content)
+    return result
+
+
+def _content_disposition(filename: str, fallback: str) -> str:
+    """
+    Builds an attachment Content-Disposition header value for a file name that comes from an
+    untrusted payload. Path components, quotes and control characters (including CR/LF, which
+    would start a new header) are dropped. The name is sent RFC 5987-encoded, with an ASCII
+    fallback for clients that don't read filename*.
+    """
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    name = "".join(ch for ch in name if ch.isprintable() and ch != '"').strip()
+    if name in ("", ".", ".."):
+        name = fallback
+    ascii_name = "".join(ch if ch.isascii() else "_" for ch in name)
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+def _capacity_job(image_path: str) -> dict:
+    """Worker-side capacity calculation."""
+    return {"capacity_bytes": DCTSteganography().capacity(image_path)}
+
+
+class StegoRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the worker pool and streams bodies to and from disk."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        routes = {
+            "/embed": self._handle_embed,
+            "/extract": self._handle_extract,
+            "/capacity": self._handle_capacity,
+        }
+        handler = routes.get(url.path)
+        if handler is None:
+            self.close_connection = True
+            self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.close_connection = True
+            self._send_json(411, {"error": "A Content-Length header is required."})
+            return
+        length = int(length)
+        if length > self.server.max_body_bytes:
+            self._send_json(413, {"error": f"Request body exceeds {self.server.max_body_bytes} bytes."})
+            self.close_connection = True
+            return
+
+        # Backpressure: reject before reading the body when the pool and its queue are full
+        if not self.server.slots.acquire(blocking=False):
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self._send_json_body({"error": "Server busy, try again later."})
+            self.close_connection = True
+            return
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="stego-") as work_dir:
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                handler(work_dir, params, length)
+        except ValueError as ve:
+            self.close_connection = True  # Part of the body may still be unread
+            self._send_json(400, {"error": str(ve)})
+        except Exception as e:  # Corrupted images or wrong passwords surface as zlib/JSON errors
+            self.close_connection = True
+            self._send_json(422, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            self.server.slots.release()
+
+    def _handle_embed(self, work_dir: str, params: dict, length: int):
+        password = self._require_password()
+        cover_length = self.headers.get("X-Cover-Length", "")
+        if not cover_length.isdigit() or int(cover_length) > length:
+            raise ValueError("X-Cover-Length must give the size of the cover image within the body.")
+        is_text = params.get("type", "text") == "text"
+        cover_path = os.path.join(work_dir, "cover" + self._extension(params, "format"))
+        secret_path = os.path.join(work_dir, "secret.bin")
+        output_path = os.path.join(work_dir, "stego" + self._extension(params, "output"))
+
+        self._spool_body(cover_path, int(cover_length))
+        self._spool_body(secret_path, length - int(cover_length))
+
+        self.server.run_job(_embed_job, cover_path, secret_path, password, is_text,
+                            params.get("filename"), output_path)
+        self._send_file(200, output_path, "application/octet-stream",
+                        {"Content-Disposition": f'attachment; filename="stego{os.path.splitext(output_path)[1]}"'})
+
+    def _handle_extract(self, work_dir: str, params: dict, length: int):
+        password = self._require_password()
+        image_path = os.path.join(work_dir, "stego" + self._extension(params, "format"))
+        content_path = os.path.join(work_dir, "content.bin")
+        self._spool_body(image_path, length)
+
+        result = self.server.run_job(_extract_job, image_path, password, content_path)
+        headers = {"X-Stego-Type": result["type"]}
+        if result["type"] == "text":
+            content_type = "text/plain; charset=utf-8"
+        else:
+            content_type = "application/octet-stream"
+            headers["Content-Disposition"] = _content_disposition(result.get("filename"), "extracted_content")
+        self._send_file(200, content_path, content_type, headers)
+
+    def _handle_capacity(self, work_dir: str, params: dict, length: int):
+        image_path = os.path.join(work_dir, "image" + self._extension(params, "format"))
+        self._spool_body(image_path, length)
+        self._send_json(200, self.server.run_job(_capacity_job, image_path))
+
+    def _require_password(self) -> str:
+        password = self.headers.get("X-Stego-Password")
+        if not password:
+            raise ValueError("An X-Stego-Password header is required.")
+        return password
+
+    def _extension(self, params: dict, name: str) -> str:
+        extension = "." + params.get(name, "png").lower().lstrip(".")
+        if extension not in LOSSLESS_EXTENSIONS:
+            raise ValueError(f"Unsupported image format '{extension}'. "
+                             f"Use one of: {', '.join(LOSSLESS_EXTENSIONS)}.")
+        return extension
+
+    def _spool_body(self, path: str, length: int):
+        """Copies the next `length` bytes of the request body to a file without buffering it all in memory."""
+        with open(path, 'wb') as f:
+            remaining = length
+            while remaining > 0:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError("Request body ended early.")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_file(self, status: int, path: str, content_type: str, headers: dict = None):
+        # Everything that can fail happens before the status line goes out, so a failure can
+        # still be answered with a clean error response
+        all_headers = {"Content-Type": content_type, "Content-Length": str(os.path.getsize(path))}
+        all_headers.update(headers or {})
+        for key, value in all_headers.items():
+            if "\r" in value or "\n" in value:
+                raise ValueError(f"Invalid {key} header value.")
+            try:
+                value.encode('latin-1')
+            except UnicodeEncodeError:
+                raise ValueError(f"Invalid {key} header value.")
+
+        self.send_response(status)
+        for key, value in all_headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+
+    def _send_json(self, status: int, payload: dict):
+        self.send_response(status)
+        self._send_json_body(payload)
+
+    def _send_json_body(self, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class StegoServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that hands the actual work to a process pool.
+
+    At most `workers + queue_size` requests are admitted at once: `workers` of them run
+    and the rest wait in the pool's queue. Anything beyond that gets a 429 response.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = None, queue_size: int = None,
+                 max_body_bytes: int = 512 * 1024 * 1024, quiet: bool = False):
+        super().__init__((host, port), StegoRequestHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = self.workers if queue_size is None else queue_size
+        self.max_body_bytes = max_body_bytes
+        self.quiet = quiet
+        self.slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def run_job(self, fn, *args):
+        """Runs a job on the pool and waits for its result (re-raising worker exceptions)."""
+        return self.executor.submit(fn, *args).result()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local steganography HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--queue", type=int, default=None, help="Requests allowed to wait for a worker")
+    parser.add_argument("--quiet", action="store_true", help="Don't log each request")
+    args = parser.parse_args()
+
+    server = StegoServer(args.host, args.port, args.workers, args.queue, quiet=args.quiet)
+    print(f"Serving steganography API on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({server.workers} workers, queue {server.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
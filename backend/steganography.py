@@ -3,18 +3,38 @@ import numpy as np
 import json
 import zlib
 import base64
+import copy
+import hashlib
+import hmac
+import math
 import os
+import random
+import shutil
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the AES encryption class from your backend
+from backend import kernels
+from backend.cache import LRUCache
 from backend.encryption import AES
+from backend.image_io import (LOSSLESS_EXTENSIONS, MEMMAP_EXTENSIONS, OutputOptions, PngStripeWriter,
+                              flush_memmap, image_extension, is_lossless_path, is_memmapped, open_memmap,
+                              read_image, read_image_shape, read_leading_rows, storable_layout, write_image)
 
 
 class DCTSteganography:
     """
     Implements a hybrid DCT-LSB steganography method with AES encryption
     and metadata embedding (data type, filename).
+
+    This is the default embedding engine (see backend/engines.py). Images it writes carry no
+    engine field in their header, so images from before the field existed read as DCT.
     """
 
+    ENGINE_ID = 0
+    ENGINE_NAME = "dct"
+
     def __init__(self, quantization_step=16):  # MODIFIED: Reverted quantization_step to 16
         self.block_size = 8
         self.quantization_step = quantization_step
@@ -23,9 +43,42 @@ class DCTSteganography:
         self.METADATA_KEY_CONTENT = "content"
         self.METADATA_KEY_FILENAME = "filename"
         self.METADATA_KEY_FILEEXT = "file_extension"
+        self.METADATA_KEY_CONTENT_PATH = "content_path"  # Replaces 'content' for spilled payloads
         self.TEXT_TYPE = "text"
         self.FILE_TYPE = "file"
 
+        # With extract_data(..., spill_dir=...), text payloads above this many bytes are written
+        # to a file as well instead of being returned as a string
+        self.spill_text_bytes = 1024 * 1024
+
+        # Compressed payloads keyed by content hash (see enable_payload_cache); off by default
+        self.payload_cache = None
+
+        # LSB header: a 32-bit big-endian length of the encrypted payload, then (extended headers
+        # only) a key-check tag, a format marker (magic plus version byte) and, from version 2, a
+        # 16-bit length followed by type-length-value fields recording the embedding parameters.
+        # Legacy images store a plain length, always below 2**31, so the top bit of the length
+        # field marks the extended layout.
+        self.HEADER_FLAG_EXTENDED = 1 << 31
+        self.KEY_CHECK_SIZE = 4  # bytes
+        self.HEADER_MAGIC = b"STG"
+        self.FORMAT_VERSION = 2
+        self.EXTENDED_HEADER_SIZE = 4 + self.KEY_CHECK_SIZE + len(self.HEADER_MAGIC) + 1  # bytes, fixed part
+        self.MAX_HEADER_SIZE = 512  # bytes, fixed part plus fields
+        self.FIELD_QUANTIZATION_STEP = 1  # float32
+        self.FIELD_COEFFICIENTS = 2  # one byte per coefficient, row << 4 | column
+        self.FIELD_CHANNEL_ORDER = 3  # YCrCb plane index for each stream channel
+        self.FIELD_SHARD = 4  # payload id, then 16-bit shard index and count
+        self.FIELD_SEGMENTS = 5  # 32-bit segment count and CRC-32 of the segment table
+        self.SEGMENT_ENTRY_SIZE = 8  # bytes per segment table entry: 32-bit length and CRC-32
+        self.FIELD_ARCHIVE = 6  # 32-bit offset and length of the encrypted archive index
+        self.FIELD_PARTITIONS = 7  # 16-bit number of recipient partitions
+        self.FIELD_ENGINE = 8  # 8-bit engine id followed by engine-specific parameters
+        self.FIELD_ALPHA = 9  # empty; present when the alpha plane of BGRA covers carries payload
+        self.PARTITION_SALT_SIZE = 16  # bytes
+        self.PARTITION_ENTRY_SIZE = 16  # bytes per partition table entry: 8-byte tag, masked offset and length
+        self.SHARD_ID_SIZE = 8  # bytes
+
         # Define specific low-frequency AC coefficients to use for embedding/extraction
         # These are chosen to be less visually sensitive than DC component (0,0)
         # and provide good capacity. Total 8 coefficients per 8x8 block.
@@ -38,42 +91,1047 @@ class DCTSteganography:
         ]
         self.bits_per_block_per_channel = len(self.coefficients_to_use)
 
-    def _to_binary(self, data_bytes: bytes) -> str:
-        """Converts bytes data to a binary string."""
-        return ''.join(format(byte, '08b') for byte in data_bytes)
+        # YCrCb planes (0 = Y, 1 = Cr, 2 = Cb) in the order the bit stream fills them
+        self.channel_order = (0, 1, 2)
+
+        # Also embed into the alpha plane of BGRA covers, after the colour planes. Off by default:
+        # it adds a third more capacity, but changes the cover's transparency.
+        self.use_alpha = False
+
+        # Number of 8x8 blocks transformed together. Bounds the working memory on large images.
+        self.blocks_per_batch = 4096
+
+        # Orthonormal DCT-II basis, so a block transform is basis @ block @ basis.T (same as cv2.dct)
+        n = np.arange(self.block_size)
+        basis = np.cos((2 * n[None, :] + 1) * n[:, None] * np.pi / (2 * self.block_size))
+        basis *= np.sqrt(2.0 / self.block_size)
+        basis[0] /= np.sqrt(2.0)
+        self._dct_basis = basis.astype(np.float32)
+
+        # Outcome of the last embed_data(..., verify=True) call
+        self.last_verification = None
+
+        # Decoded covers and their YCrCb blocks (see enable_cover_cache); off by default
+        self.cover_cache = None
+        self.cache_cover_dct = False
+
+        # Ciphertext gathered from stego images, so password retries skip the extraction (see
+        # enable_ciphertext_cache); off by default
+        self.ciphertext_cache = None
+
+    # Caches that hold a lock (and, for ciphertext, secrets) and are left out of pickled copies
+    _CACHE_ATTRIBUTES = ("payload_cache", "cover_cache", "ciphertext_cache")
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the engine without its caches, so it can be sent to a ProcessPoolExecutor. A
+        worker process gets a fresh copy per call, so caches there would never be hit anyway.
+        """
+        state = self.__dict__.copy()
+        for name in self._CACHE_ATTRIBUTES:
+            state[name] = None
+        return state
+
+    def __copy__(self):
+        """Shallow copy that, unlike a pickled copy, keeps sharing the caches."""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def _to_bits(self, data_bytes: bytes) -> np.ndarray:
+        """Converts bytes data to an array of bits (MSB first)."""
+        return np.unpackbits(np.frombuffer(data_bytes, dtype=np.uint8))
+
+    def _to_bytes(self, bits: np.ndarray) -> bytes:
+        """Converts an array of bits back to bytes, dropping any incomplete trailing byte."""
+        return np.packbits(bits[:len(bits) - len(bits) % 8]).tobytes()
+
+    def _block_grid(self, shape) -> tuple:
+        """Number of full block rows and columns in an image. Partial blocks at the edges are never used."""
+        return shape[0] // self.block_size, shape[1] // self.block_size
+
+    def _stream_planes(self, shape) -> tuple:
+        """
+        The planes (see _to_ycrcb_blocks) the bit stream fills, in order, for an image of the
+        given shape: the single plane of a grayscale image, the YCrCb planes in channel_order
+        otherwise, followed by the alpha plane (3) of BGRA images when use_alpha is set.
+        """
+        if len(shape) == 2:
+            return (0,)
+        if shape[2] == 4 and self.use_alpha:
+            return tuple(self.channel_order) + (3,)
+        return tuple(self.channel_order)
+
+    def _colour_shape(self, shape) -> tuple:
+        """Shape of an image's colour values alone, i.e. without any alpha channel."""
+        return tuple(shape[:2]) + tuple(min(channels, 3) for channels in shape[2:])
+
+    def _capacity_bits(self, shape) -> int:
+        """Total number of DCT embedding slots (one bit each) in an image of the given shape."""
+        rows, cols = self._block_grid(shape)
+        return rows * cols * self.bits_per_block_per_channel * len(self._stream_planes(shape))
+
+    def _slot_spans(self, shape, start_bit: int, num_bits: int) -> tuple:
+        """
+        Maps a range of the DCT bit stream onto image blocks.
+
+        Bits are laid out channel by channel (the stream planes: Y, then Cr, then Cb by default),
+        blocks in raster order within a channel, and `bits_per_block_per_channel` coefficients
+        ("slots") within a block.
+
+        Returns:
+            tuple: (blocks, spans, offset) where blocks is the sorted array of distinct block indices
+                   holding part of the range, spans lists (channel, lo, hi, row) for each channel the
+                   range covers (blocks lo..hi-1, found at blocks[row:row + hi - lo]), and offset is
+                   the position of start_bit within the first block's slots.
+        """
+        rows, cols = self._block_grid(shape)
+        blocks_per_channel = rows * cols
+        per_block = self.bits_per_block_per_channel
+        first_slot = start_bit // per_block
+        last_slot = -(-(start_bit + num_bits) // per_block)
+
+        channel_ranges = []
+        for channel_idx in range(len(self._stream_planes(shape))):
+            lo = max(first_slot - channel_idx * blocks_per_channel, 0)
+            hi = min(last_slot - channel_idx * blocks_per_channel, blocks_per_channel)
+            if lo < hi:
+                channel_ranges.append((channel_idx, lo, hi))
+
+        spans = [np.arange(lo, hi) for _, lo, hi in channel_ranges]
+        blocks = np.unique(np.concatenate(spans)) if spans else np.arange(0)
+        spans = [(channel_idx, lo, hi, int(np.searchsorted(blocks, lo))) for channel_idx, lo, hi in channel_ranges]
+        return blocks, spans, start_bit - first_slot * per_block
+
+    def _slot_positions(self, shape, blocks: np.ndarray) -> np.ndarray:
+        """Bit-stream position of every slot of the given blocks, as an (n, channels, bits_per_block_per_channel) array."""
+        rows, cols = self._block_grid(shape)
+        per_block = self.bits_per_block_per_channel
+        channel_offsets = np.arange(len(self._stream_planes(shape))) * rows * cols
+        block_slots = channel_offsets[None, :] + blocks[:, None]
+        return block_slots[:, :, None] * per_block + np.arange(per_block)[None, None, :]
+
+    def _block_index(self, block_ids: np.ndarray, cols: int) -> tuple:
+        """Fancy-index arrays selecting the pixels of the given blocks as an (n, 8, 8, ...) array."""
+        offsets = np.arange(self.block_size)
+        ys = (block_ids // cols * self.block_size)[:, None, None] + offsets[None, :, None]
+        xs = (block_ids % cols * self.block_size)[:, None, None] + offsets[None, None, :]
+        return ys, xs
+
+    def _to_ycrcb_blocks(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Converts gathered blocks to embedding planes (n, 8, 8, planes): BGR (n, 8, 8, 3) to YCrCb,
+        BGRA to YCrCb plus the untouched alpha as plane 3, and grayscale (n, 8, 8) to one plane.
+        """
+        bs = self.block_size
+        if pixels.ndim == 3:
+            return pixels[..., None]
+        ycrcb = cv2.cvtColor(np.ascontiguousarray(pixels[..., :3]).reshape(-1, bs, 3),
+                             cv2.COLOR_BGR2YCrCb).reshape(pixels.shape[:3] + (3,))
+        if pixels.shape[3] == 4:
+            return np.concatenate([ycrcb, pixels[..., 3:]], axis=3)
+        return ycrcb
+
+    def _to_bgr_blocks(self, ycrcb_blocks: np.ndarray) -> np.ndarray:
+        """Converts embedding planes (see _to_ycrcb_blocks) back to gathered grayscale, BGR or BGRA blocks."""
+        bs = self.block_size
+        if ycrcb_blocks.shape[3] == 1:
+            return ycrcb_blocks[..., 0]
+        bgr = cv2.cvtColor(np.ascontiguousarray(ycrcb_blocks[..., :3]).reshape(-1, bs, 3),
+                           cv2.COLOR_YCrCb2BGR).reshape(ycrcb_blocks.shape[:3] + (3,))
+        if ycrcb_blocks.shape[3] == 4:
+            return np.concatenate([bgr, ycrcb_blocks[..., 3:]], axis=3)
+        return bgr
+
+    def _dct_blocks(self, planes: np.ndarray) -> np.ndarray:
+        """Forward 2-D DCT of a stack of blocks (n, 8, 8)."""
+        return self._dct_basis @ planes.astype(np.float32) @ self._dct_basis.T
+
+    def _idct_blocks(self, coeffs: np.ndarray) -> np.ndarray:
+        """Inverse 2-D DCT of a stack of coefficient blocks (n, 8, 8)."""
+        return self._dct_basis.T @ coeffs @ self._dct_basis
+
+    def _coefficient_index(self) -> tuple:
+        """Row and column index arrays of the coefficients used for embedding."""
+        return (np.array([coords[0] for coords in self.coefficients_to_use]),
+                np.array([coords[1] for coords in self.coefficients_to_use]))
+
+    def _quantize_to_bits(self, coeff_values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+        Quantization-based embedding: moves each coefficient to the nearest multiple of the
+        quantization step whose parity is the target bit. Targets of -1 leave the value as is.
+        """
+        return kernels.quantize_to_bits(coeff_values, targets, self.quantization_step)
+
+    def _write_slots(self, img: np.ndarray, blocks: np.ndarray, targets: np.ndarray, strength: int = 0,
+                     cover: dict = None, on_batch=None) -> None:
+        """
+        Embeds target bits into the slots of the given blocks of an image, in place.
+
+        Args:
+            img (np.ndarray): Grayscale, BGR or BGRA image (may be a memory map); only the given
+                              blocks are read and written.
+            blocks (np.ndarray): Sorted block indices.
+            targets (np.ndarray): (n, channels, bits_per_block_per_channel) bits to embed per stream
+                                  channel (see _stream_planes), -1 to keep a coefficient.
+            strength (int): 0 reproduces the original embedding (IDCT result clipped and truncated).
+                            Higher values, used to repair blocks whose bits did not survive, round
+                            instead of truncating and pull blocks towards mid-grey (from 2 on, the
+                            whole block's colour values by 10% per step) so the modified
+                            coefficients are not lost to clipping in the YCrCb or BGR domain.
+            cover (dict, optional): Cached transforms of the cover (see _load_cover). Only valid
+                                    while the given blocks of img still hold the cover's pixels.
+            on_batch (callable, optional): Called with the slice of `blocks` just written, after
+                                           each batch (see _embed_streaming).
+        """
+        cols = self._block_grid(img.shape)[1]
+        coeff_rows, coeff_cols = self._coefficient_index()
+        stream_planes = self._stream_planes(img.shape)
+        touched = (targets >= 0).any(axis=2)
+
+        for batch_start in range(0, len(blocks), self.blocks_per_batch):
+            batch = slice(batch_start, batch_start + self.blocks_per_batch)
+            ys, xs = self._block_index(blocks[batch], cols)
+            cached = cover is not None and strength <= 1
+            if cached:
+                ycrcb = cover["ycrcb"][blocks[batch]]
+            else:
+                pixels = img[ys, xs]
+                if strength > 1:
+                    contrast = max(1.0 - 0.1 * (strength - 1), 0.5)
+                    colour = pixels[..., :3] if pixels.ndim == 4 else pixels  # Alpha is left alone
+                    colour[...] = np.rint(128 + (colour.astype(np.float32) - 128) * contrast)
+                ycrcb = self._to_ycrcb_blocks(pixels)
+
+            # Loop through each stream channel (Y, Cr, Cb by default)
+            for channel_idx, plane in enumerate(stream_planes):
+                in_channel = touched[batch, channel_idx]
+                if not in_channel.any():
+                    continue
+                block_targets = targets[batch][in_channel, channel_idx]
+                planes = ycrcb[in_channel, :, :, plane].astype(np.float32)
+
+                if cached and cover["dct"] is not None:
+                    dct_blocks = cover["dct"][blocks[batch][in_channel], plane]
+                    dct_blocks[:, coeff_rows, coeff_cols] = self._quantize_to_bits(
+                        dct_blocks[:, coeff_rows, coeff_cols], block_targets)
+                    restored = self._idct_blocks(dct_blocks)
+                else:
+                    restored = kernels.embed_blocks(planes, self._dct_basis, coeff_rows, coeff_cols,
+                                                    block_targets, self.quantization_step)
+
+                if strength:
+                    clipped = ((restored < -0.5) | (restored > 255.5)).any(axis=(1, 2))
+                    if clipped.any():
+                        planes[clipped] = 128 + (planes[clipped] - 128) * 0.9
+                        restored[clipped] = kernels.embed_blocks(planes[clipped], self._dct_basis, coeff_rows,
+                                                                 coeff_cols, block_targets[clipped],
+                                                                 self.quantization_step)
+                    restored = np.rint(restored)
+
+                ycrcb[in_channel, :, :, plane] = restored.clip(0, 255).astype(np.uint8)
+
+            img[ys, xs] = self._to_bgr_blocks(ycrcb)
+            if on_batch is not None:
+                on_batch(batch)
+
+    def _read_slots(self, img: np.ndarray, blocks: np.ndarray, channel_mask: np.ndarray = None) -> np.ndarray:
+        """
+        Reads the slot bits of the given blocks of an image.
+
+        Args:
+            img (np.ndarray): Grayscale, BGR or BGRA image (may be a memory map); only the given
+                              blocks are read.
+            blocks (np.ndarray): Sorted block indices.
+            channel_mask (np.ndarray, optional): (n, channels) booleans selecting which stream
+                                                 channels to transform.
+
+        Returns:
+            np.ndarray: (n, channels, bits_per_block_per_channel) bits; unselected channels are left 0.
+        """
+        cols = self._block_grid(img.shape)[1]
+        coeff_rows, coeff_cols = self._coefficient_index()
+        stream_planes = self._stream_planes(img.shape)
+        if channel_mask is None:
+            channel_mask = np.ones((len(blocks), len(stream_planes)), dtype=bool)
+        extracted = np.zeros((len(blocks), len(stream_planes), self.bits_per_block_per_channel), dtype=np.uint8)
+
+        for batch_start in range(0, len(blocks), self.blocks_per_batch):
+            batch = slice(batch_start, batch_start + self.blocks_per_batch)
+            ys, xs = self._block_index(blocks[batch], cols)
+            ycrcb = self._to_ycrcb_blocks(img[ys, xs])
+
+            for channel_idx, plane in enumerate(stream_planes):
+                in_channel = channel_mask[batch, channel_idx]
+                if not in_channel.any():
+                    continue
+                planes = ycrcb[in_channel, :, :, plane]
+                rows_out = np.flatnonzero(in_channel) + batch_start
+                extracted[rows_out, channel_idx] = kernels.read_bits(planes, self._dct_basis, coeff_rows,
+                                                                     coeff_cols, self.quantization_step)
+
+        return extracted
+
+    def _embed_bits(self, img: np.ndarray, bits: np.ndarray, start_bit: int = 0) -> None:
+        """
+        Embeds bits into the DCT slots [start_bit, start_bit + len(bits)) of an image, in place.
+
+        Only blocks holding at least one of those slots are read, transformed and written back, so
+        the image may be a memory-mapped file. Coefficients of a touched block that fall outside the
+        range are left exactly as they were.
+        """
+        self._write_slots(img, *self._slot_targets(img.shape, bits, start_bit))
+
+    def _slot_targets(self, shape, bits: np.ndarray, start_bit: int = 0) -> tuple:
+        """
+        Lays bits destined for the DCT slots [start_bit, start_bit + len(bits)) out per block.
+
+        Returns:
+            tuple: (blocks, targets) as taken by _write_slots; slots of those blocks outside the
+                   range are -1.
+        """
+        per_block = self.bits_per_block_per_channel
+        blocks, spans, offset = self._slot_spans(shape, start_bit, len(bits))
+
+        # Target bit per slot, -1 for slots in the first/last block that are outside the range
+        stream = np.full(sum(hi - lo for _, lo, hi, _ in spans) * per_block, -1, dtype=np.int8)
+        stream[offset:offset + len(bits)] = bits
+        targets = np.full((len(blocks), len(self._stream_planes(shape)), per_block), -1, dtype=np.int8)
+        position = 0
+        for channel_idx, lo, hi, row in spans:
+            count = (hi - lo) * per_block
+            targets[row:row + hi - lo, channel_idx] = stream[position:position + count].reshape(-1, per_block)
+            position += count
+        return blocks, targets
+
+    def _extract_bits(self, img: np.ndarray, num_bits: int, start_bit: int = 0) -> np.ndarray:
+        """
+        Reads the DCT slots [start_bit, start_bit + num_bits) of an image.
+        Only the blocks (and channels) holding those slots are read and transformed.
+        """
+        blocks, spans, offset = self._slot_spans(img.shape, start_bit, num_bits)
+        channel_mask = np.zeros((len(blocks), len(self._stream_planes(img.shape))), dtype=bool)
+        for channel_idx, lo, hi, row in spans:
+            channel_mask[row:row + hi - lo, channel_idx] = True
+
+        extracted = self._read_slots(img, blocks, channel_mask)
+        stream = [extracted[row:row + hi - lo, channel_idx].reshape(-1) for channel_idx, lo, hi, row in spans]
+        stream = np.concatenate(stream) if stream else np.zeros(0, dtype=np.uint8)
+        return stream[offset:offset + num_bits]
+
+    def _verify_and_repair(self, img: np.ndarray, blocks: np.ndarray, targets: np.ndarray,
+                           header_bits: np.ndarray, max_passes: int = 4) -> dict:
+        """
+        Re-reads the given blocks of the in-memory stego array and re-embeds those holding wrong
+        bits (with increasing strength) until they all match or max_passes is hit.
+
+        Args:
+            blocks, targets: Expected slot bits per block, as taken by _write_slots. Every slot
+                             carrying live data in a block should have its target set, since a
+                             repaired block is re-embedded as a whole.
+            header_bits (np.ndarray): The LSB header, rewritten after each pass.
+
+        Returns:
+            dict: 'bit_errors_initial', 'blocks_repaired', 'repair_passes' and 'bit_errors_final'.
+        """
+        expected = targets >= 0
+        wrong = (self._read_slots(img, blocks, expected.any(axis=2)) != targets) & expected
+        report = {"bit_errors_initial": int(wrong.sum()), "blocks_repaired": 0, "repair_passes": 0}
+
+        for strength in range(1, max_passes + 1):
+            bad = np.flatnonzero(wrong.any(axis=(1, 2)))
+            if not len(bad):
+                break
+            self._write_slots(img, blocks[bad], targets[bad], strength)
+            self._write_lsb_bits(img, header_bits)  # Repaired blocks may overlap the header pixels
+
+            reread = self._read_slots(img, blocks[bad], expected[bad].any(axis=2))
+            wrong[bad] = (reread != targets[bad]) & expected[bad]
+            report["blocks_repaired"] += len(bad)
+            report["repair_passes"] = strength
+
+        report["bit_errors_final"] = int(wrong.sum())
+        return report
+
+    def _lsb_positions(self, img: np.ndarray, count: int, offset: int = 0) -> tuple:
+        """
+        Index arrays for the colour values [offset, offset + count) in row-major (flattened) order.
+        Alpha values are skipped, so the header never touches an image's transparency.
+        """
+        return np.unravel_index(np.arange(offset, offset + count), self._colour_shape(img.shape))
+
+    def _write_lsb_bits(self, img: np.ndarray, bits: np.ndarray, offset: int = 0) -> None:
+        """Writes bits into the LSBs of consecutive pixel values, starting at a flat offset."""
+        positions = self._lsb_positions(img, len(bits), offset)
+        img[positions] = (img[positions] & 0xFE) | bits
+
+    def _read_lsb_bits(self, img: np.ndarray, count: int, offset: int = 0) -> np.ndarray:
+        """Reads the LSBs of consecutive pixel values, starting at a flat offset."""
+        return img[self._lsb_positions(img, count, offset)] & 1
+
+    def _load_image(self, image_path: str):
+        """
+        Opens an image for reading. Uncompressed formats are memory-mapped so that only the
+        blocks that are actually used get paged in; everything else is decoded by OpenCV.
+        """
+        img = None
+        if image_extension(image_path) in MEMMAP_EXTENSIONS:
+            img = open_memmap(image_path, 'r')
+        if img is None:
+            img = read_image(image_path)
+        return img
+
+    def capacity(self, image_path: str) -> int:
+        """
+        Returns how many bytes of (compressed and encrypted) payload an image can carry.
+
+        Only the image's dimensions are needed, so PNG, BMP, PPM and .npy covers are not decoded
+        (see read_image_shape); that makes it cheap enough to call while the user is typing.
+
+        Args:
+            image_path (str): Path to the cover image.
+
+        Returns:
+            int: Payload capacity in bytes.
+
+        Raises:
+            ValueError: If the image can't be read.
+        """
+        shape = read_image_shape(image_path)
+        if shape is None:
+            raise ValueError(f"Image not found or unsupported format: {image_path}")
+        return self._capacity_bits(shape) // 8
+
+    def probe(self, image_path: str):
+        """
+        Checks whether an image carries a payload in this format without extracting it.
+
+        Only the first pixel row(s) holding the LSB header are decoded (see read_leading_rows),
+        so large folders can be triaged quickly.
+
+        Args:
+            image_path (str): Path to the image.
+
+        Returns:
+            dict or None: 'version', 'payload_length' (encrypted bytes), 'width', 'height',
+                          'capacity' (bytes) and the embedding parameters ('quantization_step',
+                          'coefficients_to_use', 'channel_order'; version 1 images don't record
+                          them, so this instance's are given), 'shard', 'segments', 'archive',
+                          'partitions' (see _read_header) and the 'engine' name when a format
+                          marker is found. Images
+                          written before the marker was introduced also give None, as their bare
+                          length header can't be told apart from ordinary pixels.
 
-    def _to_bytes(self, binary_string: str) -> bytes:
-        """Converts a binary string back to bytes."""
-        bytes_list = [binary_string[i:i + 8] for i in range(0, len(binary_string), 8)]
-        return bytes(int(b, 2) for b in bytes_list if len(b) == 8)
+        Raises:
+            ValueError: If the image can't be read.
+        """
+        if not is_lossless_path(image_path):
+            return None  # Lossy formats can't carry a payload
+        rows, shape = read_leading_rows(image_path, 1)
+        if rows is None:
+            raise ValueError(f"Image not found or unsupported format: {image_path}")
+        rows_needed = -(-self.MAX_HEADER_SIZE * 8 // int(np.prod(self._colour_shape(shape)[1:])))
+        if rows_needed > len(rows):
+            rows, shape = read_leading_rows(image_path, rows_needed)
+
+        try:
+            header = self._read_header(rows)
+        except ValueError:
+            return None
+        configured = self._configured_for(header)
+        capacity = configured._capacity_bits(shape) // 8
+        if header["version"] is None or header["length"] > capacity:
+            return None
+        return {
+            "version": header["version"],
+            "payload_length": header["length"],
+            "width": shape[1],
+            "height": shape[0],
+            "capacity": capacity,
+            "quantization_step": configured.quantization_step,
+            "coefficients_to_use": list(configured.coefficients_to_use),
+            "channel_order": tuple(configured.channel_order),
+            "shard": header["shard"],
+            "segments": header["segments"],
+            "archive": header["archive"],
+            "partitions": header["partitions"],
+            "engine": configured.ENGINE_NAME,
+        }
 
     def embed_data(self, image_path: str, secret_data, password: str, is_text: bool,
-                   original_filename: str = None, output_path: str = None) -> str:
+                   original_filename: str = None, output_path: str = None,
+                   output_options: OutputOptions = None, verify: bool = False,
+                   segment_size: int = None) -> str:
         """
         Embeds encrypted and compressed data (text or file) into an image using DCT-LSB.
 
         Args:
-            image_path (str): Path to the cover image (must be PNG).
+            image_path (str): Path to the cover image (PNG, TIFF, BMP or lossless WebP).
             secret_data (Union[str, bytes]): The secret text (str) or file content (bytes) to embed.
             password (str): The password for AES encryption.
             is_text (bool): True if secret_data is text, False if it's binary file content.
             original_filename (str, optional): Original filename if embedding a file.
             output_path (str, optional): Path where the generated stego image will be saved.
+                                         Its extension selects the (lossless) output format.
+            output_options (OutputOptions, optional): Encoder settings for the output image,
+                                                      e.g. OutputOptions.fast() or OutputOptions.small().
+            verify (bool): Re-extract the payload from the in-memory stego image before saving and
+                           re-embed any blocks whose bits did not survive the pixel round trip.
+                           The outcome is stored in `last_verification`.
+            segment_size (int, optional): Split the serialized payload into segments of this many
+                                          bytes, each compressed, encrypted (with its own IV) and
+                                          checksummed separately, so extraction can decrypt them
+                                          in parallel and pinpoint a corrupt one. Default: one blob.
 
         Returns:
             str: Path to the generated stego image.
 
         Raises:
-            ValueError: If image not found, format unsupported, data too large, or if not a PNG.
+            ValueError: If image not found, format unsupported, data too large, or not a lossless format.
         """
-        if not image_path.lower().endswith('.png'):
-            raise ValueError("Only PNG images are supported for embedding to prevent data loss from compression.")
+        self._check_embed_paths(image_path, output_path)
 
-        img = cv2.imread(image_path)
-        if img is None:
-            raise ValueError(f"Image not found or unsupported format: {image_path}")
+        # The payload is prepared on a worker thread while the cover loads; zlib, AES and the
+        # image decoder all release the GIL
+        with ThreadPoolExecutor(1) as pool:
+            sealing = pool.submit(self._seal_payload, secret_data, password, is_text, original_filename, segment_size)
+            img, cover = self._load_cover(image_path, output_path)
+            encrypted_data_to_embed, segments = sealing.result()
+
+        header = self._fitted_header(img.shape, encrypted_data_to_embed, password, segments)
+        stego_img, in_place = self._create_stego_canvas(img, image_path, output_path)
+        return self._embed_and_save(stego_img, in_place, encrypted_data_to_embed, header, output_path,
+                                    output_options, verify, cover)
+
+    def _seal_payload(self, secret_data, password: str, is_text: bool, original_filename: str = None,
+                      segment_size: int = None) -> tuple:
+        """
+        Serializes, compresses and encrypts a secret (as one blob, or in segments).
 
+        Returns:
+            tuple: (encrypted stream, segments) where segments is the header's (count, table CRC)
+                   pair, or None for a single blob.
+        """
         # --- PREPARATION: Metadata, Serialization, Compression, Encryption ---
+        if segment_size:
+            return self._encrypt_segments(
+                self._serialize_payload(secret_data, is_text, original_filename), password, segment_size)
+        compressed_payload_bytes = self._prepare_payload(secret_data, is_text, original_filename)
+        return self._encrypt_payload(compressed_payload_bytes, password), None
+        # --- END PREPARATION ---
+
+    def embed(self, image_path: str, secret_data, password: str, is_text: bool, **options) -> str:
+        """Engine interface name for embed_data (same arguments, result and errors)."""
+        return self.embed_data(image_path, secret_data, password, is_text, **options)
+
+    def extract(self, image_path: str, password: str) -> dict:
+        """Engine interface name for extract_data (same arguments, result and errors)."""
+        return self.extract_data(image_path, password)
+
+    def embed_sharded(self, image_paths: list, secret_data, password: str, is_text: bool,
+                      original_filename: str = None, output_paths: list = None,
+                      output_options: OutputOptions = None, verify: bool = False, max_workers: int = None) -> list:
+        """
+        Embeds a payload too large for one cover by splitting it across an ordered set of covers.
+
+        The payload is compressed and encrypted once, then cut into one shard per cover, sized in
+        proportion to each cover's capacity. Every shard image gets its own header carrying the
+        shard index, the shard count and a random payload id shared by the set. The covers are
+        loaded, embedded and written concurrently.
+
+        Args:
+            image_paths (list): Paths to the cover images, in shard order.
+            secret_data, password, is_text, original_filename, output_options, verify:
+                As for embed_data.
+            output_paths (list): One output path per cover.
+            max_workers (int, optional): Threads used for the covers. Defaults to one per cover,
+                                         capped by ThreadPoolExecutor's default.
+
+        Returns:
+            list: Paths to the generated stego images, in shard order.
+
+        Raises:
+            ValueError: If the paths are invalid or the payload exceeds the covers' combined capacity.
+        """
+        if not image_paths:
+            raise ValueError("At least one cover image is required.")
+        if output_paths is None or len(output_paths) != len(image_paths):
+            raise ValueError("One output path must be provided for each cover image.")
+        if len(image_paths) > 0xFFFF:
+            raise ValueError("Too many cover images for one payload.")
+        for image_path, output_path in zip(image_paths, output_paths):
+            self._check_embed_paths(image_path, output_path)
+
+        with ThreadPoolExecutor(max_workers or min(len(image_paths), 32)) as pool:
+            covers = pool.map(self._open_cover, image_paths, output_paths)
+            compressed_payload_bytes = self._prepare_payload(secret_data, is_text, original_filename)
+            encrypted_data_to_embed = self._encrypt_payload(compressed_payload_bytes, password)
+            covers = list(covers)
+
+            shards = self._split_shards(encrypted_data_to_embed, [img.shape for img in covers])
+            payload_id = os.urandom(self.SHARD_ID_SIZE)
+            jobs = [
+                pool.submit(self._embed_shard, img, image_path, output_path, shard,
+                            self._build_header(shard, password, (payload_id, index, len(shards))),
+                            output_options, verify)
+                for index, (img, image_path, output_path, shard)
+                in enumerate(zip(covers, image_paths, output_paths, shards))
+            ]
+            results = [job.result() for job in jobs]
+
+        if verify:
+            reports = [report for _, report in results]
+            self.last_verification = {key: sum(report[key] for report in reports) for key in reports[0]}
+            self.last_verification["repair_passes"] = max(report["repair_passes"] for report in reports)
+        return [path for path, _ in results]
+
+    def embed_multi_recipient(self, image_path: str, recipients: list, output_path: str = None,
+                              output_options: OutputOptions = None, verify: bool = False) -> str:
+        """
+        Embeds a separate payload for each of several recipients into one image.
+
+        Each payload is encrypted under its recipient's password and placed in its own block
+        range. A partition table at the start of the payload lists every range behind a tag and
+        offset mask derived from that recipient's key, so it reveals nothing to anyone without
+        one of the passwords. extract_data then finds and transforms only the caller's partition.
+
+        Args:
+            image_path (str): Path to the cover image.
+            recipients (list): One (password, secret_data, is_text) or
+                               (password, secret_data, is_text, original_filename) tuple per recipient.
+            output_path, output_options, verify: As for embed_data.
+
+        Returns:
+            str: Path to the generated stego image.
+
+        Raises:
+            ValueError: If there are no recipients, passwords repeat, or the payloads don't fit.
+        """
+        self._check_embed_paths(image_path, output_path)
+        if not recipients or len(recipients) > 0xFFFF:
+            raise ValueError("Between 1 and 65535 recipients are required.")
+        if len({recipient[0] for recipient in recipients}) != len(recipients):
+            raise ValueError("Each recipient needs a different password.")
+        img, cover = self._load_cover(image_path, output_path)
+
+        partitions = []
+        for password, secret_data, is_text, *original_filename in recipients:
+            compressed_payload_bytes = self._prepare_payload(secret_data, is_text, *original_filename)
+            partitions.append((password, self._encrypt_payload(compressed_payload_bytes, password)))
+        stream = self._build_partitions(partitions)
+
+        # Every recipient is checked against the partition table, so the header's tag is filler
+        header = self._pack_header(len(stream), os.urandom(self.KEY_CHECK_SIZE),
+                                   self._encode_header_fields(partitions=len(partitions)))
+        self._check_capacity(img.shape, stream, len(header))
+        stego_img, in_place = self._create_stego_canvas(img, image_path, output_path)
+        return self._embed_and_save(stego_img, in_place, stream, header, output_path, output_options, verify, cover)
+
+    def _partition_keys(self, key_bytes: bytes, salt: bytes) -> tuple:
+        """The (tag, offset mask) pair a key gives for a partition table with this salt."""
+        digest = hmac.new(key_bytes, b"stego-partition" + salt, hashlib.sha256).digest()
+        return digest[:8], digest[8:16]
+
+    def _build_partitions(self, partitions: list) -> bytes:
+        """
+        Lays out a multi-recipient payload: a random salt, the key-blinded partition table (in
+        random order), then each (password, encrypted payload) partition. Partitions start on
+        slot boundaries so no two recipients share a block within a channel.
+        """
+        alignment = self.bits_per_block_per_channel // math.gcd(8, self.bits_per_block_per_channel)  # bytes
+
+        def aligned(size):
+            return -(-size // alignment) * alignment
+
+        salt = os.urandom(self.PARTITION_SALT_SIZE)
+        offset = aligned(self.PARTITION_SALT_SIZE + self.PARTITION_ENTRY_SIZE * len(partitions))
+        entries, blobs = [], []
+        for password, encrypted_data in partitions:
+            tag, mask = self._partition_keys(self._derive_key_from_password(password), salt)
+            location = struct.pack('>II', offset, len(encrypted_data))
+            entries.append(tag + bytes(a ^ b for a, b in zip(location, mask)))
+            blobs.append(encrypted_data.ljust(aligned(len(encrypted_data)), b'\0'))
+            offset += len(blobs[-1])
+        random.SystemRandom().shuffle(entries)
+
+        table = salt + b''.join(entries)
+        return table.ljust(aligned(len(table)), b'\0') + b''.join(blobs)
+
+    def _split_shards(self, encrypted_data: bytes, shapes: list) -> list:
+        """Cuts the encrypted payload into consecutive shards proportional to each cover's capacity."""
+        capacities = [self._capacity_bits(shape) // 8 for shape in shapes]
+        total_capacity = sum(capacities)
+        if len(encrypted_data) > total_capacity:
+            raise ValueError(
+                f"Encrypted data too large for the combined capacity of {len(shapes)} images. "
+                f"Required bytes: {len(encrypted_data)}, Available bytes: {total_capacity}. "
+                f"Consider adding cover images or using larger ones."
+            )
+
+        sizes = [len(encrypted_data) * capacity // total_capacity for capacity in capacities]
+        for index in range(len(sizes)):  # Hand the rounding remainder to covers with room left
+            extra = min(len(encrypted_data) - sum(sizes), capacities[index] - sizes[index])
+            sizes[index] += extra
+        offsets = np.cumsum([0] + sizes)
+        return [encrypted_data[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def _embed_shard(self, img, image_path: str, output_path: str, shard: bytes, header: bytes,
+                     output_options: OutputOptions = None, verify: bool = False) -> tuple:
+        """Embeds one shard into its cover and saves it. Returns (output path, verification report)."""
+        self._check_capacity(img.shape, shard, len(header))
+        stego_img, in_place = self._create_stego_canvas(img, image_path, output_path)
+        report = self._embed_payload(stego_img, shard, header, verify)
+        return self._save_stego(stego_img, in_place, output_path, output_options), report
+
+    def extract_sharded(self, image_paths: list, password: str, max_workers: int = None) -> dict:
+        """
+        Reassembles and decrypts a payload split across several images by embed_sharded.
+
+        The images may be given in any order. All headers are read first to check that the set is
+        complete and belongs to a single payload, then every shard is checked against the password
+        and extracted concurrently.
+
+        Args:
+            image_paths (list): Paths to all shard images of one payload.
+            password (str): The password for AES decryption.
+            max_workers (int, optional): Threads used for the images.
+
+        Returns:
+            dict: Same as extract_data.
+
+        Raises:
+            ValueError: If a shard is missing, duplicated or from another payload, the password is
+                        wrong, or extraction/decryption fails.
+        """
+        if not image_paths:
+            raise ValueError("At least one stego image is required.")
+
+        with ThreadPoolExecutor(max_workers or min(len(image_paths), 32)) as pool:
+            images = list(pool.map(self._open_stego, image_paths))
+            headers = list(pool.map(self._read_header, images))
+            order = self._order_shards(image_paths, headers)
+
+            def read_shard(position):
+                reader = self._configured_for(headers[position])
+                reader._check_key(images[position], headers[position], password)
+                return reader._read_payload(images[position], headers[position])
+
+            shards = list(pool.map(read_shard, order))
+        return self._decrypt_payload(b''.join(shards), password)
+
+    def _order_shards(self, image_paths: list, headers: list) -> list:
+        """Validates that the headers form one complete shard set and returns the positions in shard order."""
+        for image_path, header in zip(image_paths, headers):
+            if header["shard"] is None:
+                raise ValueError(f"Image is not part of a split payload: {image_path}")
+
+        first = headers[0]["shard"]
+        by_index = {}
+        for position, (image_path, header) in enumerate(zip(image_paths, headers)):
+            shard = header["shard"]
+            if shard["payload_id"] != first["payload_id"] or shard["count"] != first["count"]:
+                raise ValueError(f"Image belongs to a different split payload: {image_path}")
+            if shard["index"] in by_index:
+                raise ValueError(f"Shard {shard['index'] + 1} of {shard['count']} was given more than once.")
+            by_index[shard["index"]] = position
+
+        missing = [index + 1 for index in range(first["count"]) if index not in by_index]
+        if missing:
+            raise ValueError(f"Incomplete split payload: missing shard(s) {', '.join(map(str, missing))} "
+                             f"of {first['count']}.")
+        return [by_index[index] for index in range(first["count"])]
+
+    def embed_archive(self, image_path: str, files, password: str, output_path: str = None,
+                      output_options: OutputOptions = None, verify: bool = False) -> str:
+        """
+        Embeds several files as an archive whose entries can be extracted one at a time.
+
+        Each file is compressed (unless that doesn't make it smaller) and encrypted on its own.
+        An encrypted index of the entries (name, offset, size, codec, checksum) comes first in
+        the payload, so reading one entry only transforms the blocks of the index and that entry.
+
+        Args:
+            image_path (str): Path to the cover image.
+            files (Union[str, list]): A directory (embedded recursively, with names relative to it)
+                                      or a list of file paths (named by their base names).
+            password (str): The password for AES encryption.
+            output_path, output_options, verify: As for embed_data.
+
+        Returns:
+            str: Path to the generated stego image.
+
+        Raises:
+            ValueError: If the paths are invalid, there are no files or duplicate names, or the
+                        archive does not fit.
+        """
+        self._check_embed_paths(image_path, output_path)
+        entries = [(name, self._read_file(path)) for name, path in self._collect_archive_files(files)]
+        img, cover = self._load_cover(image_path, output_path)
+
+        stream, archive = self._build_archive(entries, password)
+        header = self._build_header(stream, password, archive=archive)
+        self._check_capacity(img.shape, stream, len(header))
+        stego_img, in_place = self._create_stego_canvas(img, image_path, output_path)
+        return self._embed_and_save(stego_img, in_place, stream, header, output_path, output_options, verify, cover)
+
+    def update_archive(self, image_path: str, password: str, files, output_path: str = None,
+                       output_options: OutputOptions = None, verify: bool = False) -> str:
+        """
+        Adds files to, or replaces entries of, the archive in an existing stego image.
+
+        The new entries and a new index are appended after the current end of the payload and the
+        header is pointed at the new index. Nothing already embedded moves, so only the blocks
+        holding the appended bytes (and the header pixels) are rewritten and the cost follows the
+        size of the change. Replaced entries and old indexes stay behind as dead space until the
+        archive is embedded afresh with embed_archive.
+
+        Args:
+            image_path (str): Path to a stego image made by embed_archive.
+            password (str): The archive's password.
+            files (Union[str, list]): Files to add, as for embed_archive. An entry whose name
+                                      already exists is replaced.
+            output_path (str, optional): Where to save the updated image. Defaults to image_path;
+                                         for BMP/PPM/.npy images that updates the file in place.
+            output_options, verify: As for embed_data.
+
+        Returns:
+            str: Path to the updated stego image.
+
+        Raises:
+            ValueError: If the image holds no archive, the password is wrong, or the update
+                        does not fit in the remaining capacity.
+        """
+        output_path = output_path or image_path
+        self._check_embed_paths(image_path, output_path)
+        entries = [(name, self._read_file(path)) for name, path in self._collect_archive_files(files)]
+        reader, img, header, index = self._open_archive(image_path, password)
+        if storable_layout(img, output_path) is not img:
+            raise ValueError(f"A {image_extension(output_path)} file can't hold this image's channels unchanged; "
+                             f"save the updated archive in the image's own format.")
+        key_bytes = self._derive_key_from_password(password)
+
+        start = header["length"]
+        sealed = [reader._seal_archive_entry(data, key_bytes) for _, data in entries]
+        names = {name for name, _ in entries}
+        index = [entry for entry in index if entry["name"] not in names] + reader._archive_index(entries, sealed, start)
+        sealed_index = reader._seal_archive_index(index, key_bytes)
+        appended = b''.join(blob for blob, _ in sealed) + sealed_index
+
+        length = start + len(appended)
+        if length * 8 > reader._capacity_bits(img.shape):
+            raise ValueError(
+                f"Archive update too large for the remaining image capacity. "
+                f"Required bytes: {length}, Available bytes: {reader._capacity_bits(img.shape) // 8}."
+            )
+
+        # The start of the stream is unchanged, so the key-check tag carries over
+        archive = (length - len(sealed_index), len(sealed_index))
+        new_header = reader._pack_header(length, header["key_check"], reader._encode_header_fields(archive=archive))
+        stego_img, in_place = reader._create_stego_canvas(img, image_path, output_path)
+        report = reader._append_stream(stego_img, appended, start, new_header, verify)
+        if report is not None:
+            self.last_verification = report
+        return reader._save_stego(stego_img, in_place, output_path, output_options)
+
+    def _collect_archive_files(self, files) -> list:
+        """Resolves a directory or list of paths to (entry name, path) pairs."""
+        if isinstance(files, str):
+            if not os.path.isdir(files):
+                raise ValueError(f"Archive source is not a directory: {files}")
+            pairs = []
+            for root, dirs, names in os.walk(files):
+                dirs.sort()
+                for name in sorted(names):
+                    path = os.path.join(root, name)
+                    pairs.append((os.path.relpath(path, files).replace(os.sep, '/'), path))
+        else:
+            pairs = [(os.path.basename(path), path) for path in files]
+
+        if not pairs:
+            raise ValueError("No files to embed in the archive.")
+        names = [name for name, _ in pairs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate archive entry names: {', '.join(duplicates)}")
+        for _, path in pairs:
+            if not os.path.isfile(path):
+                raise ValueError(f"File not found: {path}")
+        return pairs
+
+    def _read_file(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _seal_archive_entry(self, data: bytes, key_bytes: bytes) -> tuple:
+        """Compresses (when it helps) and encrypts one entry. Returns (encrypted bytes, codec)."""
+        compressed = zlib.compress(data, level=9)
+        if len(compressed) < len(data):
+            return AES.encrypt(compressed, key_bytes), "zlib"
+        return AES.encrypt(data, key_bytes), "store"
+
+    def _seal_archive_index(self, index: list, key_bytes: bytes) -> bytes:
+        """Serializes, compresses and encrypts an archive index."""
+        return AES.encrypt(zlib.compress(json.dumps(index).encode('utf-8'), level=9), key_bytes)
+
+    def _build_archive(self, entries: list, password: str) -> tuple:
+        """
+        Lays out an archive payload: the encrypted index followed by each encrypted entry.
+
+        Args:
+            entries (list): (name, data bytes) pairs.
+
+        Returns:
+            tuple: (stream, archive) where archive is the (index offset, index length) pair
+                   recorded in the header.
+        """
+        key_bytes = self._derive_key_from_password(password)
+        sealed = [self._seal_archive_entry(data, key_bytes) for _, data in entries]
+
+        # Entry offsets depend on the index size, which depends on the offsets: grow the space
+        # reserved for the index until the index encrypted with those offsets fits in it.
+        reserved = 0
+        while True:
+            index = self._archive_index(entries, sealed, reserved)
+            sealed_index = self._seal_archive_index(index, key_bytes)
+            if len(sealed_index) <= reserved:
+                break
+            reserved = len(sealed_index)
+
+        stream = sealed_index.ljust(reserved, b'\0') + b''.join(blob for blob, _ in sealed)
+        return stream, (0, len(sealed_index))
+
+    def _archive_index(self, entries: list, sealed: list, offset: int) -> list:
+        """Index records for (name, data) entries whose sealed blobs are stored back to back from offset."""
+        index = []
+        for (name, data), (blob, codec) in zip(entries, sealed):
+            index.append({"name": name, "offset": offset, "length": len(blob), "size": len(data),
+                          "codec": codec, "crc": zlib.crc32(data)})
+            offset += len(blob)
+        return index
+
+    def _check_embed_paths(self, image_path: str, output_path: str) -> None:
+        """Validates the cover and output paths before any work is done."""
+        if not is_lossless_path(image_path):
+            raise ValueError(f"Only lossless images ({', '.join(LOSSLESS_EXTENSIONS)}) are supported for "
+                             f"embedding to prevent data loss from compression.")
+        if output_path is None:
+            raise ValueError("Output path must be provided to save the stego image.")
+        if not is_lossless_path(output_path):
+            raise ValueError(f"Stego image must be saved in a lossless format ({', '.join(LOSSLESS_EXTENSIONS)}).")
+
+    def _open_cover(self, image_path: str, output_path: str = None):
+        """Loads (or maps) the cover image, raising if it can't be read."""
+        return self._load_cover(image_path, output_path)[0]
+
+    def enable_cover_cache(self, max_bytes: int = 256 * 1024 * 1024, max_entries: int = 4,
+                           include_dct: bool = False) -> LRUCache:
+        """
+        Keeps recently used covers decoded, so repeated embeds into the same cover skip the
+        image decode and the YCrCb conversion (and, with include_dct, the forward DCTs).
+
+        Covers are keyed by path, modification time and size, so an edited file is decoded
+        afresh. Memory-mapped formats (BMP, PPM, .npy) are never cached; they are only paged
+        in where the payload goes. Cached DCTs take 12 bytes per pixel on top of the 6 bytes
+        for the pixels and YCrCb blocks.
+
+        Args:
+            max_bytes (int): Memory budget for all cached covers.
+            max_entries (int): Maximum number of covers kept.
+            include_dct (bool): Also cache the forward DCT of every block.
+
+        Returns:
+            LRUCache: The cache, whose stats() report hits, misses and memory use.
+        """
+        self.cover_cache = LRUCache(max_entries, max_bytes,
+                                    sizeof=lambda cover: sum(a.nbytes for a in cover.values() if a is not None))
+        self.cache_cover_dct = include_dct
+        return self.cover_cache
+
+    def _load_cover(self, image_path: str, output_path: str = None) -> tuple:
+        """
+        Loads the cover image, through the cover cache when it is enabled.
+
+        Grayscale and BGRA covers keep their layout, unless output_path names a format that
+        can't store it (see storable_layout); the cover is then converted and not cached.
+
+        Returns:
+            tuple: (img, cover) where cover is the cached entry (a dict with the read-only
+                   'bgr' image, its 'ycrcb' blocks and, optionally, their 'dct'), or None.
+        """
+        if self.cover_cache is None or image_extension(image_path) in MEMMAP_EXTENSIONS:
+            img = self._load_image(image_path)
+            if img is None:
+                raise ValueError(f"Image not found or unsupported format: {image_path}")
+            return (storable_layout(img, output_path) if output_path else img), None
+
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            raise ValueError(f"Image not found or unsupported format: {image_path}")
+        cache_key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, self.cache_cover_dct)
+        cover = self.cover_cache.get(cache_key)
+        if cover is None:
+            img = self._load_image(image_path)
+            if img is None:
+                raise ValueError(f"Image not found or unsupported format: {image_path}")
+            cover = self._transform_cover(img)
+            self.cover_cache.put(cache_key, cover)
+        img = storable_layout(cover["bgr"], output_path) if output_path else cover["bgr"]
+        return img, (cover if img is cover["bgr"] else None)
+
+    def _transform_cover(self, img: np.ndarray) -> dict:
+        """Converts every full block of a cover to YCrCb (and optionally the DCT domain) for caching."""
+        rows, cols = self._block_grid(img.shape)
+        ycrcb = self._to_ycrcb_blocks(img[self._block_index(np.arange(rows * cols), cols)])
+        dct = None
+        if self.cache_cover_dct:
+            dct = np.empty((rows * cols, ycrcb.shape[3], self.block_size, self.block_size), dtype=np.float32)
+            for batch_start in range(0, rows * cols, self.blocks_per_batch):
+                batch = slice(batch_start, batch_start + self.blocks_per_batch)
+                for plane in range(ycrcb.shape[3]):
+                    dct[batch, plane] = self._dct_blocks(ycrcb[batch, :, :, plane])
+        img.setflags(write=False)  # Shared between calls; embedding always works on a copy
+        return {"bgr": img, "ycrcb": ycrcb, "dct": dct}
+
+    def enable_payload_cache(self, max_entries: int = 8, max_bytes: int = 64 * 1024 * 1024) -> LRUCache:
+        """
+        Keeps recently compressed payloads, keyed by a hash of the content, type, filename and
+        codec, so sending one secret to many covers only compresses it once. Each embed still
+        encrypts it afresh with a new IV. The cache holds the secrets in plain (compressed)
+        form; call forget_payloads() once they are no longer needed.
+
+        Returns:
+            LRUCache: The cache, whose stats() report hits, misses and memory use.
+        """
+        self.payload_cache = LRUCache(max_entries, max_bytes)
+        return self.payload_cache
+
+    def forget_payloads(self) -> None:
+        """Drops all cached compressed payloads."""
+        if self.payload_cache is not None:
+            self.payload_cache.clear()
+
+    def _prepare_payload(self, secret_data, is_text: bool, original_filename: str = None) -> bytes:
+        """
+        Wraps the secret and its metadata in JSON and compresses it, through the payload cache
+        when it is enabled.
+        """
+        cache_key = None
+        if self.payload_cache is not None:
+            data_bytes = secret_data.encode('utf-8') if is_text else secret_data
+            cache_key = (hashlib.sha256(data_bytes).digest(), bool(is_text),
+                         None if is_text else original_filename, "zlib-9")
+            compressed = self.payload_cache.get(cache_key)
+            if compressed is not None:
+                return compressed
+        # 3. Compress the JSON payload
+        compressed = zlib.compress(self._serialize_payload(secret_data, is_text, original_filename), level=9)
+        if cache_key is not None:
+            self.payload_cache.put(cache_key, compressed)
+        return compressed
+
+    def _serialize_payload(self, secret_data, is_text: bool, original_filename: str = None) -> bytes:
+        """Wraps the secret and its metadata in a JSON document."""
         # 1. Prepare metadata payload
         metadata_payload = {
             self.METADATA_KEY_TYPE: self.TEXT_TYPE if is_text else self.FILE_TYPE,
@@ -92,183 +1150,592 @@ class DCTSteganography:
 
         # 2. Serialize metadata payload to JSON string
         json_payload_str = json.dumps(metadata_payload)
-        json_payload_bytes = json_payload_str.encode('utf-8')
+        return json_payload_str.encode('utf-8')
 
-        # 3. Compress the JSON payload
-        compressed_payload_bytes = zlib.compress(json_payload_bytes, level=9)
+    def _encrypt_payload(self, compressed_payload_bytes: bytes, password: str) -> bytes:
+        """4. Encrypts the compressed payload using AES."""
+        key_bytes = self._derive_key_from_password(password)
+        return AES.encrypt(compressed_payload_bytes, key_bytes)
+
+    def _encrypt_segments(self, json_payload_bytes: bytes, password: str, segment_size: int,
+                          max_workers: int = None) -> tuple:
+        """
+        Splits a serialized payload into segments, then compresses and encrypts each one on a
+        thread pool (AES.encrypt draws a fresh IV per segment).
+
+        Returns:
+            tuple: (stream, segments) where stream is the segment table (a length and CRC-32 of
+                   each encrypted segment) followed by the segments, and segments is the
+                   (count, table CRC-32) pair recorded in the header.
+        """
+        if segment_size < 1:
+            raise ValueError(f"Segment size must be positive, got {segment_size}.")
+        pieces = [json_payload_bytes[start:start + segment_size]
+                  for start in range(0, len(json_payload_bytes), segment_size)]
+        key_bytes = self._derive_key_from_password(password)
+
+        def seal(piece):
+            return AES.encrypt(zlib.compress(piece, level=9), key_bytes)
 
-        # 4. Encrypt the compressed payload using AES
+        with ThreadPoolExecutor(max_workers) as pool:
+            sealed = list(pool.map(seal, pieces))
+        table = b''.join(struct.pack('>II', len(segment), zlib.crc32(segment)) for segment in sealed)
+        return table + b''.join(sealed), (len(sealed), zlib.crc32(table))
+
+    def _key_check_tag(self, key_bytes: bytes, iv: bytes) -> bytes:
+        """Short HMAC of the payload's IV under the key, so a wrong password is caught without decrypting."""
+        return hmac.new(key_bytes, b"stego-key-check" + iv, hashlib.sha256).digest()[:self.KEY_CHECK_SIZE]
+
+    def _build_header(self, encrypted_data: bytes, password: str, shard: tuple = None,
+                      segments: tuple = None, archive: tuple = None) -> bytes:
+        """
+        Builds the extended LSB header: flagged payload length, key-check tag, format marker and
+        the fields describing how the payload was embedded. shard is (payload_id, index, count)
+        for images holding part of a payload split across several covers; segments is the
+        (count, table CRC-32) pair of a segmented payload (see _encrypt_segments); archive is the
+        (offset, length) of the index of a multi-file archive (see _build_archive).
+        """
         key_bytes = self._derive_key_from_password(password)
-        encrypted_data_to_embed = AES.encrypt(compressed_payload_bytes, key_bytes)
+        return self._pack_header(len(encrypted_data), self._key_check_tag(key_bytes, encrypted_data[:16]),
+                                 self._encode_header_fields(shard, segments, archive))
 
-        data_to_embed_len = len(encrypted_data_to_embed)
-        data_to_embed_bits = self._to_binary(encrypted_data_to_embed)
-        # --- END PREPARATION ---
+    def _pack_header(self, length: int, key_check: bytes, fields: bytes) -> bytes:
+        """Assembles an extended LSB header from the payload length, key-check tag and encoded fields."""
+        length_field = length | self.HEADER_FLAG_EXTENDED
+        return (length_field.to_bytes(4, 'big') + key_check + self.HEADER_MAGIC + bytes([self.FORMAT_VERSION])
+                + len(fields).to_bytes(2, 'big') + fields)
+
+    def _encode_header_fields(self, shard: tuple = None, segments: tuple = None, archive: tuple = None,
+                              partitions: int = None) -> bytes:
+        """
+        Serializes this instance's embedding parameters (and any shard, segment, archive or
+        partition info) as type-length-value header fields.
+        """
+        fields = self._engine_fields()
+        if shard is not None:
+            payload_id, index, count = shard
+            fields[self.FIELD_SHARD] = payload_id + struct.pack('>HH', index, count)
+        if segments is not None:
+            fields[self.FIELD_SEGMENTS] = struct.pack('>II', *segments)
+        if archive is not None:
+            fields[self.FIELD_ARCHIVE] = struct.pack('>II', *archive)
+        if partitions is not None:
+            fields[self.FIELD_PARTITIONS] = struct.pack('>H', partitions)
+        if self.use_alpha:
+            fields[self.FIELD_ALPHA] = b''
+        encoded = b''.join(bytes([field, len(value)]) + value for field, value in fields.items())
+        if self.EXTENDED_HEADER_SIZE + 2 + len(encoded) > self.MAX_HEADER_SIZE:
+            raise ValueError("Embedding parameters too large for the stego header.")
+        return encoded
 
-        ycrcb = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb)
-        channels = list(cv2.split(ycrcb))  # Get mutable list of channels
+    def _engine_fields(self) -> dict:
+        """The header fields recording this engine's embedding parameters, by field type."""
+        for row, col in self.coefficients_to_use:
+            if not (0 <= row < self.block_size and 0 <= col < self.block_size):
+                raise ValueError(f"Coefficient ({row}, {col}) is outside the {self.block_size}x{self.block_size} block.")
+        if sorted(self.channel_order) != [0, 1, 2]:
+            raise ValueError(f"Channel order must be a permutation of (0, 1, 2), got {self.channel_order}.")
+        return {
+            self.FIELD_QUANTIZATION_STEP: struct.pack('>f', self.quantization_step),
+            self.FIELD_COEFFICIENTS: bytes(row << 4 | col for row, col in self.coefficients_to_use),
+            self.FIELD_CHANNEL_ORDER: bytes(self.channel_order),
+        }
 
-        h, w = channels[0].shape
-        block_size = self.block_size
+    def _decode_engine_params(self, value: bytes) -> dict:
+        """Parses the engine-specific bytes of an engine field. The DCT engine records none."""
+        return {}
+
+    def _decode_header_fields(self, fields: bytes) -> dict:
+        """
+        Parses type-length-value header fields into embedding parameters. Unknown fields are
+        skipped, so later versions can add fields that older readers ignore.
+
+        Returns:
+            dict: Any of 'quantization_step', 'coefficients_to_use', 'channel_order', 'shard'
+                  (a dict with 'payload_id', 'index' and 'count'), 'segments' (a dict with
+                  'count' and 'table_crc'), 'archive' (a dict with 'index_offset' and 'index_length')
+                  'partitions' (the number of recipient partitions), 'engine' (an
+                  (engine id, engine parameter bytes) pair; absent for the DCT engine) and
+                  'use_alpha' (True if the alpha plane carries payload).
+        """
+        params = {}
+        pos = 0
+        while pos + 2 <= len(fields):
+            field, length = fields[pos], fields[pos + 1]
+            value = fields[pos + 2:pos + 2 + length]
+            pos += 2 + length
+            if len(value) < length:
+                raise ValueError("Stego header fields are truncated.")
+            if field == self.FIELD_QUANTIZATION_STEP:
+                params["quantization_step"] = struct.unpack('>f', value)[0]
+            elif field == self.FIELD_COEFFICIENTS:
+                params["coefficients_to_use"] = [(byte >> 4, byte & 0x0F) for byte in value]
+            elif field == self.FIELD_CHANNEL_ORDER:
+                params["channel_order"] = tuple(value)
+            elif field == self.FIELD_SHARD and length == self.SHARD_ID_SIZE + 4:
+                index, count = struct.unpack('>HH', value[self.SHARD_ID_SIZE:])
+                if index >= count:
+                    raise ValueError("Stego header holds an invalid shard index.")
+                params["shard"] = {"payload_id": value[:self.SHARD_ID_SIZE], "index": index, "count": count}
+            elif field == self.FIELD_SEGMENTS and length == 8:
+                count, table_crc = struct.unpack('>II', value)
+                params["segments"] = {"count": count, "table_crc": table_crc}
+            elif field == self.FIELD_ARCHIVE and length == 8:
+                index_offset, index_length = struct.unpack('>II', value)
+                params["archive"] = {"index_offset": index_offset, "index_length": index_length}
+            elif field == self.FIELD_PARTITIONS and length == 2:
+                params["partitions"] = struct.unpack('>H', value)[0]
+            elif field == self.FIELD_ENGINE and length >= 1:
+                params["engine"] = (value[0], bytes(value[1:]))
+            elif field == self.FIELD_ALPHA:
+                params["use_alpha"] = True
+        if params.get("quantization_step", 1) <= 0 or not params.get("coefficients_to_use", [None]) or \
+                sorted(params.get("channel_order", (0, 1, 2))) != [0, 1, 2]:
+            raise ValueError("Stego header holds invalid embedding parameters.")
+        return params
+
+    def _configured_for(self, header: dict):
+        """
+        Returns an instance whose embedding parameters match those recorded in the header: this
+        one when they already agree (or the header records none), otherwise a configured copy.
+        Images made by another engine get a configured instance of that engine instead.
+
+        Raises:
+            ValueError: If the header names an unknown engine or invalid engine parameters.
+        """
+        params = dict(header.get("params", {}))
+        params.setdefault("use_alpha", False)  # Only images that record it use the alpha plane
+        engine_id, engine_params = params.pop("engine", (DCTSteganography.ENGINE_ID, b''))
+        if engine_id != self.ENGINE_ID:
+            from backend.engines import engine_class  # The registry imports this module
+            return engine_class(engine_id)()._configured_for(header)
+        params.update(self._decode_engine_params(engine_params))
+
+        params = {name: value for name, value in params.items() if value != getattr(self, name)}
+        if not params:
+            return self
+        configured = copy.copy(self)
+        for name, value in params.items():
+            setattr(configured, name, value)
+        configured.bits_per_block_per_channel = len(configured.coefficients_to_use)
+        return configured
+
+    def _check_capacity(self, shape, encrypted_data: bytes, header_size: int = 4) -> None:
+        """Raises if the encrypted payload (plus its header) does not fit in an image of the given shape."""
+        h, w = shape[:2]
         bits_per_channel_block = self.bits_per_block_per_channel
+        required_bits = len(encrypted_data) * 8
 
         # Calculate total available bits
-        total_available_bits = (h // block_size) * (w // block_size) * bits_per_channel_block * len(channels)
+        total_available_bits = self._capacity_bits(shape)
 
         # --- DEBUG PRINTS FOR CAPACITY ---
         print(f"\n--- EMBEDDING DEBUG ---")
-        print(f"Original data size: {len(secret_data)} bytes (is_text: {is_text})")
-        print(f"Compressed & Encrypted data size: {data_to_embed_len} bytes")
-        print(f"Compressed & Encrypted data bits: {len(data_to_embed_bits)}")
+        print(f"Compressed & Encrypted data size: {len(encrypted_data)} bytes")
+        print(f"Compressed & Encrypted data bits: {required_bits}")
         print(f"Image dimensions: {h}x{w} pixels")
         print(
-            f"Total available bits from image ({len(channels)} channels * {bits_per_channel_block} bits/block/channel): {total_available_bits}")
+            f"Total available bits from image ({len(self._stream_planes(shape))} channels * "
+            f"{bits_per_channel_block} bits/block/channel): {total_available_bits}")
         # --- END DEBUG PRINTS ---
 
-        if len(data_to_embed_bits) > total_available_bits:
+        if required_bits > total_available_bits:
             raise ValueError(
                 f"Encrypted data too large for image capacity. "
-                f"Required bits: {len(data_to_embed_bits)}, Available bits: {total_available_bits}. "
+                f"Required bits: {required_bits}, Available bits: {total_available_bits}. "
                 f"Consider a larger image or shorter message/file."
             )
+        if header_size * 8 > np.prod(self._colour_shape(shape)):
+            raise ValueError("Image too small to embed data length in LSB of pixel values.")
 
-        bit_idx = 0
-        # Loop through each channel (Y, Cr, Cb)
-        for channel_idx in range(len(channels)):
-            if bit_idx >= len(data_to_embed_bits):
-                break
-            current_channel = channels[channel_idx]
-            for i in range(0, h, block_size):
-                for j in range(0, w, block_size):
-                    if bit_idx >= len(data_to_embed_bits):
-                        break
-                    block = current_channel[i:i + block_size, j:j + block_size]
-                    if block.shape != (block_size, block_size):  # Skip partial blocks at edges
-                        continue
+    def _fitted_header(self, shape, encrypted_data: bytes, password: str, segments: tuple = None) -> bytes:
+        """Builds the header for a sealed payload, raising if payload and header don't fit the cover."""
+        header = self._build_header(encrypted_data, password, segments=segments)
+        self._check_capacity(shape, encrypted_data, len(header))
+        return header
 
-                    dct_block = cv2.dct(np.float32(block))
+    def _create_stego_canvas(self, img, image_path: str, output_path: str) -> tuple:
+        """
+        Returns the writable array the payload is embedded into, and whether it is the output file itself.
 
-                    # Embed multiple bits per block by iterating through selected coefficients
-                    for coeff_coords in self.coefficients_to_use:
-                        if bit_idx >= len(data_to_embed_bits):
-                            break
+        Uncompressed covers saved to the same format are modified in place on a copy of the file:
+        only the blocks carrying payload (and the header pixels) are ever read or written.
+        """
+        in_place = is_memmapped(img) and image_extension(output_path) == image_extension(image_path)
+        if in_place:
+            if os.path.abspath(output_path) != os.path.abspath(image_path):
+                shutil.copyfile(image_path, output_path)
+            return open_memmap(output_path, 'r+'), True
+        return np.array(img), False
 
-                        coeff_value = dct_block[coeff_coords[0], coeff_coords[1]]
-                        target_bit = int(data_to_embed_bits[bit_idx])
+    def _embed_payload(self, stego_img: np.ndarray, encrypted_data: bytes, header: bytes,
+                       verify: bool = False, cover: dict = None) -> dict:
+        """
+        Embeds the encrypted payload into the DCT slots and the header (see _build_header) into
+        the LSBs of the first pixel values, in place. With verify, the payload is read back from
+        the array and failing blocks are repaired; the verification report is returned (and
+        kept in last_verification), otherwise None. A cached cover (see _load_cover) saves
+        converting and transforming the blocks of a fresh copy of that cover.
+        """
+        blocks, targets = self._slot_targets(stego_img.shape, self._to_bits(encrypted_data))
+        self._write_slots(stego_img, blocks, targets, cover=cover)
 
-                        # Quantization-based embedding (modify LSB of quantized coefficient)
-                        quantized_coeff = int(round(coeff_value / self.quantization_step))
-                        modified_quantized_coeff = quantized_coeff
+        # The header (length of the *encrypted data* and key check) goes in the LSB of the first few pixel values
+        header_bits = self._to_bits(header)
+        self._write_lsb_bits(stego_img, header_bits)
 
-                        if target_bit == 0:
-                            modified_quantized_coeff = quantized_coeff - (quantized_coeff % 2)
-                        else:
-                            modified_quantized_coeff = quantized_coeff + 1 if quantized_coeff % 2 == 0 else quantized_coeff
+        if not verify:
+            return None
+        return self._record_verification(self._verify_and_repair(stego_img, blocks, targets, header_bits))
 
-                        dct_block[coeff_coords[0], coeff_coords[1]] = float(
-                            modified_quantized_coeff * self.quantization_step)
-                        bit_idx += 1
+    def _embed_and_save(self, stego_img: np.ndarray, in_place: bool, encrypted_data: bytes, header: bytes,
+                        output_path: str, output_options: OutputOptions = None, verify: bool = False,
+                        cover: dict = None) -> str:
+        """
+        Embeds the payload and writes the stego image. PNG output is streamed: stripes are encoded
+        while later blocks are still being embedded (see _embed_streaming).
+        """
+        if not in_place and image_extension(output_path) == '.png' and self._can_stream(stego_img.shape, header):
+            writer = PngStripeWriter(output_path, stego_img.shape, output_options)
+            try:
+                self._embed_streaming(stego_img, encrypted_data, header, writer, verify, cover)
+            except BaseException:
+                writer.abort()
+                raise
+            return writer.close()
+        self._embed_payload(stego_img, encrypted_data, header, verify, cover)
+        return self._save_stego(stego_img, in_place, output_path, output_options)
 
-                    current_channel[i:i + block_size, j:j + block_size] = np.uint8(cv2.idct(dct_block).clip(0, 255))
+    def _can_stream(self, shape, header: bytes) -> bool:
+        """
+        True if the blocks under the header pixels all fall in the first batch, so the header
+        can be written (and those rows encoded) once that batch is done.
+        """
+        header_blocks = self._header_blocks(shape, len(header) * 8)
+        return not len(header_blocks) or header_blocks[-1] < self.blocks_per_batch
 
-        # Merge modified channels back
-        stego_ycrcb = cv2.merge(channels)
-        stego_img = cv2.cvtColor(stego_ycrcb, cv2.COLOR_YCrCb2BGR)
+    def _embed_streaming(self, stego_img: np.ndarray, encrypted_data: bytes, header: bytes,
+                         writer: PngStripeWriter, verify: bool = False, cover: dict = None) -> dict:
+        """
+        Like _embed_payload, but hands rows to the writer as soon as no later batch can touch them.
 
-        # Embed the length of the *encrypted data* in LSB of the first few pixel values
-        length_bits = f"{data_to_embed_len:032b}"  # 32 bits for length (up to ~536MB of payload)
+        Blocks are written in raster order, so after each batch every block row above the batch's
+        last block is final. The header goes in after the first batch (which holds the blocks
+        under the header pixels), and with verify each batch is checked and repaired before its
+        rows are released; repairs only ever touch the block being repaired.
+        """
+        shape = stego_img.shape
+        blocks, targets = self._slot_targets(shape, self._to_bits(encrypted_data))
+        header_bits = self._to_bits(header)
+        cols = self._block_grid(shape)[1]
+        reports = []
+        emitted = 0
 
-        flat_img = stego_img.reshape(-1)  # Flatten the entire image pixel array
-        if len(length_bits) > len(flat_img):
-            raise ValueError("Image too small to embed data length in LSB of pixel values.")
+        def on_batch(batch):
+            nonlocal emitted
+            if batch.start == 0:
+                self._write_lsb_bits(stego_img, header_bits)
+            if verify:
+                reports.append(self._verify_and_repair(stego_img, blocks[batch], targets[batch], header_bits))
+            final_rows = (int(blocks[batch][-1]) + 1) // cols * self.block_size
+            if final_rows > emitted:
+                writer.write_rows(stego_img[emitted:final_rows])
+                emitted = final_rows
 
-        for i, bit in enumerate(length_bits):
-            flat_img[i] = (flat_img[i] & 0xFE) | int(bit)
+        self._write_slots(stego_img, blocks, targets, cover=cover, on_batch=on_batch)
+        if not len(blocks):
+            self._write_lsb_bits(stego_img, header_bits)
+        writer.write_rows(stego_img[emitted:])
 
-        stego_final = flat_img.reshape(stego_img.shape)
+        if not verify:
+            return None
+        return self._record_verification({
+            "bit_errors_initial": sum(report["bit_errors_initial"] for report in reports),
+            "blocks_repaired": sum(report["blocks_repaired"] for report in reports),
+            "repair_passes": max((report["repair_passes"] for report in reports), default=0),
+            "bit_errors_final": sum(report["bit_errors_final"] for report in reports),
+        })
 
-        if output_path is None:
-            raise ValueError("Output path must be provided to save the stego image.")
+    def _record_verification(self, report: dict) -> dict:
+        """Keeps a verification report in last_verification and returns it."""
+        self.last_verification = report
+        return report
 
-        cv2.imwrite(output_path, stego_final)
-        return output_path
+    def _append_stream(self, stego_img: np.ndarray, data: bytes, start: int, header: bytes,
+                       verify: bool = False) -> dict:
+        """
+        Embeds bytes at offset `start` of the embedded stream and rewrites the LSB header, in place.
 
-    def extract_data(self, image_path: str, password: str) -> dict:
+        Only the blocks holding the new bytes are re-embedded. Slots of those blocks (and of the
+        blocks under the header pixels) that carry earlier stream bytes are pinned to the bits
+        they hold now, so the existing payload survives. Returns the verification report, if any.
+        """
+        shape = stego_img.shape
+        new_blocks, new_targets = self._slot_targets(shape, self._to_bits(data), start * 8)
+        header_bits = self._to_bits(header)
+        blocks = np.union1d(new_blocks, self._header_blocks(shape, len(header_bits)))
+
+        targets = np.full((len(blocks), len(self._stream_planes(shape)), self.bits_per_block_per_channel), -1,
+                          dtype=np.int8)
+        targets[np.searchsorted(blocks, new_blocks)] = new_targets
+        earlier = self._slot_positions(shape, blocks) < start * 8
+        current = self._read_slots(stego_img, blocks, earlier.any(axis=2))
+        targets[earlier] = current[earlier]
+
+        rewritten = np.isin(blocks, new_blocks)
+        self._write_slots(stego_img, blocks[rewritten], targets[rewritten])
+        self._write_lsb_bits(stego_img, header_bits)
+
+        if not verify:
+            return None
+        return self._record_verification(self._verify_and_repair(stego_img, blocks, targets, header_bits))
+
+    def _header_blocks(self, shape, header_bit_count: int) -> np.ndarray:
+        """Indices of the blocks containing the pixels that hold the LSB header."""
+        ys, xs = np.unravel_index(np.arange(header_bit_count), self._colour_shape(shape))[:2]
+        rows, cols = self._block_grid(shape)
+        ys, xs = ys // self.block_size, xs // self.block_size
+        inside = (ys < rows) & (xs < cols)
+        return np.unique(ys[inside] * cols + xs[inside])
+
+    def _save_stego(self, stego_img: np.ndarray, in_place: bool, output_path: str,
+                    output_options: OutputOptions = None) -> str:
+        """Flushes an in-place stego file, or encodes the stego array to output_path."""
+        if in_place:
+            flush_memmap(stego_img)
+            return output_path
+        return write_image(output_path, stego_img, output_options)
+
+    def extract_data(self, image_path: str, password: str, spill_dir: str = None) -> dict:
         """
         Extracts, decrypts, and decompresses hidden data from a stego image.
 
         Args:
-            image_path (str): Path to the stego image (must be PNG).
+            image_path (str): Path to the stego image (PNG, TIFF, BMP or lossless WebP).
             password (str): The password for AES decryption.
+            spill_dir (str, optional): Directory to decode file payloads (and text larger than
+                                       spill_text_bytes) into, instead of returning them in memory.
+                                       The caller owns, moves or deletes the file.
 
         Returns:
             dict: A dictionary containing:
                   - 'type' (str): "text" or "file"
                   - 'content' (Union[str, bytes]): The decrypted text or file content bytes.
+                  - 'content_path' (str): Instead of 'content' for spilled payloads, the temporary
+                    file holding the content (UTF-8 for text).
                   - 'filename' (str, optional): Original filename if embedded a file.
                   - 'file_extension' (str, optional): Original file extension if embedded a file.
 
         Raises:
             ValueError: If stego image not found, extraction incomplete, decryption fails, etc.
         """
-        if not image_path.lower().endswith('.png'):
-            raise ValueError("Only PNG images are supported for extraction.")
+        if self.ciphertext_cache is not None:
+            return self.decrypt_ciphertext(self.gather_ciphertext(image_path), password, spill_dir)
+        return self._extract_opened(self._open_embedded(image_path), password, spill_dir)
+
+    def _open_embedded(self, image_path: str) -> tuple:
+        """
+        Opens a stego image and reads its header.
+
+        Returns:
+            tuple: (img, header, reader) where reader is an engine configured with the
+                   parameters recorded by the embedder (see _configured_for).
+        """
+        img = self._open_stego(image_path)
+        header = self._read_header(img)
+        self._check_not_shard(header)
+        return img, header, self._configured_for(header)
+
+    def _extract_opened(self, opened: tuple, password: str, spill_dir: str = None) -> dict:
+        """Reads and decrypts the payload of an image opened with _open_embedded (see extract_data)."""
+        img, header, reader = opened
+        reader._check_key(img, header, password)  # Cheap rejection of a wrong password
+        if header["segments"] is not None:
+            return self._decode_payload(reader._read_segments(img, header, password), spill_dir)
+        if header["partitions"] is not None:
+            extracted_encrypted_data_bytes = reader._read_partition(img, header, password)
+        else:
+            extracted_encrypted_data_bytes = reader._read_payload(img, header)
+        return self._decrypt_payload(extracted_encrypted_data_bytes, password, spill_dir)
+
+    def enable_ciphertext_cache(self, max_entries: int = 4, max_bytes: int = 64 * 1024 * 1024) -> LRUCache:
+        """
+        Makes extract_data gather each image's ciphertext once and keep it, keyed by a hash of
+        the image file, so retrying with another password skips decoding and transforming the
+        image. Gathering reads the whole embedded stream, including every recipient's partition
+        of a multi-recipient image. Cached ciphertext is zeroed when it leaves the cache; call
+        forget_ciphertext() when the image is no longer needed.
+
+        Returns:
+            LRUCache: The cache, whose stats() report hits, misses and memory use.
+        """
+        self.ciphertext_cache = LRUCache(max_entries, max_bytes, sizeof=lambda gathered: len(gathered["ciphertext"]),
+                                         on_evict=_wipe_gathered)
+        return self.ciphertext_cache
+
+    def forget_ciphertext(self) -> None:
+        """Drops (and zeroes) all cached ciphertext."""
+        if self.ciphertext_cache is not None:
+            self.ciphertext_cache.clear()
+
+    def gather_ciphertext(self, image_path: str) -> dict:
+        """
+        Reads the embedded (still encrypted) stream of a stego image. Nothing here depends on
+        the password, so the result can be decrypted with decrypt_ciphertext as often as needed.
+        With the ciphertext cache enabled, repeat calls for an unchanged file are served from it.
+
+        Returns:
+            dict: 'header' (see _read_header) and 'ciphertext' (a bytearray with the whole stream).
+
+        Raises:
+            ValueError: If the image can't be read, or holds a shard or an archive.
+        """
+        cache_key = None
+        if self.ciphertext_cache is not None:
+            cache_key = _file_digest(image_path)
+            gathered = self.ciphertext_cache.get(cache_key)
+            if gathered is not None:
+                return gathered
 
-        img = cv2.imread(image_path)
+        img, header, reader = self._open_embedded(image_path)
+        gathered = {"header": header, "ciphertext": bytearray(reader._read_payload(img, header))}
+        if cache_key is not None:
+            self.ciphertext_cache.put(cache_key, gathered)
+        return gathered
+
+    def decrypt_ciphertext(self, gathered: dict, password: str, spill_dir: str = None) -> dict:
+        """
+        Decrypts and decodes ciphertext from gather_ciphertext. Takes spill_dir, returns and
+        raises as extract_data.
+        """
+        header, stream = gathered["header"], gathered["ciphertext"]
+        reader = self._configured_for(header)
+        if header["segments"] is not None:
+            reader._check_key_tag(header, bytes(stream[:16]), password)
+            return self._decode_payload(reader._decrypt_segments(stream, header, password), spill_dir)
+        if header["partitions"] is not None:
+            table = bytes(stream[:self.PARTITION_SALT_SIZE + self.PARTITION_ENTRY_SIZE * header["partitions"]])
+            offset, length = reader._locate_partition(table, header, password)
+            return self._decrypt_payload(bytes(stream[offset:offset + length]), password, spill_dir)
+        reader._check_key_tag(header, bytes(stream[:16]), password)
+        return self._decrypt_payload(bytes(stream), password, spill_dir)
+
+    def _check_not_shard(self, header: dict) -> None:
+        """
+        Raises if the header belongs to one shard of a split payload, which can't be extracted on
+        its own, or to a multi-file archive, which is read with list_archive/extract_archive_entry.
+        """
+        if header["shard"] is not None:
+            raise ValueError(f"Image holds shard {header['shard']['index'] + 1} of {header['shard']['count']} "
+                             f"of a split payload; extract it together with the other shards.")
+        if header["archive"] is not None:
+            raise ValueError("Image holds a multi-file archive; use list_archive and extract_archive_entry.")
+
+    def _open_stego(self, image_path: str):
+        """Loads (or maps) a stego image, raising if it can't be read."""
+        if not is_lossless_path(image_path):
+            raise ValueError(f"Only lossless images ({', '.join(LOSSLESS_EXTENSIONS)}) are supported for extraction.")
+
+        img = self._load_image(image_path)
         if img is None:
             raise ValueError(f"Stego image not found: {image_path}")
+        return img
+
+    def _read_header(self, img: np.ndarray) -> dict:
+        """
+        Reads the LSB header of a stego image array.
+
+        Only the LSBs of the first pixel values are read, so img may also be just the image's leading rows.
+
+        Returns:
+            dict: 'length' of the encrypted payload in bytes, 'key_check' (the tag bytes),
+                  'version' (the format version), 'params' (embedding parameters recorded in the
+                  header, see _decode_header_fields), 'shard' (None unless the image holds part
+                  of a sharded payload), 'segments' (None unless the payload is segmented),
+                  'archive' (None unless the payload is a multi-file archive) and 'partitions'
+                  (None unless the image holds partitions for several recipients). Legacy images, whose header is the bare length, have no
+                  key check or version and record no parameters.
 
+        Raises:
+            ValueError: If the image is too small, or the header is flagged as extended but has no
+                        valid format marker or comes from a newer format version.
+        """
         # 1. Extract length of encrypted data from LSB of first 32 pixel values
-        flat_img = img.reshape(-1)
-        if len(flat_img) < 32:
+        if img.size < 32:
             raise ValueError("Stego image too small to contain 32-bit length header.")
 
-        length_bits_list = [str(flat_img[i] & 1) for i in range(32)]
-        data_to_extract_len = int(''.join(length_bits_list), 2)
-        total_bits_to_extract = data_to_extract_len * 8
+        length_field = int.from_bytes(self._to_bytes(self._read_lsb_bits(img, 32)), 'big')
+        header = {"length": length_field & ~self.HEADER_FLAG_EXTENDED, "key_check": None, "version": None,
+                  "params": {}, "shard": None, "segments": None, "archive": None, "partitions": None}
+        if length_field & self.HEADER_FLAG_EXTENDED:
+            if img.size < self.EXTENDED_HEADER_SIZE * 8:
+                raise ValueError("Stego image too small to contain its header.")
+            extended = self._to_bytes(self._read_lsb_bits(img, self.EXTENDED_HEADER_SIZE * 8 - 32, 32))
+            marker = extended[self.KEY_CHECK_SIZE:]
+            if marker[:-1] != self.HEADER_MAGIC:
+                raise ValueError("Image does not contain a recognised stego header.")
+            if marker[-1] > self.FORMAT_VERSION:
+                raise ValueError(f"Stego format version {marker[-1]} is newer than this version supports "
+                                 f"({self.FORMAT_VERSION}).")
+            header["key_check"] = extended[:self.KEY_CHECK_SIZE]
+            header["version"] = marker[-1]
 
-        # 2. Extract encrypted data bits from DCT coefficients of Y, Cr, and Cb channels
-        ycrcb = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb)
-        channels = cv2.split(ycrcb)  # Get channels as tuple
+            # Version 1 stopped at the marker; later versions describe the embedding parameters
+            if header["version"] >= 2:
+                offset = self.EXTENDED_HEADER_SIZE * 8
+                if img.size < offset + 16:
+                    raise ValueError("Stego image too small to contain its header.")
+                fields_size = int.from_bytes(self._to_bytes(self._read_lsb_bits(img, 16, offset)), 'big')
+                if self.EXTENDED_HEADER_SIZE + 2 + fields_size > self.MAX_HEADER_SIZE or \
+                        img.size < offset + 16 + fields_size * 8:
+                    raise ValueError("Stego header is corrupted or the image is too small to contain it.")
+                fields = self._to_bytes(self._read_lsb_bits(img, fields_size * 8, offset + 16))
+                header["params"] = self._decode_header_fields(fields)
+                header["shard"] = header["params"].pop("shard", None)
+                header["segments"] = header["params"].pop("segments", None)
+                header["archive"] = header["params"].pop("archive", None)
+                header["partitions"] = header["params"].pop("partitions", None)
+        return header
 
-        h, w = channels[0].shape
-        block_size = self.block_size
-        extracted_bits_list = []
+    def _check_key(self, img: np.ndarray, header: dict, password: str) -> None:
+        """
+        Compares the header's key-check tag with the password, reading only the blocks that hold
+        the payload's IV. Legacy images carry no tag and are left to fail at decryption; images
+        with recipient partitions are checked against the partition table instead.
 
-        # Loop through each channel (Y, Cr, Cb)
-        for channel_idx in range(len(channels)):
-            if len(extracted_bits_list) >= total_bits_to_extract:
-                break
-            current_channel = channels[channel_idx]
-            for i in range(0, h, block_size):
-                for j in range(0, w, block_size):
-                    if len(extracted_bits_list) >= total_bits_to_extract:
-                        break
-                    block = current_channel[i:i + block_size, j:j + block_size]
-                    if block.shape != (block_size, block_size):
-                        continue
-
-                    dct_block = cv2.dct(np.float32(block))
-
-                    # Extract multiple bits per block by iterating through selected coefficients
-                    for coeff_coords in self.coefficients_to_use:
-                        if len(extracted_bits_list) >= total_bits_to_extract:
-                            break
-
-                        coeff_value = dct_block[coeff_coords[0], coeff_coords[1]]
-                        quantized_coeff = int(round(coeff_value / self.quantization_step))
-                        bit = quantized_coeff % 2
-                        extracted_bits_list.append(str(bit))
-
-        if len(extracted_bits_list) < total_bits_to_extract:
+        Raises:
+            ValueError: If the password does not match.
+        """
+        if header["key_check"] is None or header["partitions"] is not None:
+            return
+        self._check_key_tag(header, self._to_bytes(self._extract_bits(img, min(header["length"], 16) * 8)), password)
+
+    def _check_key_tag(self, header: dict, iv: bytes, password: str) -> None:
+        """Compares the header's key-check tag with the password, given the payload's first 16 bytes."""
+        if header["key_check"] is None or header["partitions"] is not None:
+            return
+        expected = self._key_check_tag(self._derive_key_from_password(password), iv)
+        if not hmac.compare_digest(expected, header["key_check"]):
+            raise ValueError("Wrong password or damaged image: the key check stored in the image does not match.")
+
+    def _read_payload(self, img: np.ndarray, header: dict = None) -> bytes:
+        """Reads the encrypted payload bytes described by the header from a stego image array."""
+        if header is None:
+            header = self._read_header(img)
+        data_to_extract_len = header["length"]
+        total_bits_to_extract = data_to_extract_len * 8
+
+        # 2. Extract encrypted data bits from DCT coefficients of Y, Cr, and Cb channels,
+        #    transforming only the blocks that hold them
+        total_available_bits = self._capacity_bits(img.shape)
+        if total_bits_to_extract > total_available_bits:
             raise ValueError(
                 f"Incomplete encrypted data extracted. "
-                f"Got {len(extracted_bits_list)} bits, expected {total_bits_to_extract} bits. "
+                f"Got {total_available_bits} bits, expected {total_bits_to_extract} bits. "
                 f"Image might be corrupted or not contain a full message."
             )
 
-        # Convert extracted bits to bytes
-        extracted_encrypted_data_bits = ''.join(extracted_bits_list[:total_bits_to_extract])
+        extracted_encrypted_data_bits = self._extract_bits(img, total_bits_to_extract)
         extracted_encrypted_data_bytes = self._to_bytes(extracted_encrypted_data_bits)
 
         # --- DEBUG PRINTS FOR EXTRACTION ---
@@ -278,6 +1745,161 @@ class DCTSteganography:
         print(f"Bytes reconstructed from extracted bits: {len(extracted_encrypted_data_bytes)}")
         # --- END DEBUG PRINTS ---
 
+        return extracted_encrypted_data_bytes
+
+    def _read_segments(self, img: np.ndarray, header: dict, password: str, max_workers: int = None) -> bytes:
+        """
+        Reads the segment table of a segmented payload, then extracts, checks, decrypts and
+        decompresses the segments concurrently, each from just the blocks that hold it.
+
+        Returns:
+            bytes: The serialized (JSON) payload.
+
+        Raises:
+            ValueError: If the table or a segment is corrupt (naming the segment), or decryption fails.
+        """
+        count = header["segments"]["count"]
+        table_size = count * self.SEGMENT_ENTRY_SIZE
+        if table_size > header["length"] or header["length"] * 8 > self._capacity_bits(img.shape):
+            raise ValueError("Segment table is larger than the embedded payload; the image may be corrupted.")
+        entries, offsets = self._parse_segment_table(self._to_bytes(self._extract_bits(img, table_size * 8)), header)
+        read = lambda index: self._to_bytes(self._extract_bits(img, entries[index][0] * 8, int(offsets[index]) * 8))
+        return self._open_segments(read, entries, password, max_workers)
+
+    def _decrypt_segments(self, stream, header: dict, password: str, max_workers: int = None) -> bytes:
+        """Like _read_segments, for a segmented stream already gathered into memory."""
+        table_size = header["segments"]["count"] * self.SEGMENT_ENTRY_SIZE
+        if table_size > len(stream):
+            raise ValueError("Segment table is larger than the embedded payload; the image may be corrupted.")
+        entries, offsets = self._parse_segment_table(bytes(stream[:table_size]), header)
+        read = lambda index: bytes(stream[int(offsets[index]):int(offsets[index + 1])])
+        return self._open_segments(read, entries, password, max_workers)
+
+    def _parse_segment_table(self, table: bytes, header: dict) -> tuple:
+        """Checks a segment table. Returns its (length, crc) entries and the segments' stream offsets."""
+        if zlib.crc32(table) != header["segments"]["table_crc"]:
+            raise ValueError("Segment table is corrupt (checksum mismatch).")
+        count = header["segments"]["count"]
+        entries = [struct.unpack_from('>II', table, index * self.SEGMENT_ENTRY_SIZE) for index in range(count)]
+        offsets = np.cumsum([len(table)] + [length for length, _ in entries])
+        if offsets[-1] != header["length"]:
+            raise ValueError("Segment table does not match the embedded payload length.")
+        return entries, offsets
+
+    def _open_segments(self, read, entries: list, password: str, max_workers: int = None) -> bytes:
+        """Checks, decrypts and decompresses segments concurrently; read(index) returns a segment's bytes."""
+        count = len(entries)
+        key_bytes = self._derive_key_from_password(password)
+
+        def open_segment(index):
+            segment = read(index)
+            if zlib.crc32(segment) != entries[index][1]:
+                raise ValueError(f"Segment {index + 1} of {count} is corrupt (checksum mismatch).")
+            try:
+                return zlib.decompress(AES.decrypt(segment, key_bytes))
+            except (ValueError, zlib.error) as e:
+                raise ValueError(f"Segment {index + 1} of {count} could not be decrypted: {e}")
+
+        with ThreadPoolExecutor(max_workers) as pool:
+            pieces = list(pool.map(open_segment, range(count)))
+        return b''.join(pieces)
+
+    def _read_partition(self, img: np.ndarray, header: dict, password: str) -> bytes:
+        """
+        Finds the caller's entry in the partition table and reads just that partition.
+
+        Raises:
+            ValueError: If no partition matches the password, or the table is inconsistent.
+        """
+        count = header["partitions"]
+        table_size = self.PARTITION_SALT_SIZE + self.PARTITION_ENTRY_SIZE * count
+        if table_size > header["length"] or header["length"] * 8 > self._capacity_bits(img.shape):
+            raise ValueError("Partition table is larger than the embedded payload; the image may be corrupted.")
+
+        table = self._to_bytes(self._extract_bits(img, table_size * 8))
+        offset, length = self._locate_partition(table, header, password)
+        return self._to_bytes(self._extract_bits(img, length * 8, offset * 8))
+
+    def _locate_partition(self, table: bytes, header: dict, password: str) -> tuple:
+        """Looks the password up in a partition table. Returns the partition's (offset, length)."""
+        tag, mask = self._partition_keys(self._derive_key_from_password(password), table[:self.PARTITION_SALT_SIZE])
+        for start in range(self.PARTITION_SALT_SIZE, len(table), self.PARTITION_ENTRY_SIZE):
+            entry = table[start:start + self.PARTITION_ENTRY_SIZE]
+            if hmac.compare_digest(entry[:8], tag):
+                offset, length = struct.unpack('>II', bytes(a ^ b for a, b in zip(entry[8:], mask)))
+                if offset + length > header["length"]:
+                    raise ValueError("Partition lies outside the embedded payload; the image may be corrupted.")
+                return offset, length
+        raise ValueError("Incorrect password: no partition in this image matches it.")
+
+    def list_archive(self, image_path: str, password: str) -> list:
+        """
+        Lists the entries of a multi-file archive made by embed_archive, reading only its index.
+
+        Returns:
+            list: A dict per entry with 'name', 'size' (bytes) and 'codec'.
+
+        Raises:
+            ValueError: If the image holds no archive, the password is wrong or the index is corrupt.
+        """
+        _, _, _, index = self._open_archive(image_path, password)
+        return [{"name": entry["name"], "size": entry["size"], "codec": entry["codec"]} for entry in index]
+
+    def extract_archive_entry(self, image_path: str, password: str, name: str) -> bytes:
+        """
+        Extracts one file from a multi-file archive, transforming only the blocks that hold the
+        index and that entry.
+
+        Args:
+            image_path (str): Path to the stego image.
+            password (str): The password for AES decryption.
+            name (str): Entry name, as given by list_archive.
+
+        Returns:
+            bytes: The file content.
+
+        Raises:
+            ValueError: If there is no such entry, the password is wrong or the entry is corrupt.
+        """
+        reader, img, header, index = self._open_archive(image_path, password)
+        entry = next((entry for entry in index if entry["name"] == name), None)
+        if entry is None:
+            raise ValueError(f"No entry named '{name}' in the archive.")
+        return reader._read_archive_entry(img, header, entry, self._derive_key_from_password(password))
+
+    def _open_archive(self, image_path: str, password: str) -> tuple:
+        """Opens a stego image holding an archive and decrypts its index. Returns (reader, img, header, index)."""
+        img = self._open_stego(image_path)
+        header = self._read_header(img)
+        if header["archive"] is None:
+            raise ValueError("Image does not hold a multi-file archive.")
+        reader = self._configured_for(header)
+        reader._check_key(img, header, password)
+        if header["length"] * 8 > reader._capacity_bits(img.shape):
+            raise ValueError("Archive is larger than the image capacity; the image may be corrupted.")
+
+        offset, length = header["archive"]["index_offset"], header["archive"]["index_length"]
+        if offset + length > header["length"]:
+            raise ValueError("Archive index lies outside the embedded payload; the image may be corrupted.")
+        sealed_index = self._to_bytes(reader._extract_bits(img, length * 8, offset * 8))
+        key_bytes = self._derive_key_from_password(password)
+        index = json.loads(zlib.decompress(AES.decrypt(sealed_index, key_bytes)).decode('utf-8'))
+        return reader, img, header, index
+
+    def _read_archive_entry(self, img: np.ndarray, header: dict, entry: dict, key_bytes: bytes) -> bytes:
+        """Extracts, decrypts and checks one archive entry."""
+        if entry["offset"] + entry["length"] > header["length"]:
+            raise ValueError(f"Archive entry '{entry['name']}' lies outside the embedded payload.")
+        blob = self._to_bytes(self._extract_bits(img, entry["length"] * 8, entry["offset"] * 8))
+        data = AES.decrypt(blob, key_bytes)
+        if entry["codec"] == "zlib":
+            data = zlib.decompress(data)
+        if len(data) != entry["size"] or zlib.crc32(data) != entry["crc"]:
+            raise ValueError(f"Archive entry '{entry['name']}' is corrupt (checksum mismatch).")
+        return data
+
+    def _decrypt_payload(self, extracted_encrypted_data_bytes: bytes, password: str, spill_dir: str = None) -> dict:
+        """Decrypts, decompresses and decodes an extracted payload into the extract_data result dict."""
         # --- DECRYPTION AND DECOMPRESSION ---
         key_bytes = self._derive_key_from_password(password)
 
@@ -287,22 +1909,30 @@ class DCTSteganography:
         # 4. Decompress the payload
         # This is where 'zlib.error: Error -3' typically occurs if the data is corrupted
         decompressed_json_payload_bytes = zlib.decompress(decrypted_compressed_payload_bytes)
+        return self._decode_payload(decompressed_json_payload_bytes, spill_dir)
 
+    def _decode_payload(self, decompressed_json_payload_bytes: bytes, spill_dir: str = None) -> dict:
+        """Decodes a serialized (JSON) payload into the extract_data result dict."""
         # 5. Deserialize the JSON payload
         metadata_payload = json.loads(decompressed_json_payload_bytes.decode('utf-8'))
 
         result = {
             self.METADATA_KEY_TYPE: metadata_payload[self.METADATA_KEY_TYPE],
         }
+        encoded = metadata_payload.get(self.METADATA_KEY_CONTENT, "")
+        content_size = len(encoded) // 4 * 3  # Within two bytes of the decoded size
 
         # Handle content based on type (now uniformly Base64 decoded)
-        if result[self.METADATA_KEY_TYPE] == self.TEXT_TYPE:
+        if spill_dir is not None and (result[self.METADATA_KEY_TYPE] == self.FILE_TYPE
+                                      or content_size > self.spill_text_bytes):
+            result[self.METADATA_KEY_CONTENT_PATH] = _spill_base64(encoded, spill_dir)
+        elif result[self.METADATA_KEY_TYPE] == self.TEXT_TYPE:
             # Decode from base64 and then to UTF-8 string
-            result[self.METADATA_KEY_CONTENT] = base64.b64decode(metadata_payload[self.METADATA_KEY_CONTENT]).decode(
-                'utf-8')
+            result[self.METADATA_KEY_CONTENT] = base64.b64decode(encoded).decode('utf-8')
         elif result[self.METADATA_KEY_TYPE] == self.FILE_TYPE:
             # Decode from base64 to binary bytes
-            result[self.METADATA_KEY_CONTENT] = base64.b64decode(metadata_payload[self.METADATA_KEY_CONTENT])
+            result[self.METADATA_KEY_CONTENT] = base64.b64decode(encoded)
+        if result[self.METADATA_KEY_TYPE] == self.FILE_TYPE:
             if self.METADATA_KEY_FILENAME in metadata_payload:
                 result[self.METADATA_KEY_FILENAME] = metadata_payload[self.METADATA_KEY_FILENAME]
             if self.METADATA_KEY_FILEEXT in metadata_payload:
@@ -312,6 +1942,37 @@ class DCTSteganography:
 
     def _derive_key_from_password(self, password: str) -> bytes:
         """Derives a 32-byte AES key from a string password using SHA256."""
-        import hashlib
         return hashlib.sha256(password.encode('utf-8')).digest()
 
+
+def _file_digest(path: str) -> bytes:
+    """SHA-256 of a file's contents, raising ValueError if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except OSError:
+        raise ValueError(f"Stego image not found: {path}")
+    return digest.digest()
+
+
+def _spill_base64(encoded: str, spill_dir: str, chunk_chars: int = 4 * 1024 * 1024) -> str:
+    """
+    Decodes base64 text into a new private file in spill_dir a chunk at a time, so the decoded
+    content is never held in memory whole. Returns the file's path.
+    """
+    fd, path = tempfile.mkstemp(prefix="stego-", suffix=".part", dir=spill_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(encoded), chunk_chars):  # chunk_chars is a multiple of 4
+                f.write(base64.b64decode(encoded[start:start + chunk_chars]))
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _wipe_gathered(gathered: dict) -> None:
+    """Zeroes gathered ciphertext as it leaves the cache."""
+    gathered["ciphertext"][:] = bytes(len(gathered["ciphertext"]))
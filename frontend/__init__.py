@@ -3,6 +3,7 @@ from .base_widget import BaseWidget
 from .home import HomeScreen
 from .encrypt import EncryptionScreen
 from .decrypt import DecryptionScreen
+from .batch import BatchScreen
 from .about import AboutScreen
 
-__all__ = ['BaseWidget', 'HomeScreen', 'EncryptionScreen', 'DecryptionScreen', 'AboutScreen']
\ No newline at end of file
+__all__ = ['BaseWidget', 'HomeScreen', 'EncryptionScreen', 'DecryptionScreen', 'BatchScreen', 'AboutScreen']
\ No newline at end of file
@@ -1,13 +1,8 @@
-import os
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, \
     QTextBrowser, QPushButton  # Using QTextBrowser for rich text
 from PySide6.QtCore import Qt, QSize
 from .base_widget import BaseWidget
 
-# Get absolute path to assets
-BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ASSETS_PATH = os.path.join(BASE_PATH, "assets")
-
 
 class AboutScreen(BaseWidget):
     def __init__(self, switch_callback):
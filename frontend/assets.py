@@ -0,0 +1,65 @@
+import os
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon, QPixmap
+
+try:
+    # Generated with `pyside6-rcc assets/assets.qrc -o frontend/resources_rc.py`; importing it
+    # registers the images under :/assets, so a frozen build doesn't need the assets folder
+    from . import resources_rc  # noqa: F401
+    ASSETS_PATH = ":/assets"
+except ImportError:
+    ASSETS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+# Images every screen needs, decoded once when the main window starts
+PRELOADED = ("steg_bg3.png", "steg_logo.png", "upload-icon-3.png", "Group.png", "arrow_left.png",
+             "show.png", "hide_.png")
+
+# (name, width, height, aspect mode) -> QPixmap, and name -> QIcon. The set of assets and
+# sizes is fixed by the UI, so nothing is ever evicted.
+_pixmaps = {}
+_icons = {}
+
+
+def pixmap(name: str, width: int = 0, height: int = 0,
+           aspect_mode: Qt.AspectRatioMode = Qt.AspectRatioMode.KeepAspectRatio) -> QPixmap:
+    """
+    Returns an asset image, decoded and scaled once and shared by every caller.
+
+    Args:
+        name (str): File name in the assets folder.
+        width, height (int): Size to scale to with smooth filtering. 0 keeps the native size.
+        aspect_mode (Qt.AspectRatioMode): How to fit the image into width x height.
+
+    Returns:
+        QPixmap: The image, or a null pixmap if the asset is missing.
+    """
+    key = (name, width, height, aspect_mode)
+    cached = _pixmaps.get(key)
+    if cached is None:
+        if width and height:
+            cached = pixmap(name)
+            if not cached.isNull():
+                cached = cached.scaled(width, height, aspect_mode, Qt.TransformationMode.SmoothTransformation)
+        else:
+            cached = QPixmap(f"{ASSETS_PATH}/{name}")
+        _pixmaps[key] = cached
+    return cached
+
+
+def icon(name: str) -> QIcon:
+    """Returns an asset as an icon, built from the cached pixmap once."""
+    cached = _icons.get(name)
+    if cached is None:
+        cached = QIcon(pixmap(name))
+        _icons[name] = cached
+    return cached
+
+
+def preload(names=PRELOADED) -> None:
+    """
+    Decodes assets ahead of use, so the first click that shows one (e.g. the hide-password
+    eye) doesn't read it from disk. Needs a QApplication.
+    """
+    for name in names:
+        pixmap(name)
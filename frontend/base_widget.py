@@ -1,20 +1,22 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout
-from PySide6.QtGui import QPixmap, QPainter
-import os
-
-# Get absolute path to assets
-BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ASSETS_PATH = os.path.join(BASE_PATH, "assets")
+from PySide6.QtGui import QPainter
+from PySide6.QtCore import Qt
+from . import assets
 
 class BaseWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.background = QPixmap(os.path.join(ASSETS_PATH, "steg_bg3.png"))
+        self.background = assets.pixmap("steg_bg3.png")  # Shared by every screen, decoded once
+        self._scaled_background = None  # The background at the widget's current size
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
 
     def paintEvent(self, event):
+        # Rescale only when the size changes rather than on every repaint
+        if self._scaled_background is None or self._scaled_background.size() != self.size():
+            self._scaled_background = self.background.scaled(
+                self.size(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
         painter = QPainter(self)
-        painter.drawPixmap(self.rect(), self.background)
-        super().paintEvent(event)
\ No newline at end of file
+        painter.drawPixmap(0, 0, self._scaled_background)
+        super().paintEvent(event)
@@ -0,0 +1,573 @@
+import os
+import time
+
+from PySide6.QtCore import Qt, QThread, QThreadPool
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView, QComboBox, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QProgressBar,
+    QPushButton, QSpinBox, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+from .base_widget import BaseWidget
+from .encrypt import ENGINE_LABELS
+from .workers import run_in_background
+
+# Import the backend batch runner and embedding engines
+from backend.batch import EMBED, EXTRACT, BatchJob, detect_mode, run_job
+from backend.engines import DEFAULT_ENGINE, available_engines, create_engine
+from backend.image_io import LOSSLESS_EXTENSIONS, is_lossless_path
+
+# Queue table columns
+COLUMN_IMAGE, COLUMN_MODE, COLUMN_PAYLOAD, COLUMN_STATUS, COLUMN_PROGRESS, COLUMN_SPEED, COLUMN_DETAILS = range(7)
+COLUMN_TITLES = ("Image", "Mode", "Payload", "Status", "Progress", "Speed", "Details")
+
+# Job states shown in the Status column (a running job shows its current stage instead)
+STATUS_DETECTING = "Detecting..."
+STATUS_NEEDS_INPUT = "Needs input"
+STATUS_READY = "Ready"
+STATUS_QUEUED = "Queued"
+STATUS_RUNNING = "Running"
+STATUS_DONE = "Done"
+STATUS_FAILED = "Failed"
+STATUS_STOPPED = "Stopped"
+
+STATUS_COLOURS = {STATUS_DONE: "#70ED00", STATUS_FAILED: "#FF5555", STATUS_NEEDS_INPUT: "#FFC857"}
+MODE_LABELS = {EMBED: "Embed", EXTRACT: "Extract"}
+
+
+def _format_rate(bytes_per_second: float) -> str:
+    """Human-readable throughput."""
+    if bytes_per_second < 1024 * 1024:
+        return f"{bytes_per_second / 1024:.0f} KB/s"
+    return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+
+
+class QueueEntry:
+    """A batch job and its state in the queue view."""
+
+    def __init__(self, job: BatchJob):
+        self.job = job
+        self.status = STATUS_DETECTING
+        self.stage = ""  # Current stage of a running job
+        self.progress = 0.0
+        self.result = None  # run_job's result once done
+        self.error = None
+
+
+class BatchScreen(BaseWidget):
+    def __init__(self, switch_callback):
+        self.switch_callback = switch_callback
+        super().__init__()
+
+        # --- Instance variables for the queue ---
+        self.entries = []  # One per table row, in row order
+        self.payload_path = None  # File picked to assign to embed jobs
+        self.output_dir = os.path.join(os.path.expanduser("~"), "Stego Batch")
+
+        # Jobs run on their own pool, so a long batch never starves previews and other
+        # background work on the global pool. Threads suffice: decoding, the transforms, zlib
+        # and AES all release the GIL.
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, QThread.idealThreadCount() // 2))
+
+        # Totals for the batch being run, for the overall throughput
+        self.batch_started = None
+        self.batch_seconds = 0.0  # From the start to the latest finished job
+        self.batch_bytes = 0
+
+        # The embedding engine (any engine extracts). Shared by all jobs, so a payload sent to
+        # many covers is compressed once.
+        self.stego = create_engine(DEFAULT_ENGINE)
+        self.stego.enable_payload_cache()
+
+        self.setAcceptDrops(True)
+        self.init_ui()
+
+    def init_ui(self):
+        self.batch_main_holder = QWidget(self)
+        self.batch_main_holder.setGeometry(0, 0, 900, 670)
+        self.batch_main_holder.setStyleSheet("background: rgba(0, 0, 0, 200);")
+        self.batch_main_holder_layout = QHBoxLayout(self.batch_main_holder)
+        self.batch_main_holder_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.batch_main_ = QWidget()
+        self.batch_main_.setObjectName("BatchMain")
+        self.batch_main_.setFixedSize(860, 610)
+        self.batch_main_.setStyleSheet("""
+            #BatchMain {
+                background: rgb(14, 14, 15);
+                border: 1px solid #81C8FF;
+                border-radius: 25px;
+            }
+            QLabel {
+                color: #ffffee;
+                font-size: 12px;
+                background: transparent;
+            }
+            QLineEdit, QComboBox, QSpinBox {
+                background: black;
+                color: white;
+                border: 1px solid #6A7788;
+                border-radius: 8px;
+                padding: 3px 8px;
+                font-size: 12px;
+            }
+            QPushButton {
+                background: #6A7788;
+                color: #ffffee;
+                border: none;
+                border-radius: 13px;
+                padding: 5px 14px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background: #5A6778;
+            }
+            QPushButton:disabled {
+                background: #2A2F36;
+                color: #6A7788;
+            }
+        """)
+        self.batch_main_layout = QVBoxLayout(self.batch_main_)
+        self.batch_main_layout.setSpacing(10)
+        self.batch_main_layout.setContentsMargins(25, 20, 25, 20)
+        self.batch_main_holder_layout.addWidget(self.batch_main_)
+
+        self.batch_indicator_label = QLabel("Batch Queue")
+        self.batch_indicator_label.setStyleSheet("color: #ffffee; font-size: 20px;")
+        self.batch_indicator_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.batch_indicator_comment = QLabel(
+            "Drop covers or stego images here. Images that carry a payload are extracted, the rest are embedded into.")
+        self.batch_indicator_comment.setStyleSheet("color: #6A7788; font-size: 12px;")
+        self.batch_indicator_comment.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # --- Queue table ---
+        self.queue_table = QTableWidget(0, len(COLUMN_TITLES))
+        self.queue_table.setHorizontalHeaderLabels(COLUMN_TITLES)
+        self.queue_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.queue_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.queue_table.verticalHeader().setVisible(False)
+        header = self.queue_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(COLUMN_DETAILS, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((COLUMN_IMAGE, 170), (COLUMN_MODE, 65), (COLUMN_PAYLOAD, 120), (COLUMN_STATUS, 100),
+                              (COLUMN_PROGRESS, 100), (COLUMN_SPEED, 75)):
+            self.queue_table.setColumnWidth(column, width)
+        self.queue_table.setStyleSheet("""
+            QTableWidget {
+                background: black;
+                color: white;
+                border: 1px solid grey;
+                gridline-color: #1F2328;
+                font-size: 12px;
+            }
+            QTableWidget::item:selected {
+                background: #0D2E63;
+            }
+            QHeaderView::section {
+                background: rgb(14, 14, 15);
+                color: #6A7788;
+                border: none;
+                padding: 4px;
+            }
+        """)
+
+        # --- Assignment row: what selected jobs should embed, and with which password ---
+        self.assign_row = QWidget()
+        self.assign_layout = QHBoxLayout(self.assign_row)
+        self.assign_layout.setContentsMargins(0, 0, 0, 0)
+        self.assign_layout.setSpacing(8)
+
+        self.payload_file_btn = QPushButton("Payload File...")
+        self.payload_file_btn.clicked.connect(self._choose_payload_file)
+        self.payload_file_label = QLabel("No file")
+        self.payload_file_label.setFixedWidth(110)
+        self.payload_text_input = QLineEdit()
+        self.payload_text_input.setPlaceholderText("...or text to embed")
+        self.payload_text_input.textChanged.connect(self._payload_text_changed)
+        self.batch_password_input = QLineEdit()
+        self.batch_password_input.setPlaceholderText("Password")
+        self.batch_password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.batch_password_input.setFixedWidth(130)
+        self.mode_selector = QComboBox()
+        self.mode_selector.addItem("Detected mode", None)
+        self.mode_selector.addItem("Embed", EMBED)
+        self.mode_selector.addItem("Extract", EXTRACT)
+        self.apply_btn = QPushButton("Apply to Selected")
+        self.apply_btn.setToolTip("Assigns the payload, password and mode to the selected jobs "
+                                  "(all jobs if none are selected)")
+        self.apply_btn.clicked.connect(self._apply_clicked)
+
+        self.assign_layout.addWidget(self.payload_file_btn)
+        self.assign_layout.addWidget(self.payload_file_label)
+        self.assign_layout.addWidget(self.payload_text_input, 1)
+        self.assign_layout.addWidget(self.batch_password_input)
+        self.assign_layout.addWidget(self.mode_selector)
+        self.assign_layout.addWidget(self.apply_btn)
+
+        # --- Run row: output folder, engine, pool size and queue controls ---
+        self.run_row = QWidget()
+        self.run_layout = QHBoxLayout(self.run_row)
+        self.run_layout.setContentsMargins(0, 0, 0, 0)
+        self.run_layout.setSpacing(8)
+
+        self.output_dir_btn = QPushButton("Output Folder...")
+        self.output_dir_btn.clicked.connect(self._choose_output_dir)
+        self.output_dir_label = QLabel()
+        self.output_dir_label.setFixedWidth(150)
+        self._show_output_dir()
+
+        self.engine_selector = QComboBox()
+        for engine_name in available_engines():
+            self.engine_selector.addItem(ENGINE_LABELS.get(engine_name, engine_name.upper()), engine_name)
+        self.engine_selector.setCurrentIndex(self.engine_selector.findData(DEFAULT_ENGINE))
+        self.engine_selector.setToolTip("Engine used to embed (extraction always detects it)")
+        self.engine_selector.currentIndexChanged.connect(self._engine_changed)
+
+        self.workers_label = QLabel("Workers")
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(1, QThread.idealThreadCount()))
+        self.workers_spin.setValue(self.pool.maxThreadCount())
+        self.workers_spin.valueChanged.connect(self.pool.setMaxThreadCount)
+
+        self.run_layout.addWidget(self.output_dir_btn)
+        self.run_layout.addWidget(self.output_dir_label)
+        self.run_layout.addWidget(self.engine_selector)
+        self.run_layout.addStretch(1)
+        self.run_layout.addWidget(self.workers_label)
+        self.run_layout.addWidget(self.workers_spin)
+
+        # --- Queue controls ---
+        self.controls_row = QWidget()
+        self.controls_layout = QHBoxLayout(self.controls_row)
+        self.controls_layout.setContentsMargins(0, 0, 0, 0)
+        self.controls_layout.setSpacing(8)
+
+        self.add_images_btn = QPushButton("Add Images...")
+        self.add_images_btn.clicked.connect(self._add_images_clicked)
+        self.remove_btn = QPushButton("Remove")
+        self.remove_btn.clicked.connect(self._remove_clicked)
+        self.clear_done_btn = QPushButton("Clear Finished")
+        self.clear_done_btn.clicked.connect(self._clear_finished_clicked)
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #6A7788; font-size: 12px;")
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setToolTip("Skips queued jobs; running jobs finish")
+        self.stop_btn.clicked.connect(self._stop_clicked)
+        self.start_btn = QPushButton("Start")
+        self.start_btn.setStyleSheet("background: #3B82F6;")
+        self.start_btn.clicked.connect(self._start_clicked)
+
+        self.controls_layout.addWidget(self.add_images_btn)
+        self.controls_layout.addWidget(self.remove_btn)
+        self.controls_layout.addWidget(self.clear_done_btn)
+        self.controls_layout.addWidget(self.summary_label, 1)
+        self.controls_layout.addWidget(self.stop_btn)
+        self.controls_layout.addWidget(self.start_btn)
+
+        self.batch_main_layout.addWidget(self.batch_indicator_label)
+        self.batch_main_layout.addWidget(self.batch_indicator_comment)
+        self.batch_main_layout.addWidget(self.queue_table, 1)
+        self.batch_main_layout.addWidget(self.assign_row)
+        self.batch_main_layout.addWidget(self.run_row)
+        self.batch_main_layout.addWidget(self.controls_row)
+
+        self.close_batch_btn = QPushButton(self.batch_main_)
+        self.close_batch_btn.setText("✕")
+        self.close_batch_btn.setGeometry(815, 15, 30, 30)
+        self.close_batch_btn.clicked.connect(lambda: self.switch_callback("home"))
+        self.close_batch_btn.setStyleSheet("""
+                    color: #FFFFFF;
+                    font-size: 16px;
+                    background: transparent;
+                    border: none;
+                """)
+
+        self._update_summary()
+
+    # --- Adding images ---
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if paths:
+            event.acceptProposedAction()
+            self._add_paths(paths)
+
+    def _add_images_clicked(self):
+        """Opens a file dialog to add images to the queue."""
+        patterns = " ".join(f"*{extension}" for extension in LOSSLESS_EXTENSIONS)
+        paths, _ = QFileDialog.getOpenFileNames(self, "Add Images", "", f"Lossless Images ({patterns})")
+        self._add_paths(paths)
+
+    def _add_paths(self, paths: list):
+        """
+        Queues images, and the images inside any folders (recursively). Unsupported files and
+        images already queued are skipped. Each image's mode is detected on a worker thread.
+        """
+        queued = {os.path.abspath(entry.job.image_path) for entry in self.entries}
+        found = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    found.extend(os.path.join(root, name) for name in sorted(files))
+            else:
+                found.append(path)
+
+        skipped = 0
+        for path in found:
+            if not is_lossless_path(path) or os.path.abspath(path) in queued:
+                skipped += 1
+                continue
+            queued.add(os.path.abspath(path))
+            entry = QueueEntry(BatchJob(path))
+            self.entries.append(entry)
+            self.queue_table.insertRow(self.queue_table.rowCount())
+            self._refresh_row(entry)
+            run_in_background(detect_mode, self.stego, path,
+                              on_result=lambda mode, entry=entry: self._mode_detected(entry, mode),
+                              on_error=lambda message, entry=entry: self._job_failed(entry, message))
+        self._update_summary(f"Skipped {skipped} unsupported or already queued file(s)." if skipped else "")
+
+    def _mode_detected(self, entry: QueueEntry, mode: str):
+        """Records the detected mode of a queued image, unless the user has already picked one."""
+        if entry not in self.entries:
+            return
+        if entry.job.mode is None:
+            entry.job.mode = mode
+        entry.status = STATUS_READY if entry.job.is_ready() else STATUS_NEEDS_INPUT
+        self._refresh_row(entry)
+        self._update_summary()
+
+    # --- Assigning payloads and passwords ---
+
+    def _choose_payload_file(self):
+        """Picks the file to embed; clears any text payload."""
+        path, _ = QFileDialog.getOpenFileName(self, "Select Payload File", "", "All Files (*.*)")
+        if path:
+            self.payload_path = path
+            self.payload_file_label.setText(os.path.basename(path))
+            self.payload_file_label.setToolTip(path)
+            self.payload_text_input.blockSignals(True)
+            self.payload_text_input.clear()
+            self.payload_text_input.blockSignals(False)
+
+    def _payload_text_changed(self, text: str):
+        """Typing a text payload replaces a chosen file."""
+        if text and self.payload_path is not None:
+            self.payload_path = None
+            self.payload_file_label.setText("No file")
+            self.payload_file_label.setToolTip("")
+
+    def _selected_entries(self) -> list:
+        """Entries of the selected rows, or all entries if none are selected."""
+        rows = sorted({index.row() for index in self.queue_table.selectionModel().selectedRows()})
+        return [self.entries[row] for row in rows] if rows else list(self.entries)
+
+    def _apply_clicked(self):
+        """Assigns the payload, password and mode to the selected jobs that aren't queued or running."""
+        password = self.batch_password_input.text()
+        text = self.payload_text_input.text()
+        mode = self.mode_selector.currentData()
+        for entry in self._selected_entries():
+            if entry.status in (STATUS_QUEUED, STATUS_RUNNING):
+                continue
+            job = entry.job
+            if mode is not None:
+                job.mode = mode
+            if password:
+                job.password = password
+            if self.payload_path is not None:
+                job.payload_path, job.payload_text = self.payload_path, None
+            elif text:
+                job.payload_path, job.payload_text = None, text
+            if job.mode is not None:  # Otherwise it is still being detected, or couldn't be read
+                entry.status = STATUS_READY if job.is_ready() else STATUS_NEEDS_INPUT
+                entry.error = None
+            self._refresh_row(entry)
+        self._update_summary()
+
+    # --- Settings ---
+
+    def _choose_output_dir(self):
+        """Picks the folder stego images and extracted payloads are written to."""
+        path = QFileDialog.getExistingDirectory(self, "Select Output Folder", self.output_dir)
+        if path:
+            self.output_dir = path
+            self._show_output_dir()
+
+    def _show_output_dir(self):
+        self.output_dir_label.setText(os.path.basename(self.output_dir.rstrip(os.sep)) or self.output_dir)
+        self.output_dir_label.setToolTip(self.output_dir)
+
+    def _engine_changed(self):
+        """Switches the engine that later embed jobs use; queued jobs keep theirs."""
+        self.stego = create_engine(self.engine_selector.currentData())
+        self.stego.enable_payload_cache()
+
+    # --- Running ---
+
+    def _start_clicked(self):
+        """Queues every ready job (including failed and stopped ones) on the worker pool."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+        except OSError as e:
+            self._update_summary(f"Can't create the output folder: {e}")
+            return
+
+        runnable = [entry for entry in self.entries
+                    if entry.status in (STATUS_READY, STATUS_FAILED, STATUS_STOPPED) and entry.job.is_ready()]
+        if not runnable:
+            self._update_summary("Nothing to run: jobs need a password and, to embed, a payload.")
+            return
+        if not any(entry.status in (STATUS_QUEUED, STATUS_RUNNING) for entry in self.entries):
+            self.batch_started = time.perf_counter()  # A new batch; otherwise these join the current one
+            self.batch_seconds = 0.0
+            self.batch_bytes = 0
+
+        for entry in runnable:
+            entry.job.cancelled = False
+            entry.status, entry.stage, entry.progress = STATUS_QUEUED, "", 0.0
+            entry.result = entry.error = None
+            self._refresh_row(entry)
+            run_in_background(run_job, entry.job, self.stego, self.output_dir, pool=self.pool,
+                              on_progress=lambda stage, fraction, entry=entry: self._job_progress(entry, stage,
+                                                                                                  fraction),
+                              on_result=lambda result, entry=entry: self._job_done(entry, result),
+                              on_error=lambda message, entry=entry: self._job_failed(entry, message))
+        self._update_summary()
+
+    def _stop_clicked(self):
+        """Makes queued jobs skip their work. Jobs already running finish."""
+        for entry in self.entries:
+            if entry.status == STATUS_QUEUED:
+                entry.job.cancelled = True
+
+    def _job_progress(self, entry: QueueEntry, stage: str, fraction: float):
+        entry.status, entry.stage, entry.progress = STATUS_RUNNING, stage, fraction
+        if entry in self.entries:
+            self._refresh_row(entry)
+            self._update_summary()
+
+    def _job_done(self, entry: QueueEntry, result: dict):
+        if result is None:  # Stopped before it started
+            entry.status, entry.progress = STATUS_STOPPED, 0.0
+        else:
+            entry.status, entry.result, entry.progress = STATUS_DONE, result, 1.0
+            self.batch_bytes += result["bytes"]
+            self.batch_seconds = time.perf_counter() - self.batch_started
+        if entry in self.entries:
+            self._refresh_row(entry)
+            self._update_summary()
+
+    def _job_failed(self, entry: QueueEntry, message: str):
+        entry.status, entry.error = STATUS_FAILED, message
+        if entry in self.entries:
+            self._refresh_row(entry)
+            self._update_summary()
+
+    # --- Removing jobs ---
+
+    def _remove_clicked(self):
+        """Removes the selected jobs, except those queued or running."""
+        rows = sorted({index.row() for index in self.queue_table.selectionModel().selectedRows()})
+        for row in reversed(rows):
+            if self.entries[row].status not in (STATUS_QUEUED, STATUS_RUNNING):
+                self._remove_row(row)
+        self._update_summary()
+
+    def _clear_finished_clicked(self):
+        """Removes the jobs that are done."""
+        for row in reversed(range(len(self.entries))):
+            if self.entries[row].status == STATUS_DONE:
+                self._remove_row(row)
+        if not any(entry.status in (STATUS_QUEUED, STATUS_RUNNING) for entry in self.entries):
+            self.stego.forget_payloads()
+        self._update_summary()
+
+    def _remove_row(self, row: int):
+        del self.entries[row]
+        self.queue_table.removeRow(row)
+
+    # --- Display ---
+
+    def _refresh_row(self, entry: QueueEntry):
+        """Redraws an entry's row."""
+        row = self.entries.index(entry)
+        job = entry.job
+
+        if job.payload_path is not None:
+            payload = os.path.basename(job.payload_path)
+        elif job.payload_text:
+            payload = f'"{job.payload_text[:40]}"'
+        else:
+            payload = ""
+        status = entry.stage if entry.status == STATUS_RUNNING else entry.status
+        if entry.status == STATUS_NEEDS_INPUT:
+            details = "Assign a password" + ("" if job.mode == EXTRACT else " and a payload")
+        elif entry.error:
+            details = entry.error
+        elif entry.result:
+            details = os.path.basename(entry.result["output_path"])
+        else:
+            details = ""
+        speed = ""
+        if entry.result and entry.result["seconds"] > 0:
+            speed = _format_rate(entry.result["bytes"] / entry.result["seconds"])
+
+        cells = {
+            COLUMN_IMAGE: (os.path.basename(job.image_path), job.image_path),
+            COLUMN_MODE: (MODE_LABELS.get(job.mode, ""), None),
+            COLUMN_PAYLOAD: (payload if job.mode != EXTRACT else "", None),
+            COLUMN_STATUS: (status, None),
+            COLUMN_SPEED: (speed, None),
+            COLUMN_DETAILS: (details, entry.result["output_path"] if entry.result else details),
+        }
+        for column, (text, tooltip) in cells.items():
+            item = self.queue_table.item(row, column)
+            if item is None:
+                item = QTableWidgetItem()
+                self.queue_table.setItem(row, column, item)
+            item.setText(text)
+            item.setToolTip(tooltip or text)
+        self.queue_table.item(row, COLUMN_STATUS).setForeground(QColor(STATUS_COLOURS.get(entry.status, "white")))
+
+        bar = self.queue_table.cellWidget(row, COLUMN_PROGRESS)
+        if bar is None:
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setTextVisible(False)
+            bar.setFixedHeight(8)
+            bar.setStyleSheet("QProgressBar { background: #1F2328; border: none; border-radius: 4px; }"
+                              "QProgressBar::chunk { background: #3B82F6; border-radius: 4px; }")
+            holder = QWidget()
+            holder_layout = QVBoxLayout(holder)
+            holder_layout.setContentsMargins(6, 0, 6, 0)
+            holder_layout.addWidget(bar)
+            self.queue_table.setCellWidget(row, COLUMN_PROGRESS, holder)
+        else:
+            bar = bar.findChild(QProgressBar)
+        bar.setValue(round(entry.progress * 100))
+
+    def _update_summary(self, note: str = ""):
+        """Shows the queue totals and the current batch's throughput, plus an optional note."""
+        counts = {}
+        for entry in self.entries:
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+        parts = [f"{counts.get(STATUS_DONE, 0)} of {len(self.entries)} done"]
+        active = counts.get(STATUS_RUNNING, 0) + counts.get(STATUS_QUEUED, 0)
+        if active:
+            parts.append(f"{active} in progress")
+        if counts.get(STATUS_FAILED):
+            parts.append(f"{counts[STATUS_FAILED]} failed")
+        if self.batch_bytes and self.batch_seconds > 0:
+            parts.append(_format_rate(self.batch_bytes / self.batch_seconds))
+        if note:
+            parts.append(note)
+        self.summary_label.setText(" · ".join(parts))
+        self.start_btn.setEnabled(bool(self.entries))
+        self.stop_btn.setEnabled(active > 0)
@@ -1,18 +1,20 @@
 import os
+import shutil
+import tempfile
 from PySide6.QtGui import QPixmap, QIcon, QClipboard
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QProgressBar, QGroupBox,
-    QStackedWidget, QLineEdit, QFileDialog, QMessageBox, QApplication, QTextEdit
+    QStackedWidget, QLineEdit, QFileDialog, QMessageBox, QApplication
 )
 from PySide6.QtCore import Qt, QSize, QByteArray
+from . import assets
 from .base_widget import BaseWidget
+from .paged_text import PagedTextView
+from .previews import request_preview
+from .workers import run_in_background
 
 # Import the backend steganography module
-from backend.steganography import DCTSteganography
-
-# Get absolute path to assets
-BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ASSETS_PATH = os.path.join(BASE_PATH, "assets")
+from backend.engines import create_engine
 
 
 class DecryptionScreen(BaseWidget):
@@ -22,12 +24,22 @@ class DecryptionScreen(BaseWidget):
 
         # --- Instance variables for decryption state ---
         self.stego_image_path = None
-        self.decrypted_raw_data = None  # Stores decrypted bytes (either text or file)
+        self.decrypted_raw_data = None  # Decrypted text short enough to keep in memory
+        self.decrypted_path = None  # File holding a decrypted file, or text too long to keep in memory
+        self.decrypted_path_is_spill = False  # True while decrypted_path is our temporary file
         self.decrypted_is_text = False  # Flag: True if content is text, False if binary file
         self.suggested_filename = "extracted_content"  # Base name for downloaded files
 
-        # Initialize the DCTSteganography backend
-        self.stego = DCTSteganography()
+        # Extracted files are decoded straight into this private directory and moved out when
+        # saved, so the GUI never holds them in memory. It is removed when the app exits.
+        self.spill_dir = tempfile.TemporaryDirectory(prefix="stego-extract-")
+
+        # Initialize the backend. Any engine reads images from every engine (the header names the
+        # one that made it). Keep the extracted ciphertext between attempts so retrying after a
+        # mistyped password doesn't re-extract the image.
+        self.stego = create_engine()
+        self.stego.enable_ciphertext_cache(max_entries=2)
+        self.stego.spill_text_bytes = PagedTextView.PAGE_BYTES  # Longer text is paged from its spill file
 
         self.init_ui()
 
@@ -91,8 +103,7 @@ class DecryptionScreen(BaseWidget):
         self.decrypt_dropbox_inner_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.upload_label = QLabel(self.decrypt_dropbox_inner)
-        logo_pixmap = QPixmap(os.path.join(ASSETS_PATH, "upload-icon-3.png")).scaled(
-            25, 25, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        logo_pixmap = assets.pixmap("upload-icon-3.png", 25, 25)
         self.upload_label.setPixmap(logo_pixmap)
         self.upload_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -144,7 +155,7 @@ class DecryptionScreen(BaseWidget):
         self.delete_img_btn = QPushButton(self.decrypt_dropbox_confirm)
         self.delete_img_btn.setFixedSize(150, 25)
         self.delete_img_btn.setText("  Clear Upload")
-        self.delete_img_btn.setIcon(QPixmap(os.path.join(ASSETS_PATH, "delete_icon.png")).scaled(12, 12))
+        self.delete_img_btn.setIcon(assets.icon("delete_icon.png"))
         self.delete_img_btn.setIconSize(QSize(12, 12))
         self.delete_img_btn.clicked.connect(self._clear_stego_image)
         self.delete_img_btn.setStyleSheet("""
@@ -181,7 +192,7 @@ class DecryptionScreen(BaseWidget):
         self.decrypt_password_input.setEchoMode(QLineEdit.EchoMode.Password)
 
         self.decrypt_toggle_eye = QPushButton()
-        self.decrypt_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+        self.decrypt_toggle_eye.setIcon(assets.icon("show.png"))
         self.decrypt_toggle_eye.setIconSize(QSize(25, 25))
         self.decrypt_toggle_eye.setStyleSheet("background: transparent; border: none;")
         self.decrypt_toggle_eye.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -247,8 +258,7 @@ class DecryptionScreen(BaseWidget):
         self.decrypt_main_stack.addWidget(self.decrypt_main_2)
 
         self.success_label = QLabel()
-        logo_pixmap = QPixmap(os.path.join(ASSETS_PATH, "Group.png")).scaled(
-            75, 75, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        logo_pixmap = assets.pixmap("Group.png", 75, 75)
         self.success_label.setPixmap(logo_pixmap)
         self.success_label.setStyleSheet("border: none;")
         self.success_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -263,11 +273,10 @@ class DecryptionScreen(BaseWidget):
         self.decrypt_indicator_comment2.setStyleSheet("color: #6A7788; font-size: 12px; border: none;")
         self.decrypt_indicator_comment2.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.decrypted_text_edit = QTextEdit()
-        self.decrypted_text_edit.setFixedSize(270, 140)
-        self.decrypted_text_edit.setReadOnly(True)
-        self.decrypted_text_edit.setStyleSheet("""
-                    QTextEdit {
+        self.decrypted_text_view = PagedTextView()
+        self.decrypted_text_view.setFixedSize(270, 140)
+        self.decrypted_text_view.setStyleSheet("""
+                    QPlainTextEdit {
                         background: black;
                         color: white;
                         border: 1px solid grey;
@@ -275,7 +284,7 @@ class DecryptionScreen(BaseWidget):
                         border-radius: 0px;
                     }
                 """)
-        self.decrypted_text_edit.setPlaceholderText("Decrypted content will appear here...")
+        self.decrypted_text_view.setPlaceholderText("Decrypted content will appear here...")
 
         self.result_action_btn = QPushButton("Action Button")
         self.result_action_btn.setFixedSize(120, 35)
@@ -312,13 +321,13 @@ class DecryptionScreen(BaseWidget):
         self.decrypt_main_layout2.addWidget(self.success_label, alignment=Qt.AlignmentFlag.AlignCenter)
         self.decrypt_main_layout2.addWidget(self.decrypt_indicator_label2, alignment=Qt.AlignmentFlag.AlignCenter)
         self.decrypt_main_layout2.addWidget(self.decrypt_indicator_comment2, alignment=Qt.AlignmentFlag.AlignCenter)
-        self.decrypt_main_layout2.addWidget(self.decrypted_text_edit, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.decrypt_main_layout2.addWidget(self.decrypted_text_view, alignment=Qt.AlignmentFlag.AlignCenter)
         self.decrypt_main_layout2.addWidget(self.result_action_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         self.decrypt_main_layout2.addWidget(self.back_home_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.close_result_btn = QPushButton(self.decrypt_main_2)
         self.close_result_btn.setGeometry(25, 20, 30, 30)
-        self.close_result_btn.setIcon(QPixmap(os.path.join(ASSETS_PATH, "arrow_left.png")))
+        self.close_result_btn.setIcon(assets.icon("arrow_left.png"))
         self.close_result_btn.setIconSize(QSize(16, 16))
         self.close_result_btn.clicked.connect(lambda: self.switch_decryption_section(0))
         self.close_result_btn.setStyleSheet("""
@@ -337,35 +346,44 @@ class DecryptionScreen(BaseWidget):
     def _select_stego_image(self):
         """Opens a file dialog to select the stego image (PNG/JPEG) for decryption."""
         file_dialog = QFileDialog(self)
-        file_dialog.setNameFilter("Stego Images (*.png *.jpg *.jpeg)")
+        file_dialog.setNameFilter("Stego Images (*.png *.tif *.tiff *.bmp *.webp *.jpg *.jpeg)")
         file_dialog.setWindowTitle("Select Stego Image")
         file_dialog.setFileMode(QFileDialog.ExistingFile)
 
         if file_dialog.exec():
             selected_files = file_dialog.selectedFiles()
             if selected_files:
+                self.stego.forget_ciphertext()  # Drop what was gathered from the previous image
                 self.stego_image_path = selected_files[0]
 
-                pixmap = QPixmap(self.stego_image_path)
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(
-                        self.cover_img_label.size(),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.cover_img_label.setPixmap(scaled_pixmap)
-                    self.comfirm_img_label.setText("Stego Image Selected!")
-                    self.selected_cover_filename_label.setText(os.path.basename(self.stego_image_path))
-                    self.decrypt_box_stack.setCurrentIndex(1)
-                else:
-                    QMessageBox.warning(self, "Image Error", "Could not load selected image.")
-                    self._clear_stego_image()
+                # The preview is decoded at label size on a worker thread; show the selection now
+                self.cover_img_label.clear()
+                self.comfirm_img_label.setText("Loading preview...")
+                self.selected_cover_filename_label.setText(os.path.basename(self.stego_image_path))
+                self.decrypt_box_stack.setCurrentIndex(1)
+                path = self.stego_image_path
+                request_preview(path, self.cover_img_label.size(), self.devicePixelRatioF(),
+                                on_ready=lambda pixmap: self._show_stego_preview(path, pixmap),
+                                on_error=lambda message: self._stego_preview_failed(path, message))
             else:
                 self._clear_stego_image()
 
+    def _show_stego_preview(self, path: str, pixmap: QPixmap):
+        """Shows a decoded preview, unless another image has been selected since."""
+        if path == self.stego_image_path:
+            self.cover_img_label.setPixmap(pixmap)
+            self.comfirm_img_label.setText("Stego Image Selected!")
+
+    def _stego_preview_failed(self, path: str, message: str):
+        """Reports an unreadable image and resets the selection, if it is still the current one."""
+        if path == self.stego_image_path:
+            QMessageBox.warning(self, "Image Error", f"Could not load selected image: {message}")
+            self._clear_stego_image()
+
     def _clear_stego_image(self):
         """Clears the selected stego image and resets UI."""
         self.stego_image_path = None
+        self.stego.forget_ciphertext()
         self.cover_img_label.clear()
         self.comfirm_img_label.setText("Upload Completed")
         self.selected_cover_filename_label.setText("")
@@ -375,10 +393,10 @@ class DecryptionScreen(BaseWidget):
         """Toggles visibility of the decryption password."""
         if self.decrypt_password_input.echoMode() == QLineEdit.EchoMode.Password:
             self.decrypt_password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-            self.decrypt_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "hide_.png")))
+            self.decrypt_toggle_eye.setIcon(assets.icon("hide_.png"))
         else:
             self.decrypt_password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.decrypt_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+            self.decrypt_toggle_eye.setIcon(assets.icon("show.png"))
 
     def _decrypt_image_clicked(self):
         """
@@ -393,47 +411,72 @@ class DecryptionScreen(BaseWidget):
             QMessageBox.warning(self, "Missing Input", "Please enter a decryption password.")
             return
 
-        QMessageBox.information(self, "Decrypting...",
-                                f"Attempting to decrypt data from: {os.path.basename(self.stego_image_path)}\n"
-                                f"Using provided password."
-                                )
-        try:
-            # Call the backend extract_data function
-            # This returns a dictionary with 'type', 'content', 'filename', 'file_extension'
-            result = self.stego.extract_data(self.stego_image_path, password)
-            self.decrypted_raw_data = result[self.stego.METADATA_KEY_CONTENT]  # Get the content (str or bytes)
-
-            if result[self.stego.METADATA_KEY_TYPE] == self.stego.TEXT_TYPE:
-                self.decrypted_text_edit.setText(self.decrypted_raw_data)  # Content is already string for text
-                self.decrypted_is_text = True
-                self.result_action_btn.setText("Copy Text")
-            elif result[self.stego.METADATA_KEY_TYPE] == self.stego.FILE_TYPE:
-                # Content is bytes for files
-                self.decrypted_text_edit.setText(
-                    "Binary file detected. Click 'Save File' to download.\n"
-                    f"File size: {len(self.decrypted_raw_data)} bytes."
-                )
-                self.decrypted_is_text = False
-                self.result_action_btn.setText("Save File")
-                # Update suggested filename from metadata
-                if self.stego.METADATA_KEY_FILENAME in result:
-                    self.suggested_filename = result[self.stego.METADATA_KEY_FILENAME]
-                elif self.stego.METADATA_KEY_FILEEXT in result:
-                    # If only extension is available, combine with base image name
-                    base_name = os.path.splitext(os.path.basename(self.stego_image_path))[0]
-                    self.suggested_filename = f"{base_name}{result[self.stego.METADATA_KEY_FILEEXT]}"
-                else:
-                    self.suggested_filename = "extracted_content"  # Fallback
+        # Extract on a worker thread so the window stays responsive; files and long text come
+        # back as a file in spill_dir rather than in memory
+        self._clear_decryption_results()  # Drops the previous result's spill file
+        self.decrypt_img_btn.setEnabled(False)
+        self.decrypt_img_btn.setText("Decrypting...")
+        self.decrypt_progress.setRange(0, 0)  # Busy indicator
+        path = self.stego_image_path
+        run_in_background(self.stego.extract_data, path, password, spill_dir=self.spill_dir.name,
+                          on_result=lambda result: self._show_decryption_result(path, result),
+                          on_error=lambda message: self._decryption_failed(path, message))
+
+    def _decryption_finished(self):
+        """Re-enables the decrypt button once an extraction is over."""
+        self.decrypt_img_btn.setEnabled(True)
+        self.decrypt_img_btn.setText("</> Decrypt Image")
+        self.decrypt_progress.setRange(0, 100)
+        self.decrypt_progress.setValue(0)
+
+    def _show_decryption_result(self, path: str, result: dict):
+        """Shows an extraction result, unless another image has been selected since."""
+        self._decryption_finished()
+        spilled = result.get(self.stego.METADATA_KEY_CONTENT_PATH)
+        if path != self.stego_image_path:
+            if spilled is not None:
+                try:
+                    os.remove(spilled)
+                except OSError:
+                    pass  # The spill directory is removed at exit anyway
+            return
 
-            self.switch_decryption_section(1)  # Show results section
+        # The result dictionary has 'type', 'content' or 'content_path', 'filename', 'file_extension'
+        self.decrypted_raw_data = result.get(self.stego.METADATA_KEY_CONTENT)
+        self.decrypted_path = spilled
+        self.decrypted_path_is_spill = spilled is not None
 
-        except ValueError as ve:  # Catch errors from backend (e.g., wrong password, corrupted data, image issues)
-            QMessageBox.critical(self, "Decryption Error", f"Decryption failed: {ve}")
-            self._clear_decryption_results()
-        except Exception as e:  # Catch other unexpected errors
-            QMessageBox.critical(self, "Extraction Error",
-                                 f"An unexpected error occurred during extraction or decryption: {e}")
-            self._clear_decryption_results()
+        if result[self.stego.METADATA_KEY_TYPE] == self.stego.TEXT_TYPE:
+            if self.decrypted_path is not None:
+                self.decrypted_text_view.open_file(self.decrypted_path)  # Read a page at a time
+            else:
+                self.decrypted_text_view.set_text(self.decrypted_raw_data)
+            self.decrypted_is_text = True
+            self.result_action_btn.setText("Copy Text")
+        elif result[self.stego.METADATA_KEY_TYPE] == self.stego.FILE_TYPE:
+            self.decrypted_text_view.set_text(
+                "Binary file detected. Click 'Save File' to download.\n"
+                f"File size: {os.path.getsize(self.decrypted_path)} bytes."
+            )
+            self.decrypted_is_text = False
+            self.result_action_btn.setText("Save File")
+            # Update suggested filename from metadata
+            if self.stego.METADATA_KEY_FILENAME in result:
+                self.suggested_filename = result[self.stego.METADATA_KEY_FILENAME]
+            elif self.stego.METADATA_KEY_FILEEXT in result:
+                # If only extension is available, combine with base image name
+                base_name = os.path.splitext(os.path.basename(self.stego_image_path))[0]
+                self.suggested_filename = f"{base_name}{result[self.stego.METADATA_KEY_FILEEXT]}"
+            else:
+                self.suggested_filename = "extracted_content"  # Fallback
+
+        self.switch_decryption_section(1)  # Show results section
+
+    def _decryption_failed(self, path: str, message: str):
+        """Reports a failed extraction (e.g. wrong password, corrupted data), if still relevant."""
+        self._decryption_finished()
+        if path == self.stego_image_path:
+            QMessageBox.critical(self, "Decryption Error", f"Decryption failed: {message}")
 
     def _handle_result_action(self):
         """Routes the action button click based on content type (copy text or save file)."""
@@ -444,10 +487,14 @@ class DecryptionScreen(BaseWidget):
 
     def _copy_decrypted_text(self):
         """Copies the decrypted text to the clipboard."""
-        if self.decrypted_is_text and self.decrypted_raw_data:
+        if self.decrypted_is_text and (self.decrypted_raw_data or self.decrypted_path):
             try:
-                # Ensure it's decoded to a string for clipboard
-                text_to_copy = self.decrypted_raw_data
+                # Long text is only on disk; the clipboard needs all of it
+                if self.decrypted_path is not None:
+                    with open(self.decrypted_path, 'r', encoding='utf-8', errors='replace') as f:
+                        text_to_copy = f.read()
+                else:
+                    text_to_copy = self.decrypted_raw_data
                 clipboard = QApplication.clipboard()
                 clipboard.setText(text_to_copy)
                 QMessageBox.information(self, "Copied", "Decrypted text copied to clipboard!")
@@ -458,14 +505,18 @@ class DecryptionScreen(BaseWidget):
 
     def _download_decrypted_file(self):
         """Saves the decrypted file content to a user-specified location."""
-        if not self.decrypted_is_text and self.decrypted_raw_data:
+        if not self.decrypted_is_text and self.decrypted_path:
             save_path, _ = QFileDialog.getSaveFileName(self, "Save Decrypted File", self.suggested_filename,
                                                        "All Files (*.*)")
 
             if save_path:
                 try:
-                    with open(save_path, 'wb') as f:
-                        f.write(self.decrypted_raw_data)
+                    if self.decrypted_path_is_spill:
+                        # A rename when the target is on the same disk; later saves copy the saved file
+                        shutil.move(self.decrypted_path, save_path)
+                        self.decrypted_path, self.decrypted_path_is_spill = save_path, False
+                    elif os.path.abspath(save_path) != os.path.abspath(self.decrypted_path):
+                        shutil.copyfile(self.decrypted_path, save_path)
                     QMessageBox.information(self, "Download Complete", f"File saved successfully to:\n{save_path}")
                 except Exception as e:
                     QMessageBox.critical(self, "Save Error", f"Failed to save file: {e}")
@@ -476,10 +527,17 @@ class DecryptionScreen(BaseWidget):
 
     def _clear_decryption_results(self):
         """Clears the decryption results and resets UI for next decryption."""
+        if self.decrypted_path_is_spill:
+            try:
+                os.remove(self.decrypted_path)
+            except OSError:
+                pass  # Already gone; the spill directory is removed at exit anyway
         self.decrypted_raw_data = None
+        self.decrypted_path = None
+        self.decrypted_path_is_spill = False
         self.decrypted_is_text = False
-        self.decrypted_text_edit.clear()
-        self.decrypted_text_edit.setPlaceholderText("Decrypted content will appear here...")
+        self.decrypted_text_view.clear()
+        self.decrypted_text_view.setPlaceholderText("Decrypted content will appear here...")
         self.result_action_btn.setText("Action Button")  # Reset button text to default (or hide it initially)
         self.suggested_filename = "extracted_content"  # Reset suggested filename
 
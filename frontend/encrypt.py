@@ -4,17 +4,35 @@ from PySide6.QtGui import QPixmap, QIcon
 from PySide6.QtLocation import QPlaceIcon  # This might not be needed, consider removing if not used later
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QProgressBar, QGroupBox,
-    QStackedWidget, QLineEdit, QButtonGroup, QTextEdit, QFileDialog, QMessageBox
+    QStackedWidget, QLineEdit, QButtonGroup, QPlainTextEdit, QFileDialog, QMessageBox, QComboBox
 )
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QTimer
+from . import assets
 from .base_widget import BaseWidget
+from .previews import request_preview
+from .workers import run_in_background
 
-# Import the backend steganography module
-from backend.steganography import DCTSteganography
+# Import the backend embedding engines
+from backend.engines import DEFAULT_ENGINE, available_engines, create_engine
+from backend.estimate import PayloadSizeEstimator
 
-# Get absolute path to assets
-BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ASSETS_PATH = os.path.join(BASE_PATH, "assets")
+# Labels for the engine selector; engines without one are shown by name
+ENGINE_LABELS = {
+    "dct": "DCT (robust)",
+    "lsb": "Spatial LSB (fast, high capacity)",
+}
+
+# Quiet time after the last edit before the capacity meter is recomputed
+CAPACITY_DEBOUNCE_MS = 300
+
+
+def _format_size(num_bytes: int) -> str:
+    """Human-readable byte count."""
+    if num_bytes < 1024:
+        return f"{num_bytes} Bytes"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.2f} KB"
+    return f"{num_bytes / (1024 * 1024):.2f} MB"
 
 
 class EncryptionScreen(BaseWidget):
@@ -29,8 +47,19 @@ class EncryptionScreen(BaseWidget):
         self.secret_file_content = None  # Stores content as bytes
         # ----------------------------------------------------
 
-        # Initialize the DCTSteganography backend
-        self.stego = DCTSteganography()
+        # Initialize the embedding engine (switchable from the engine selector). Keep the last
+        # compressed secrets, so embedding the same one into another cover skips compressing it.
+        self.stego = create_engine(DEFAULT_ENGINE)
+        self.stego.enable_payload_cache(max_entries=2)
+
+        # Capacity meter: recomputed on a worker thread once edits pause. Each request gets a
+        # new generation number so results of superseded requests are dropped.
+        self.payload_estimator = PayloadSizeEstimator(self.stego)
+        self.capacity_generation = 0
+        self.capacity_timer = QTimer(self)
+        self.capacity_timer.setSingleShot(True)
+        self.capacity_timer.setInterval(CAPACITY_DEBOUNCE_MS)
+        self.capacity_timer.timeout.connect(self._refresh_capacity_meter)
 
         self.init_ui()
 
@@ -94,8 +123,7 @@ class EncryptionScreen(BaseWidget):
         self.encrypt_dropbox_inner_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.upload_label = QLabel(self.encrypt_dropbox_inner)
-        logo_pixmap = QPixmap(os.path.join(ASSETS_PATH, "upload-icon-3.png")).scaled(  # Use ASSETS_PATH
-            25, 25, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        logo_pixmap = assets.pixmap("upload-icon-3.png", 25, 25)
         self.upload_label.setPixmap(logo_pixmap)
         self.upload_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -147,7 +175,7 @@ class EncryptionScreen(BaseWidget):
         self.delete_img_btn = QPushButton(self.encrypt_dropbox_confirm)
         self.delete_img_btn.setFixedSize(150, 25)
         self.delete_img_btn.setText("  Clear Upload")
-        self.delete_img_btn.setIcon(QPixmap(os.path.join(ASSETS_PATH, "delete_icon.png")).scaled(12, 12))
+        self.delete_img_btn.setIcon(assets.icon("delete_icon.png"))
         self.delete_img_btn.setIconSize(QSize(12, 12))
         self.delete_img_btn.clicked.connect(self._clear_cover_image)
         self.delete_img_btn.setStyleSheet("""
@@ -214,8 +242,8 @@ class EncryptionScreen(BaseWidget):
             "background: rgb(14, 14, 15); border: 1px solid #81C8FF; border-radius: 35px;")
         self.encrypt_main_layout2 = QVBoxLayout(self.encrypt_main_2)
         self.encrypt_main_layout2.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.encrypt_main_layout2.setSpacing(15)
-        self.encrypt_main_layout2.setContentsMargins(10, 50, 10, 20)
+        self.encrypt_main_layout2.setSpacing(10)  # Tighter than page 0: room for the engine selector and meter
+        self.encrypt_main_layout2.setContentsMargins(10, 45, 10, 15)
         self.encrypt_main_stack.addWidget(self.encrypt_main_2)
 
         # Title and description
@@ -285,6 +313,46 @@ class EncryptionScreen(BaseWidget):
         self.switch_group.addButton(self.btn_encode_text)
         self.switch_group.setExclusive(True)
 
+        # Engine selector
+        self.engine_selector = QComboBox(self.encrypt_main_2)
+        self.engine_selector.setFixedSize(250, 28)
+        self.engine_selector.setStyleSheet("""
+            QComboBox {
+                background: black;
+                color: white;
+                border: 1px solid #6A7788;
+                border-radius: 8px;
+                padding-left: 10px;
+                font-size: 12px;
+            }
+        """)
+        for engine_name in available_engines():
+            self.engine_selector.addItem(ENGINE_LABELS.get(engine_name, engine_name.upper()), engine_name)
+        self.engine_selector.setCurrentIndex(self.engine_selector.findData(DEFAULT_ENGINE))
+        self.engine_selector.currentIndexChanged.connect(self._engine_changed)
+
+        # Capacity meter: estimated payload size against the cover's capacity
+        self.capacity_meter = QWidget(self.encrypt_main_2)
+        self.capacity_meter.setFixedSize(250, 24)
+        self.capacity_meter.setStyleSheet("border: none; background: transparent;")
+        self.capacity_meter_layout = QVBoxLayout(self.capacity_meter)
+        self.capacity_meter_layout.setContentsMargins(0, 0, 0, 0)
+        self.capacity_meter_layout.setSpacing(3)
+
+        self.capacity_bar = QProgressBar(self.capacity_meter)
+        self.capacity_bar.setFixedSize(250, 5)
+        self.capacity_bar.setTextVisible(False)
+        self.capacity_bar.setRange(0, 1000)
+        self.capacity_bar.setValue(0)
+
+        self.capacity_label = QLabel(self.capacity_meter)
+        self.capacity_label.setStyleSheet("color: #6A7788; font-size: 10px;")
+        self.capacity_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.capacity_meter_layout.addWidget(self.capacity_bar)
+        self.capacity_meter_layout.addWidget(self.capacity_label)
+        self._show_capacity_state(0, "Add a document or text to see how much of the image it uses", False)
+
         self.content_stack = QStackedWidget(self.encrypt_main_2)
         self.content_stack.setFixedWidth(300)
         self.content_stack.setStyleSheet("border: none; border-radius: 0; background-color: transparent;")
@@ -315,8 +383,7 @@ class EncryptionScreen(BaseWidget):
         self.doc_upload_prompt_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.upload_label2 = QLabel(self.doc_upload_prompt_widget)
-        logo_pixmap = QPixmap(os.path.join(ASSETS_PATH, "upload-icon-3.png")).scaled(
-            25, 25, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        logo_pixmap = assets.pixmap("upload-icon-3.png", 25, 25)
         self.upload_label2.setPixmap(logo_pixmap)
         self.upload_label2.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -349,7 +416,7 @@ class EncryptionScreen(BaseWidget):
         self.doc_selected_info_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.doc_icon_label = QLabel(self.doc_selected_info_widget)
-        self.doc_icon_label.setPixmap(QPixmap(os.path.join(ASSETS_PATH, "file_icon.png")).scaled(40, 40))
+        self.doc_icon_label.setPixmap(assets.pixmap("file_icon.png", 40, 40))
         self.doc_icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.doc_filename_label = QLabel(self.doc_selected_info_widget)
@@ -371,7 +438,7 @@ class EncryptionScreen(BaseWidget):
                 border: none;
             }
         """)
-        self.doc_clear_btn.setIcon(QPixmap(os.path.join(ASSETS_PATH, "delete_icon.png")).scaled(12, 12))
+        self.doc_clear_btn.setIcon(assets.icon("delete_icon.png"))
         self.doc_clear_btn.setIconSize(QSize(12, 12))
         self.doc_clear_btn.clicked.connect(self._clear_document_file)
 
@@ -401,7 +468,7 @@ class EncryptionScreen(BaseWidget):
         self.doc_password_input.setEchoMode(QLineEdit.EchoMode.Password)
 
         self.doc_toggle_eye = QPushButton()
-        self.doc_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+        self.doc_toggle_eye.setIcon(assets.icon("show.png"))
         self.doc_toggle_eye.setIconSize(QSize(25, 25))
         self.doc_toggle_eye.setStyleSheet("background: transparent; border: none;")
         self.doc_toggle_eye.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -438,11 +505,11 @@ class EncryptionScreen(BaseWidget):
         self.text_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.text_layout.setSpacing(15)
 
-        # Text edit area
-        self.text_edit = QTextEdit()
+        # Text edit area (plain text, which stays responsive with megabytes pasted in)
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setFixedSize(270, 140)
         self.text_edit.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: black;
                 color: white;
                 border: 1px solid grey;
@@ -450,7 +517,7 @@ class EncryptionScreen(BaseWidget):
             }
         """)
         self.text_edit.setPlaceholderText("Enter text to embed here...")
-        self.text_edit.textChanged.connect(self._update_secret_text)
+        self.text_edit.textChanged.connect(self._schedule_capacity_update)
 
         # Password input for text
         self.text_password_frame = QWidget()
@@ -472,7 +539,7 @@ class EncryptionScreen(BaseWidget):
         self.text_password_input.setEchoMode(QLineEdit.EchoMode.Password)
 
         self.text_toggle_eye = QPushButton()
-        self.text_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+        self.text_toggle_eye.setIcon(assets.icon("show.png"))
         self.text_toggle_eye.setIconSize(QSize(25, 25))
         self.text_toggle_eye.setStyleSheet("background: transparent; border: none;")
         self.text_toggle_eye.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -513,6 +580,7 @@ class EncryptionScreen(BaseWidget):
                 self.content_stack.setCurrentIndex(0)
             else:
                 self.content_stack.setCurrentIndex(1)
+            self._schedule_capacity_update()
 
         self.btn_encode_doc.clicked.connect(switch_mode)
         self.btn_encode_text.clicked.connect(switch_mode)
@@ -526,11 +594,13 @@ class EncryptionScreen(BaseWidget):
         self.encrypt_main_layout2.addWidget(self.encrypt_indicator_comment2, alignment=Qt.AlignmentFlag.AlignCenter)
         self.encrypt_main_layout2.addWidget(self.encrypt_progress2, alignment=Qt.AlignmentFlag.AlignCenter)
         self.encrypt_main_layout2.addWidget(self.file_text_switch, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.encrypt_main_layout2.addWidget(self.engine_selector, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.encrypt_main_layout2.addWidget(self.capacity_meter, alignment=Qt.AlignmentFlag.AlignCenter)
         self.encrypt_main_layout2.addWidget(self.content_stack, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.close_encrypt_btn = QPushButton(self.encrypt_main_2)
         self.close_encrypt_btn.setGeometry(25, 20, 30, 30)
-        self.close_encrypt_btn.setIcon(QPixmap(os.path.join(ASSETS_PATH, "arrow_left.png")))
+        self.close_encrypt_btn.setIcon(assets.icon("arrow_left.png"))
         self.close_encrypt_btn.setIconSize(QSize(16, 16))
         self.close_encrypt_btn.clicked.connect(lambda: self.switch_encryption_section(0))
         self.close_encrypt_btn.setStyleSheet("""
@@ -539,6 +609,12 @@ class EncryptionScreen(BaseWidget):
                     border: none;
                 """)
 
+    def _engine_changed(self, index: int):
+        """Switches the embedding engine to the one picked in the selector."""
+        self.stego = create_engine(self.engine_selector.itemData(index))
+        self.stego.enable_payload_cache(max_entries=2)
+        self._schedule_capacity_update()
+
     def switch_image_selector(self, index: int):
         """Switches the stacked widget for cover image display."""
         self.encrypt_box_stack.setCurrentIndex(index)
@@ -559,23 +635,31 @@ class EncryptionScreen(BaseWidget):
             if selected_files:
                 self.cover_image_path = selected_files[0]
 
-                pixmap = QPixmap(self.cover_image_path)
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaled(
-                        self.cover_img_label.size(),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.cover_img_label.setPixmap(scaled_pixmap)
-                    self.comfirm_img_label.setText("Image Selected!")
-                    self.selected_cover_filename_label.setText(os.path.basename(self.cover_image_path))
-                    self.switch_image_selector(1)
-                else:
-                    QMessageBox.warning(self, "Image Error", "Could not load selected image.")
-                    self._clear_cover_image()
+                # The preview is decoded at label size on a worker thread; show the selection now
+                self.cover_img_label.clear()
+                self.comfirm_img_label.setText("Loading preview...")
+                self.selected_cover_filename_label.setText(os.path.basename(self.cover_image_path))
+                self.switch_image_selector(1)
+                self._schedule_capacity_update()
+                path = self.cover_image_path
+                request_preview(path, self.cover_img_label.size(), self.devicePixelRatioF(),
+                                on_ready=lambda pixmap: self._show_cover_preview(path, pixmap),
+                                on_error=lambda message: self._cover_preview_failed(path, message))
             else:
                 self._clear_cover_image()
 
+    def _show_cover_preview(self, path: str, pixmap: QPixmap):
+        """Shows a decoded preview, unless another cover has been selected since."""
+        if path == self.cover_image_path:
+            self.cover_img_label.setPixmap(pixmap)
+            self.comfirm_img_label.setText("Image Selected!")
+
+    def _cover_preview_failed(self, path: str, message: str):
+        """Reports an unreadable image and resets the selection, if it is still the current one."""
+        if path == self.cover_image_path:
+            QMessageBox.warning(self, "Image Error", f"Could not load selected image: {message}")
+            self._clear_cover_image()
+
     def _clear_cover_image(self):
         """Clears the selected cover image and resets UI."""
         self.cover_image_path = None
@@ -583,6 +667,7 @@ class EncryptionScreen(BaseWidget):
         self.comfirm_img_label.setText("Upload Completed")
         self.selected_cover_filename_label.setText("")
         self.switch_image_selector(0)
+        self._schedule_capacity_update()
 
     def _proceed_to_embed_section(self):
         """Checks if a cover image is selected before proceeding to the next section."""
@@ -608,15 +693,10 @@ class EncryptionScreen(BaseWidget):
                         self.secret_file_content = f.read()
 
                     self.doc_filename_label.setText(os.path.basename(self.secret_file_path))
-                    file_size_bytes = len(self.secret_file_content)
-                    if file_size_bytes < 1024:
-                        self.doc_size_label.setText(f"{file_size_bytes} Bytes")
-                    elif file_size_bytes < (1024 * 1024):
-                        self.doc_size_label.setText(f"{file_size_bytes / 1024:.2f} KB")
-                    else:
-                        self.doc_size_label.setText(f"{file_size_bytes / (1024 * 1024):.2f} MB")
+                    self.doc_size_label.setText(_format_size(len(self.secret_file_content)))
 
                     self.doc_upload_state_stack.setCurrentIndex(1)
+                    self._schedule_capacity_update()
 
                 except Exception as e:
                     QMessageBox.warning(self, "File Read Error", f"Could not read selected file: {e}")
@@ -631,28 +711,81 @@ class EncryptionScreen(BaseWidget):
         self.doc_filename_label.setText("")
         self.doc_size_label.setText("")
         self.doc_upload_state_stack.setCurrentIndex(0)
+        self._schedule_capacity_update()
+
+    def _schedule_capacity_update(self):
+        """(Re)starts the debounce timer; the meter is recomputed once edits pause."""
+        self.capacity_timer.start()
+
+    def _refresh_capacity_meter(self):
+        """Starts a background estimate of the current payload against the cover's capacity."""
+        self.capacity_generation += 1
+        if self.btn_encode_doc.isChecked():
+            secret_data, is_text = self.secret_file_content, False
+            filename = os.path.basename(self.secret_file_path) if self.secret_file_path else None
+        else:
+            # The editor's contents are copied once per pause in typing, not on every keystroke
+            self.secret_text_to_embed = self.text_edit.toPlainText()
+            secret_data, is_text, filename = self.secret_text_to_embed, True, None
 
-    def _update_secret_text(self):
-        """Updates the stored secret text whenever the QTextEdit content changes."""
-        self.secret_text_to_embed = self.text_edit.toPlainText()
+        if not self.cover_image_path or not secret_data:
+            self._show_capacity_state(0, "Add a document or text to see how much of the image it uses", False)
+            return
+        generation = self.capacity_generation
+        run_in_background(self._estimate_fit, self.stego, self.cover_image_path, secret_data, is_text, filename,
+                          on_result=lambda result: self._show_capacity(generation, result),
+                          on_error=lambda message: self._show_capacity_error(generation, message))
+
+    def _estimate_fit(self, stego, cover_path: str, secret_data, is_text: bool, filename: str) -> tuple:
+        """Worker-thread part of the meter: (estimated payload bytes, cover capacity in bytes)."""
+        return self.payload_estimator.estimate(secret_data, is_text, filename), stego.capacity(cover_path)
+
+    def _show_capacity(self, generation: int, result: tuple):
+        """Updates the meter with an estimate, unless a newer one has been requested since."""
+        if generation != self.capacity_generation:
+            return
+        needed, capacity = result
+        used = min(needed * 1000 // capacity, 1000) if capacity else 1000
+        if needed <= capacity:
+            self._show_capacity_state(used, f"About {_format_size(needed)} of {_format_size(capacity)} "
+                                            f"({used / 10:.0f}%) - fits", False)
+        else:
+            self._show_capacity_state(used, f"About {_format_size(needed)} - too large by "
+                                            f"{_format_size(needed - capacity)} for this image", True)
+
+    def _show_capacity_error(self, generation: int, message: str):
+        """Shows why the meter couldn't be computed (e.g. an unreadable cover)."""
+        if generation == self.capacity_generation:
+            self._show_capacity_state(0, f"Capacity unavailable: {message}", True)
+
+    def _show_capacity_state(self, value: int, text: str, overflow: bool):
+        """Sets the meter's fill (0-1000), caption and colour."""
+        colour = "#EF4444" if overflow else "#81C8FF"
+        self.capacity_bar.setStyleSheet(f"""
+            QProgressBar {{ background: #1F2937; border: none; border-radius: 2px; }}
+            QProgressBar::chunk {{ background: {colour}; border-radius: 2px; }}
+        """)
+        self.capacity_bar.setValue(value)
+        self.capacity_label.setText(text)
+        self.capacity_label.setStyleSheet(f"color: {'#EF4444' if overflow else '#6A7788'}; font-size: 10px;")
 
     def _toggle_doc_password(self):
         """Toggles visibility of the document password."""
         if self.doc_password_input.echoMode() == QLineEdit.EchoMode.Password:
             self.doc_password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-            self.doc_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "hide_.png")))
+            self.doc_toggle_eye.setIcon(assets.icon("hide_.png"))
         else:
             self.doc_password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.doc_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+            self.doc_toggle_eye.setIcon(assets.icon("show.png"))
 
     def _toggle_text_password(self):
         """Toggles visibility of the text password."""
         if self.text_password_input.echoMode() == QLineEdit.EchoMode.Password:
             self.text_password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-            self.text_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "hide_.png")))
+            self.text_toggle_eye.setIcon(assets.icon("hide_.png"))
         else:
             self.text_password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.text_toggle_eye.setIcon(QPixmap(os.path.join(ASSETS_PATH, "show.png")))
+            self.text_toggle_eye.setIcon(assets.icon("show.png"))
 
     def _embed_document_clicked(self):
         """
@@ -672,7 +805,8 @@ class EncryptionScreen(BaseWidget):
 
         # Get the output path for the stego image from a file dialog
         output_stego_path, _ = QFileDialog.getSaveFileName(self, "Save Stego Image", "stego_document.png",
-                                                           "PNG Images (*.png);;All Files (*.*)")
+                                                           "PNG Images (*.png);;TIFF Images (*.tif *.tiff);;"
+                                                           "BMP Images (*.bmp);;WebP Images (*.webp);;All Files (*.*)")
         if not output_stego_path:
             QMessageBox.warning(self, "Save Cancelled", "Stego image not saved.")
             return
@@ -686,8 +820,10 @@ class EncryptionScreen(BaseWidget):
                 password=password,
                 is_text=False,
                 original_filename=os.path.basename(self.secret_file_path),  # Pass original filename for metadata
-                output_path=output_stego_path  # Pass the determined output path here
+                output_path=output_stego_path,  # Pass the determined output path here
+                verify=True  # Re-check the embedded bits and repair any that did not survive
             )
+            self._warn_if_unverified()
             QMessageBox.information(self, "Embedding Complete",
                                     f"Document embedded successfully into {output_stego_path}")
             # Optionally clear inputs after successful embedding
@@ -700,12 +836,21 @@ class EncryptionScreen(BaseWidget):
         except Exception as e:
             QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred during embedding: {e}")
 
+    def _warn_if_unverified(self):
+        """Warns when verification could not repair every embedded bit."""
+        report = self.stego.last_verification
+        if report and report["bit_errors_final"]:
+            QMessageBox.warning(self, "Verification Warning",
+                                f"{report['bit_errors_final']} embedded bits could not be repaired. "
+                                f"The hidden data may not be recoverable; try a different cover image.")
+
     def _embed_text_clicked(self):
         """
         Handler for the 'Embed Text' button.
         Calls backend steganography to embed text.
         """
         password = self.text_password_input.text()
+        self.secret_text_to_embed = self.text_edit.toPlainText()  # The meter's copy may be a pause behind
         if not self.cover_image_path:
             QMessageBox.warning(self, "Missing Input", "Please select a cover image first.")
             return
@@ -718,7 +863,8 @@ class EncryptionScreen(BaseWidget):
 
         # Get the output path for the stego image from a file dialog
         output_stego_path, _ = QFileDialog.getSaveFileName(self, "Save Stego Image", "stego_text.png",
-                                                           "PNG Images (*.png);;All Files (*.*)")
+                                                           "PNG Images (*.png);;TIFF Images (*.tif *.tiff);;"
+                                                           "BMP Images (*.bmp);;WebP Images (*.webp);;All Files (*.*)")
         if not output_stego_path:
             QMessageBox.warning(self, "Save Cancelled", "Stego image not saved.")
             return
@@ -731,8 +877,10 @@ class EncryptionScreen(BaseWidget):
                 secret_data=self.secret_text_to_embed,
                 password=password,
                 is_text=True,
-                output_path=output_stego_path  # Pass the determined output path here
+                output_path=output_stego_path,  # Pass the determined output path here
+                verify=True  # Re-check the embedded bits and repair any that did not survive
             )
+            self._warn_if_unverified()
             QMessageBox.information(self, "Embedding Complete", f"Text embedded successfully into {output_stego_path}")
             # Optionally clear inputs after successful embedding
             self._clear_cover_image()
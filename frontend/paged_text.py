@@ -0,0 +1,105 @@
+import os
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+
+
+def read_page(path: str, index: int, page_bytes: int) -> str:
+    """
+    Reads one page of a UTF-8 text file.
+
+    Pages are page_bytes long, give or take a character: a page that would end inside a
+    multi-byte character runs on to its end, and the next page starts after it, so no
+    character is split between pages.
+    """
+    start = index * page_bytes
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(page_bytes + 4)  # A UTF-8 character is at most 4 bytes
+    begin = 0
+    if start > 0:
+        while begin < len(data) and data[begin] & 0xC0 == 0x80:  # Continuation byte of the previous page
+            begin += 1
+    end = min(page_bytes, len(data))
+    while end < len(data) and data[end] & 0xC0 == 0x80:
+        end += 1
+    return data[begin:end].decode('utf-8', errors='replace')
+
+
+class PagedTextView(QWidget):
+    """
+    Read-only text view that shows a large UTF-8 file one page at a time.
+
+    Only the page on screen is read from disk and held by the text widget, so multi-megabyte
+    text neither stalls layout nor stays in memory. Short text is shown in full with set_text.
+    """
+
+    PAGE_BYTES = 64 * 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = None  # File being paged, or None for text set with set_text
+        self.page = 0
+        self.page_count = 1
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        layout.addWidget(self.text_edit)
+
+        self.nav_bar = QWidget()
+        self.nav_bar.setStyleSheet("border: none;")
+        nav_layout = QHBoxLayout(self.nav_bar)
+        nav_layout.setContentsMargins(0, 0, 0, 0)
+        self.prev_btn = QPushButton("<")
+        self.prev_btn.setFixedSize(30, 20)
+        self.prev_btn.clicked.connect(lambda: self.show_page(self.page - 1))
+        self.page_label = QLabel()
+        self.page_label.setStyleSheet("color: #6A7788; font-size: 11px;")
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.next_btn = QPushButton(">")
+        self.next_btn.setFixedSize(30, 20)
+        self.next_btn.clicked.connect(lambda: self.show_page(self.page + 1))
+        for button in (self.prev_btn, self.next_btn):
+            button.setStyleSheet("color: #ffffee; background: #6A7788; border: none; border-radius: 10px;")
+        nav_layout.addWidget(self.prev_btn)
+        nav_layout.addWidget(self.page_label, 1)
+        nav_layout.addWidget(self.next_btn)
+        layout.addWidget(self.nav_bar)
+        self.nav_bar.hide()
+
+    def set_text(self, text: str):
+        """Shows short text in full."""
+        self.path = None
+        self.page, self.page_count = 0, 1
+        self.nav_bar.hide()
+        self.text_edit.setPlainText(text)
+
+    def open_file(self, path: str):
+        """Pages through a UTF-8 text file, starting at its first page."""
+        self.path = path
+        self.page_count = max(1, -(-os.path.getsize(path) // self.PAGE_BYTES))
+        self.nav_bar.setVisible(self.page_count > 1)
+        self.show_page(0)
+
+    def show_page(self, index: int):
+        """Shows page `index` of the open file; out-of-range pages are ignored."""
+        if self.path is None or not 0 <= index < self.page_count:
+            return
+        self.page = index
+        self.text_edit.setPlainText(read_page(self.path, index, self.PAGE_BYTES))
+        self.text_edit.moveCursor(QTextCursor.MoveOperation.Start)
+        self.page_label.setText(f"Page {index + 1} of {self.page_count}")
+        self.prev_btn.setEnabled(index > 0)
+        self.next_btn.setEnabled(index < self.page_count - 1)
+
+    def clear(self):
+        """Empties the view and forgets the file."""
+        self.set_text("")
+
+    def setPlaceholderText(self, text: str):
+        self.text_edit.setPlaceholderText(text)
@@ -0,0 +1,69 @@
+import os
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from backend.cache import LRUCache
+from .workers import run_in_background
+
+# Recently shown previews, keyed by path, modification time, file size and preview size, so
+# reselecting an image skips the decode while an edited file is decoded afresh
+_thumbnails = LRUCache(max_entries=32, max_bytes=16 * 1024 * 1024, sizeof=lambda image: image.sizeInBytes())
+
+
+def load_preview(path: str, size: QSize) -> QImage:
+    """
+    Decodes an image scaled down to fit `size`, without holding it at full resolution.
+
+    QImageReader decodes straight to the requested size where the format allows it (JPEG
+    scales in the DCT domain, PNG scales row by row), so a 50 MP cover costs a few hundred
+    KB instead of hundreds of MB. Safe to call off the GUI thread.
+
+    Raises:
+        ValueError: If the image can't be read.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    full_size = reader.size()
+    if full_size.isValid() and (full_size.width() > size.width() or full_size.height() > size.height()):
+        reader.setScaledSize(full_size.scaled(size, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    return image
+
+
+def request_preview(path: str, size: QSize, device_pixel_ratio: float, on_ready, on_error) -> None:
+    """
+    Delivers a preview pixmap of an image, scaled to fit `size`, to on_ready.
+
+    Cached previews are delivered immediately; anything else is decoded on a worker thread and
+    delivered on the GUI thread when done. Callers should check that the image is still the
+    one they want when it arrives.
+
+    Args:
+        path (str): Image path.
+        size (QSize): Area the preview must fit, in device-independent pixels.
+        device_pixel_ratio (float): Ratio of the screen showing it, so previews are sharp on HiDPI.
+        on_ready (callable): Called with the QPixmap.
+        on_error (callable): Called with an error message if the image can't be read.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        on_error(str(e))
+        return
+    pixel_size = QSize(round(size.width() * device_pixel_ratio), round(size.height() * device_pixel_ratio))
+    cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, pixel_size.width(), pixel_size.height())
+
+    def deliver(image):
+        _thumbnails.put(cache_key, image)
+        pixmap = QPixmap.fromImage(image)  # Pixmaps may only be made on the GUI thread
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        on_ready(pixmap)
+
+    cached = _thumbnails.get(cache_key)
+    if cached is not None:
+        deliver(cached)
+    else:
+        run_in_background(load_preview, path, pixel_size, on_result=deliver, on_error=on_error)
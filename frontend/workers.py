@@ -0,0 +1,64 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class WorkerSignals(QObject):
+    """Signals of a Worker. They are delivered on the GUI thread, so slots may touch widgets."""
+    finished = Signal(object)  # The function's return value
+    failed = Signal(str)  # The error message if it raised
+    progress = Signal(object)  # The arguments of each call fn made to its progress callback
+
+
+class Worker(QRunnable):
+    """Runs one function call on a thread pool and reports the outcome through its signals."""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # Owned by Python (see _active_workers), not by the pool
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+# Workers still running; holding them keeps their signal objects alive until delivery
+_active_workers = set()
+
+
+def run_in_background(fn, *args, on_result=None, on_error=None, on_progress=None, pool: QThreadPool = None,
+                      **kwargs) -> Worker:
+    """
+    Calls fn(*args, **kwargs) on a worker thread without blocking the GUI.
+
+    Args:
+        fn (callable): The function to run. It must not touch any widget.
+        on_result (callable, optional): Called on the GUI thread with the return value.
+        on_error (callable, optional): Called on the GUI thread with the error message.
+        on_progress (callable, optional): If given, fn is also passed a `progress` callable, and
+                                          each call to it is repeated with the same arguments on
+                                          on_progress, on the GUI thread.
+        pool (QThreadPool, optional): Pool to run on. Defaults to the application-wide pool.
+
+    Returns:
+        Worker: The queued worker.
+    """
+    worker = Worker(fn, *args, **kwargs)
+    _active_workers.add(worker)
+    worker.signals.finished.connect(lambda _: _active_workers.discard(worker))
+    worker.signals.failed.connect(lambda _: _active_workers.discard(worker))
+    if on_result is not None:
+        worker.signals.finished.connect(on_result)
+    if on_error is not None:
+        worker.signals.failed.connect(on_error)
+    if on_progress is not None:
+        worker.kwargs["progress"] = lambda *values: worker.signals.progress.emit(values)
+        worker.signals.progress.connect(lambda values: on_progress(*values))
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
@@ -3,11 +3,10 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QStackedWidget,
                                QHBoxLayout, QPushButton, QLabel, QWidget,
                                QVBoxLayout, QSpacerItem, QSizePolicy)
 from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QKeySequence, QPixmap, QColor
+from PySide6.QtGui import QKeySequence, QColor
 import sys
 import warnings
-import os
-from frontend import HomeScreen, EncryptionScreen, DecryptionScreen, AboutScreen
+from frontend import HomeScreen, EncryptionScreen, DecryptionScreen, BatchScreen, AboutScreen, assets
 
 # Suppress SIP deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -20,6 +19,9 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(900, 720)  # More balanced minimum size
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
 
+        # Decode every image the screens use once, up front
+        assets.preload()
+
         # Main widget with transparent background
         main_widget = QWidget()
         main_widget.setObjectName("MainWidget")
@@ -51,8 +53,7 @@ class MainWindow(QMainWindow):
 
         # Logo
         self.logo_label = QLabel()
-        logo_pixmap = QPixmap(os.path.join("assets", "steg_logo.png")).scaled(
-            60, 50, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        logo_pixmap = assets.pixmap("steg_logo.png", 60, 50)
         self.logo_label.setPixmap(logo_pixmap)
         self.logo_label.setFixedSize(60, 50)
         self.nav_layout.addWidget(self.logo_label)
@@ -78,7 +79,7 @@ class MainWindow(QMainWindow):
 
         self.nav_buttons = {}
         for screen, label in [("home", "Home"), ("encryption", "Encrypt"),
-                              ("decryption", "Decrypt"), ("about", "About")]:
+                              ("decryption", "Decrypt"), ("batch", "Batch"), ("about", "About")]:
             btn = QPushButton(label)
             btn.setStyleSheet(button_styles)
             btn.clicked.connect(lambda checked, s=screen: self.switch_screen(s))
@@ -126,6 +127,7 @@ class MainWindow(QMainWindow):
             "home": HomeScreen(self.switch_screen),
             "encryption": EncryptionScreen(self.switch_screen),
             "decryption": DecryptionScreen(self.switch_screen),
+            "batch": BatchScreen(self.switch_screen),
             "about": AboutScreen(self.switch_screen)
         }
 
@@ -0,0 +1,40 @@
+import builtins
+
+import cv2
+import numpy as np
+
+from backend import image_io
+from backend.steganography import DCTSteganography
+
+
+def test_probe_reads_only_the_start_of_a_large_stego_png(tmp_path, monkeypatch):
+    """probe() on an embed_data PNG must not read (or inflate) the bulk of the image data."""
+    y, x = np.mgrid[0:2000, 0:3000]
+    cover = np.dstack([x * 255 // 3000, y * 255 // 2000, (x + y) % 256]).astype(np.uint8)
+    cover = cv2.add(cover, np.random.RandomState(0).randint(0, 4, cover.shape, dtype=np.uint8))
+    cover_path, stego_path = str(tmp_path / "cover.png"), str(tmp_path / "stego.png")
+    cv2.imwrite(cover_path, cover)
+    stego = DCTSteganography()
+    stego.embed_data(cover_path, "small secret", "pw", True, output_path=stego_path)
+
+    bytes_read = 0
+
+    def counting_open(path, mode='r', *args, **kwargs):
+        f = builtins.open(path, mode, *args, **kwargs)
+        read = f.read
+
+        def counted_read(size=-1):
+            nonlocal bytes_read
+            data = read(size)
+            bytes_read += len(data)
+            return data
+
+        f.read = counted_read
+        return f
+
+    monkeypatch.setattr(image_io, "open", counting_open, raising=False)
+    info = stego.probe(stego_path)
+
+    assert info is not None and info["width"] == 3000 and info["height"] == 2000
+    file_size = (tmp_path / "stego.png").stat().st_size
+    assert bytes_read < 32 * 1024, f"probe read {bytes_read} bytes of a {file_size}-byte file"